@@ -0,0 +1,23 @@
+import asyncio
+
+import thermo_cards_qt as t
+
+
+def test_poll_block_reports_out_of_range_variables(tmp_path, monkeypatch):
+    worker = t.AsyncPollingWorker({"variables": [], "logging": {"folder": str(tmp_path)}})
+    errors = []
+    worker.error.connect(lambda vid, message: errors.append(vid))
+
+    async def short_read(client, bid, block, timeout):
+        return [215, 230]
+
+    monkeypatch.setattr(worker, "_read_planned_block", short_read)
+    block = {"slave": 1, "type": "holding", "start": 10, "count": 4, "vars": [
+        {"id": "a", "address": 11},
+        {"id": "b", "address": 13},
+        {"id": "c", "address": 9},
+    ]}
+    ok = asyncio.run(worker._poll_block(None, None, block, t.PollScheduler({}), 1.0))
+    assert ok
+    assert [v[0] for v in worker._values] == ["a"]
+    assert errors == ["b", "c"]
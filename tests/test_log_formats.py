@@ -0,0 +1,138 @@
+import os
+import sqlite3
+from datetime import datetime
+
+import thermo_cards_qt as t
+
+
+def stamp(text):
+    return datetime.fromisoformat(text)
+
+
+def test_binary_round_trip(tmp_path):
+    cfg = {"folder": str(tmp_path), "mode": "binary"}
+    logger = t.CSVLogger(cfg)
+    var = {"id": "v1", "name": "Sala", "unit": "C"}
+    samples = [("2024-01-01T10:00:00.250", 65535, 1.5), ("2024-01-01T10:00:10", 7, -2.25)]
+    for text, raw, value in samples:
+        logger._write(stamp(text), var, raw, value)
+    logger._close_handles()
+    with open(os.path.join(str(tmp_path), "v1_2024-01-01.bin"), "rb") as f:
+        data = f.read()
+    assert len(data) == 2 * t.BINARY_RECORD.size
+    assert [raw for _, raw, _ in t.BINARY_RECORD.iter_unpack(data)] == [65535, 7]
+    start, end = stamp("2024-01-01T00:00:00").timestamp(), stamp("2024-01-01T23:59:59").timestamp()
+    series = t.LogReader(cfg).read(["v1"], start, end)["v1"]
+    assert list(series[0]) == [stamp(s[0]).timestamp() for s in samples]
+    assert list(series[1]) == [1.5, -2.25]
+
+
+def test_rollup_buckets(tmp_path):
+    historian = t.SQLiteHistorian(str(tmp_path / "historian.db"))
+    base = int(stamp("2024-01-01T10:00:00").timestamp())
+    historian.insert([("v1", (base + sec) * 1000, 0, float(sec)) for sec in (0, 30, 59, 60, 3599)])
+    historian.insert([("v1", (base + 61) * 1000, 0, 10.0)])
+    rows = historian.conn.execute(
+        "SELECT bucket, vmin, vmax, vsum, n FROM rollups WHERE res = 60 ORDER BY bucket"
+    ).fetchall()
+    assert rows[:2] == [(base, 0.0, 59.0, 89.0, 3), (base + 60, 10.0, 60.0, 70.0, 2)]
+    assert historian.conn.execute("SELECT n FROM rollups WHERE res = 3600").fetchall() == [(6,)]
+    assert historian.query_rollup("v1", 60, base * 1000, (base + 60) * 1000)[0] == (base + 30.0, 0.0, 89.0 / 3, 59.0)
+    historian.close()
+
+
+def test_historian_falls_back_to_files(tmp_path):
+    folder = str(tmp_path)
+    cfg = {"folder": folder, "mode": "daily", "historian": True}
+    with open(os.path.join(folder, "termo_2024-01-01.csv"), "w", encoding="utf-8") as f:
+        f.write("timestamp,variable_id,variable_name,raw,value,unit\n")
+        f.write("2024-01-01T10:00:00,v1,Sala,1,1.0,C\n")
+        f.write("2024-01-01T10:00:00,v2,Sala,2,2.0,C\n")
+    t.log_manifest(folder).rebuild()
+    day2 = stamp("2024-01-02T10:00:00").timestamp()
+    historian = t.SQLiteHistorian(t.historian_path(cfg))
+    historian.insert([("v1", int(day2 * 1000), 3, 3.0)])
+    historian.close()
+    start, end = stamp("2024-01-01T00:00:00").timestamp(), stamp("2024-01-02T23:59:59").timestamp()
+    series = t.LogReader(cfg).read(["v1", "v2"], start, end)
+    assert list(series["v1"][1]) == [1.0, 3.0]
+    assert list(series["v2"][1]) == [2.0]
+
+
+def test_failed_historian_flush_is_requeued(tmp_path, monkeypatch):
+    logger = t.CSVLogger({"folder": str(tmp_path), "historian": True})
+    logger._queue_historian(stamp("2024-01-01T10:00:00"), {"id": "v1", "name": "Sala"}, 1, 1.0)
+
+    def locked(self, rows, meta=None):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(t.SQLiteHistorian, "insert", locked)
+    logger._flush_historian()
+    assert len(logger._hist_rows) == 1
+    monkeypatch.undo()
+    logger._flush_historian()
+    logger._close_historian()
+    assert logger._hist_rows == []
+    historian = t.SQLiteHistorian(t.historian_path(logger.cfg), readonly=True)
+    assert historian.query("v1", 0, 2 ** 62) == [(stamp("2024-01-01T10:00:00").timestamp(), 1.0)]
+    historian.close()
+
+
+def test_historian_day_boundary_not_duplicated(tmp_path):
+    cfg = {"folder": str(tmp_path), "mode": "daily", "historian": True}
+    start = stamp("2024-01-01T00:00:00").timestamp()
+    historian = t.SQLiteHistorian(t.historian_path(cfg))
+    historian.insert([("v1", int((start + sec) * 1000), 0, float(sec)) for sec in (0, 86400, 2 * 86400)])
+    assert historian.stats("v1", start * 1000, (start + 86400) * 1000)[3] == 1
+    historian.close()
+    series = t.LogReader(cfg).read(["v1"], start, start + 2 * 86400)
+    assert list(series["v1"][1]) == [0.0, 86400.0, 172800.0]
+
+
+def test_parse_csv_closes_file_when_seek_fails(tmp_path, monkeypatch):
+    path = str(tmp_path / "termo_2024-01-01.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("timestamp,variable_id,variable_name,raw,value,unit\n")
+    opened = []
+    real_open = open
+
+    def tracking_open(*args, **kwargs):
+        f = real_open(*args, **kwargs)
+        opened.append(f)
+        return f
+
+    def broken_seek(self, f, size, since):
+        raise OSError("seek failed")
+
+    monkeypatch.setattr(t.LogReader, "SEEK_MIN_BYTES", 0)
+    monkeypatch.setattr(t.LogReader, "_seek", broken_seek)
+    monkeypatch.setattr("builtins.open", tracking_open)
+    t.LogReader({"folder": str(tmp_path), "mode": "daily"})._parse_csv(path, {}, "2024", "2025")
+    assert opened and all(f.closed for f in opened)
+
+
+def test_reinserted_samples_are_not_counted_twice(tmp_path):
+    historian = t.SQLiteHistorian(str(tmp_path / "historian.db"))
+    base = int(stamp("2024-01-01T10:00:00").timestamp()) * 1000
+    rows = [("v1", base, 0, 1.0), ("v1", base + 1000, 0, 3.0)]
+    historian.insert(rows)
+    historian.insert(rows + [("v1", base + 1000, 0, 9.0), ("v1", base + 2000, 0, 5.0)])
+    assert historian.stats("v1", base, base + 3000) == (1.0, 3.0, 5.0, 3)
+    assert historian.conn.execute("SELECT vmin, vmax, vsum, n FROM rollups WHERE res = 60").fetchall() == [(1.0, 5.0, 9.0, 3)]
+    historian.close()
+
+
+def test_historian_gaps_inside_a_day_fall_back_to_files(tmp_path):
+    folder = str(tmp_path)
+    cfg = {"folder": folder, "mode": "daily", "historian": True, "interval_sec": 10}
+    with open(os.path.join(folder, "termo_2024-01-01.csv"), "w", encoding="utf-8") as f:
+        f.write("timestamp,variable_id,variable_name,raw,value,unit\n")
+        for stamp_text, value in (("08:00:00", 1.0), ("12:00:00", 2.0), ("12:00:10", 2.5), ("16:00:00", 3.0), ("20:00:00", 4.0)):
+            f.write(f"2024-01-01T{stamp_text},v1,Sala,0,{value},C\n")
+    t.log_manifest(folder).rebuild()
+    historian = t.SQLiteHistorian(t.historian_path(cfg))
+    historian.insert([("v1", int(stamp(f"2024-01-01T{s}").timestamp() * 1000), 0, v) for s, v in (("12:00:00", 2.0), ("12:00:10", 2.5), ("20:00:00", 4.0))])
+    historian.close()
+    start, end = stamp("2024-01-01T00:00:00").timestamp(), stamp("2024-01-01T23:59:59").timestamp()
+    series = t.LogReader(cfg).read(["v1"], start, end)
+    assert list(series["v1"][1]) == [1.0, 2.0, 2.5, 3.0, 4.0]
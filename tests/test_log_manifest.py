@@ -0,0 +1,64 @@
+import os
+
+import thermo_cards_qt as t
+
+HEADER = "timestamp,variable_id,variable_name,raw,value,unit\n"
+
+
+def write(folder, name, rows):
+    with open(os.path.join(folder, name), "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        for stamp, vid in rows:
+            f.write(f"{stamp},{vid},x,1,1.0,C\n")
+
+
+def test_classify_formats(tmp_path):
+    folder = str(tmp_path)
+    vid = "c6375aa7-a499-46b8-9c73-d9905b945e17"
+    write(folder, "Sala_A_2024-01-01.csv", [("2024-01-01T10:00:00", "v1")])
+    write(folder, f"Pulpa_1_{vid}_2024-01-01.csv", [])
+    assert t.LogMaintenance.classify("termo_2024-01-01.csv") == ("csv", None, "2024-01-01", "termo_2024-01.csv.gz")
+    assert t.LogMaintenance.classify("Sala_A_2024-01-01.csv", folder) == ("csv", "v1", "2024-01-01", "Sala_A_2024-01.csv.gz")
+    assert t.LogMaintenance.classify(f"Pulpa_1_{vid}_2024-01-01.csv", folder)[1] == vid
+    assert t.LogMaintenance.classify("v2_2024-01-01.bin") == ("bin", "v2", "2024-01-01", "v2_2024-01.bin.gz")
+    assert t.LogMaintenance.classify("termo_log.csv") is None
+    assert t.LogMaintenance.classify("notes.txt") is None
+
+
+def test_rebuild_mixed_formats(tmp_path):
+    folder = str(tmp_path)
+    write(folder, "termo_2024-01-01.csv", [("2024-01-01T00:00:05", "v1"), ("2024-01-01T23:00:00", "v2")])
+    write(folder, "Sala_A_2024-01-01.csv", [("2024-01-01T10:00:00", "v1")])
+    write(folder, "Sala B_2024-01-02.csv", [("2024-01-02T10:00:00", "v2")])
+    write(folder, "Sala B_v2_2024-01-02.csv", [("2024-01-02T11:00:00", "v2")])
+    with open(os.path.join(folder, "v3_2024-01-01.bin"), "wb") as f:
+        f.write(t.BINARY_RECORD.pack(1704103200000, 7, 1.5))
+    manifest = t.LogManifest(folder)
+    files = manifest.data["files"]
+    assert sorted(files) == ["v1|2024-01-01", "v2|2024-01-02", "v3|2024-01-01", "|2024-01-01"]
+    assert [e["path"] for e in files["v1|2024-01-01"]] == ["Sala_A_2024-01-01.csv"]
+    assert sorted(e["path"] for e in files["v2|2024-01-02"]) == ["Sala B_2024-01-02.csv", "Sala B_v2_2024-01-02.csv"]
+    assert files["v3|2024-01-01"][0]["first"] == 1704103200.0
+    start = t.iso_to_epoch(["2024-01-02T00:00:00"])[0]
+    assert len(manifest.files_for("csv", "v2", start, start + 86399)) == 2
+
+
+def test_stale_manifest_is_rebuilt(tmp_path):
+    folder = str(tmp_path)
+    write(folder, "Sala_A_2024-01-01.csv", [("2024-01-01T10:00:00", "v1")])
+    with open(os.path.join(folder, "manifest.json"), "w") as f:
+        f.write('{"archives": {}, "files": {}}')
+    assert "v1|2024-01-01" in t.LogManifest(folder).data["files"]
+
+
+def test_refresh_picks_up_files_added_elsewhere(tmp_path):
+    folder = str(tmp_path)
+    write(folder, "termo_2024-01-01.csv", [("2024-01-01T00:00:05", "v1")])
+    manifest = t.LogManifest(folder)
+    write(folder, "termo_2024-01-02.csv", [("2024-01-02T10:00:00", "v1")])
+    os.remove(os.path.join(folder, "termo_2024-01-01.csv"))
+    os.utime(folder, ns=(0, 0))
+    manifest.refresh()
+    assert sorted(manifest.data["files"]) == ["|2024-01-02"]
+    reloaded = t.LogManifest(folder)
+    assert sorted(reloaded.data["files"]) == ["|2024-01-02"]
@@ -0,0 +1,84 @@
+import os
+from datetime import datetime, timedelta
+
+import thermo_cards_qt as t
+
+BASE = datetime(2024, 1, 1, 10, 0, 0)
+
+
+def feed(filt, values, step=10):
+    out = []
+    for i, value in enumerate(values):
+        out += filt.offer(BASE + timedelta(seconds=i * step), i, value)
+    return [(s[0] - BASE).total_seconds() for s in out]
+
+
+def test_absolute_and_percent_deadband():
+    assert feed(t.DeadbandFilter("absolute", 0.5, 0), [20.0, 20.2, 20.4, 20.6, 20.7, 19.9]) == [0, 30, 50]
+    assert feed(t.DeadbandFilter("percent", 10, 0), [100.0, 105.0, 111.0, 115.0]) == [0, 20]
+    assert feed(t.DeadbandFilter("none", 5, 0), [1.0, 1.0, 1.0]) == [0, 10, 20]
+
+
+def test_deadband_max_silence():
+    assert feed(t.DeadbandFilter("absolute", 1.0, 25), [5.0, 5.0, 5.0, 5.0, 5.0]) == [0, 30]
+
+
+def test_swinging_door_keeps_turning_points():
+    filt = t.DeadbandFilter("swinging_door", 0.1, 0)
+    assert feed(filt, [0.0, 1.0, 2.0, 3.0, 3.0, 3.0, 2.0]) == [0, 30, 50]
+    assert [(s[0] - BASE).total_seconds() for s in filt.pending()] == [60]
+
+
+def test_update_config_keeps_held_swinging_door_point(tmp_path):
+    cfg = {"folder": str(tmp_path), "deadband_mode": "swinging_door", "deadband": 0.1}
+    logger = t.CSVLogger(cfg)
+    queued = []
+    logger._enqueue = lambda ts, var, raw, value: queued.append(value)
+    var = {"id": "v1", "name": "Sala", "unit": "C"}
+    filt = logger._filter_for(var)
+    for i, value in enumerate((0.0, 1.0, 2.0)):
+        for sample in filt.offer(BASE + timedelta(seconds=10 * i), 0, value):
+            logger._enqueue(*sample[:1], var, *sample[1:])
+    assert queued == [0.0]
+    logger.update_config(dict(cfg))
+    assert queued == [0.0, 2.0]
+    assert logger._filters == {}
+
+
+def test_swinging_door_ignores_out_of_order_samples():
+    filt = t.DeadbandFilter("swinging_door", 0.1, 0)
+    filt.offer(BASE, 0, 1.0)
+    assert filt.offer(BASE - timedelta(seconds=5), 0, 9.0) == []
+
+
+def test_late_sample_keeps_day_and_own_file(tmp_path, monkeypatch):
+    started = []
+    monkeypatch.setattr(t.LogMaintenance, "start", lambda self: started.append(self))
+    logger = t.CSVLogger({"folder": str(tmp_path), "mode": "daily"})
+    var = {"id": "v1", "name": "Sala", "unit": "C"}
+    logger._write(datetime(2024, 1, 2, 0, 0, 5), var, 1, 1.0)
+    logger._write(datetime(2024, 1, 1, 23, 59, 0), var, 2, 2.0)
+    logger._write(datetime(2024, 1, 2, 0, 0, 15), var, 3, 3.0)
+    assert logger._day == "2024-01-02"
+    assert len(started) == 1
+    logger._close_handles()
+    with open(os.path.join(str(tmp_path), "termo_2024-01-01.csv"), encoding="utf-8") as f:
+        assert f.read().splitlines()[1].startswith("2024-01-01T23:59:00,v1")
+    with open(os.path.join(str(tmp_path), "termo_2024-01-02.csv"), encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 3
+
+
+def test_maintenance_skips_open_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(t.LogMaintenance, "start", lambda self: None)
+    folder = str(tmp_path)
+    logger = t.CSVLogger({"folder": folder, "mode": "daily"})
+    var = {"id": "v1", "name": "Sala", "unit": "C"}
+    logger._write(datetime(2024, 1, 2, 0, 0, 5), var, 1, 1.0)
+    logger._write(datetime(2024, 1, 1, 23, 59, 0), var, 2, 2.0)
+    logger._flush_handles()
+    t.LogMaintenance({"folder": folder}).run()
+    assert os.path.exists(os.path.join(folder, "termo_2024-01-01.csv"))
+    logger._close_handles()
+    t.LogMaintenance({"folder": folder}).run()
+    assert not os.path.exists(os.path.join(folder, "termo_2024-01-01.csv"))
+    assert os.path.exists(os.path.join(folder, "archive", "termo_2024-01.csv.gz"))
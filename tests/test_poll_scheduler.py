@@ -0,0 +1,42 @@
+import thermo_cards_qt as t
+
+
+def scheduler(interval_ms):
+    variables = [{"id": "a", "slave": 1, "address": 1, "poll_interval_ms": interval_ms}]
+    s = t.PollScheduler({"transport": "tcp"})
+    s.set_plan(t.ReadPlanner().plan(variables))
+    return s
+
+
+def test_forced_load_report_when_feasible():
+    s = scheduler(60000)
+    message = s.load_report(force=True)
+    assert message and "carga" in message and "no alcanzables" not in message
+    assert s.load_report() is None
+
+
+def test_forced_load_report_when_overloaded():
+    s = scheduler(1)
+    assert "no alcanzables" in s.load_report(force=True)
+    assert "no alcanzables" in s.load_report(force=True)
+
+
+def test_missed_deadlines_are_reported_and_reset():
+    s = scheduler(60000)
+    s.load_report(force=True)
+    block = s._blocks[0]
+    for _ in range(s.LOAD_CHECK_EVERY):
+        s.missed += 1
+        s.complete(block, 0.001)
+    message = s.load_report()
+    assert f"{s.LOAD_CHECK_EVERY} lecturas atrasadas" in message
+    assert s.missed == 0
+    for _ in range(s.LOAD_CHECK_EVERY):
+        s.complete(block, 0.001)
+    assert s.load_report() is None
+
+
+def test_pop_counts_late_blocks():
+    s = scheduler(1000)
+    block = s.pop(10 ** 9)
+    assert block is not None and s.missed == 1
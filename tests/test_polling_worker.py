@@ -0,0 +1,82 @@
+import thermo_cards_qt as t
+from pymodbus.pdu import ExceptionResponse
+
+
+def worker(tmp_path):
+    variables = [{"id": "a", "slave": 1, "address": 1}, {"id": "b", "slave": 1, "address": 2}]
+    return t.PollingWorker({"transport": "tcp"}, variables, {"folder": str(tmp_path)})
+
+
+def test_check_registers_separates_exception_replies():
+    try:
+        t.check_registers(ExceptionResponse(3, 2), 1)
+    except t.ModbusExceptionReply:
+        pass
+    else:
+        raise AssertionError("exception reply not raised")
+    try:
+        t.check_registers(None, 1)
+    except t.ModbusExceptionReply:
+        raise AssertionError("missing reply treated as exception reply")
+    except RuntimeError:
+        pass
+
+
+def test_exception_reply_keeps_slave_online(tmp_path, monkeypatch):
+    w = worker(tmp_path)
+    errors = []
+    w.error.connect(lambda vid, message: errors.append(vid))
+    monkeypatch.setattr(w, "read_block", lambda *args: t.check_registers(ExceptionResponse(3, 2), 2))
+    block = w.plan[0]
+    for _ in range(t.SlaveHealth.FAILURE_THRESHOLD + 2):
+        w._poll_block(block)
+    assert w.health[1].state == "closed"
+    assert w.health[1].failures == 0
+    assert errors.count("a") == t.SlaveHealth.FAILURE_THRESHOLD + 2
+
+
+def test_no_response_opens_breaker(tmp_path, monkeypatch):
+    w = worker(tmp_path)
+
+    def silent(*args):
+        raise RuntimeError("Sin respuesta")
+
+    monkeypatch.setattr(w, "read_block", silent)
+    for _ in range(t.SlaveHealth.FAILURE_THRESHOLD):
+        w._poll_block(w.plan[0])
+    assert w.health[1].state == "open"
+
+
+def test_set_client_timeout_updates_socket():
+    import socket
+
+    class Client:
+        pass
+
+    client = Client()
+    client.socket = socket.socket()
+    try:
+        t.set_client_timeout(client, 0.25)
+        assert client.socket.gettimeout() == 0.25
+    finally:
+        client.socket.close()
+
+
+def test_concurrent_blocks_share_one_health_record(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    w = worker(tmp_path)
+    states = []
+    w.slave_state.connect(lambda bus, slave, state: states.append(state), t.Qt.DirectConnection)
+
+    def silent(*args):
+        raise RuntimeError("Sin respuesta")
+
+    monkeypatch.setattr(w, "read_block", silent)
+    monkeypatch.setattr(t.SlaveHealth, "allow", lambda self, now: True)
+    blocks = [dict(w.plan[0]) for _ in range(40)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(w._poll_block, blocks))
+    assert list(w.health) == [1]
+    assert w.health[1].failures == 40
+    assert states == ["open"]
@@ -0,0 +1,42 @@
+import thermo_cards_qt as t
+
+
+def var(vid, address, slave=1, typ="holding", **extra):
+    return dict({"id": vid, "slave": slave, "type": typ, "address": address}, **extra)
+
+
+def layout(blocks):
+    return [(b["slave"], b["type"], b["start"], b["count"], [v["id"] for v in b["vars"]]) for b in blocks]
+
+
+def test_merges_addresses_within_gap():
+    blocks = t.ReadPlanner(max_gap=10).plan([var("c", 15), var("a", 0), var("b", 5), var("d", 30)])
+    assert layout(blocks) == [(1, "holding", 0, 16, ["a", "b", "c"]), (1, "holding", 30, 1, ["d"])]
+
+
+def test_zero_gap_only_merges_adjacent():
+    blocks = t.ReadPlanner(max_gap=0).plan([var("a", 10), var("b", 11), var("c", 13)])
+    assert layout(blocks) == [(1, "holding", 10, 2, ["a", "b"]), (1, "holding", 13, 1, ["c"])]
+
+
+def test_caps_blocks_at_125_registers():
+    variables = [var(f"v{i}", i) for i in range(0, 300, 2)]
+    blocks = t.ReadPlanner(max_gap=10, max_count=500).plan(variables)
+    assert all(b["count"] <= t.ReadPlanner.MAX_COUNT for b in blocks)
+    assert [(b["start"], b["count"]) for b in blocks] == [(0, 125), (126, 125), (252, 47)]
+    assert sum(len(b["vars"]) for b in blocks) == len(variables)
+
+
+def test_one_block_set_per_slave_and_type():
+    variables = [var("a", 1), var("b", 2, typ="input"), var("c", 1, slave=2), var("d", 3)]
+    blocks = t.ReadPlanner().plan(variables)
+    assert layout(blocks) == [
+        (1, "holding", 1, 3, ["a", "d"]),
+        (1, "input", 2, 1, ["b"]),
+        (2, "holding", 1, 1, ["c"]),
+    ]
+
+
+def test_skips_disabled_variables():
+    blocks = t.ReadPlanner().plan([var("a", 1), var("b", 2, enabled=False)])
+    assert layout(blocks) == [(1, "holding", 1, 1, ["a"])]
@@ -0,0 +1,53 @@
+import thermo_cards_qt as t
+
+
+def test_series_buffer_appends_in_order():
+    buf = t.SeriesBuffer()
+    total = 0
+    for i in range(50):
+        n = 1000 + i
+        buf.extend([float(total + k) for k in range(n)], [float(i)] * n)
+        total += n
+    ts, values = buf.arrays()
+    assert len(buf) == total == len(ts) == len(values)
+    assert list(ts[:3]) == [0.0, 1.0, 2.0] and ts[-1] == total - 1
+    assert values[0] == 0.0 and values[-1] == 49.0
+
+
+def test_series_buffer_without_numpy(monkeypatch):
+    monkeypatch.setattr(t, "np", None)
+    buf = t.SeriesBuffer()
+    buf.extend([1.0, 2.0], [3.0, 4.0])
+    buf.extend([5.0], [6.0])
+    assert len(buf) == 3
+    assert [list(a) for a in buf.arrays()] == [[1.0, 2.0, 5.0], [3.0, 4.0, 6.0]]
+
+
+def decimate_cases(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(t, "np", None)
+    ts = [float(i) for i in range(-10, 1010)]
+    values = [float((i * 37) % 101) for i in range(len(ts))]
+    values[500] = 1000.0
+    values[501] = -1000.0
+    out_ts, out_values = t.decimate_minmax(ts, values, 0.0, 1000.0, 10)
+    out_ts, out_values = list(out_ts), list(out_values)
+    assert out_ts == sorted(out_ts)
+    assert len(out_ts) <= 2 * 12
+    assert out_ts[0] == -1.0 and out_ts[-1] == 1001.0
+    assert 1000.0 in out_values and -1000.0 in out_values
+    for b in range(10):
+        lo, hi = b * 100.0, (b + 1) * 100.0
+        bucket = [v for x, v in zip(ts, values) if lo <= x < hi]
+        kept = [v for x, v in zip(out_ts, out_values) if lo <= x < hi]
+        assert min(kept) == min(bucket) and max(kept) == max(bucket)
+    few_ts, few_values = t.decimate_minmax(ts[:30], values[:30], 0.0, 5.0, 10)
+    assert list(few_ts) == ts[9:17] and list(few_values) == values[9:17]
+
+
+def test_decimate_minmax_numpy(monkeypatch):
+    decimate_cases(monkeypatch, True)
+
+
+def test_decimate_minmax_pure_python(monkeypatch):
+    decimate_cases(monkeypatch, False)
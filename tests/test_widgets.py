@@ -0,0 +1,56 @@
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+import thermo_cards_qt as t
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_card_state_repolishes_only_dependents(app, monkeypatch):
+    card = t.VariableCard({"id": "a", "name": "Sala", "unit": "C"})
+    polished = []
+    monkeypatch.setattr(t, "restyle", lambda widget, dependents=(): polished.append((widget, tuple(dependents))))
+    card.set_state(in_alarm=True)
+    card.set_state(in_alarm=True)
+    state_calls = [d for w, d in polished if w is card]
+    assert len(state_calls) == 1
+    assert card.config_btn in state_calls[0] and card.chip_slave not in state_calls[0]
+    assert card.property("state") == "alarm"
+
+
+@pytest.fixture
+def window(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(t, "CONFIG_FILE", str(tmp_path / "thermo_config.json"))
+    monkeypatch.setattr(t, "CACHE_FILE", str(tmp_path / "thermo_cache.json"))
+    cfg = t.default_config()
+    cfg["logging"]["folder"] = str(tmp_path / "logs")
+    cfg["ui"] = {"view": "cards"}
+    cfg["zones"] = [{"id": "z1", "name": "Norte"}, {"id": "z2", "name": "Sur"}]
+    cfg["variables"] = [
+        {"id": "a", "name": "Sala", "zone_id": "z1", "slave": 1, "address": 0},
+        {"id": "b", "name": "Horno", "zone_id": "z2", "slave": 1, "address": 1},
+    ]
+    t.save_config(cfg)
+    w = t.MainWindow()
+    yield w
+    w.close()
+    w.deleteLater()
+
+
+def test_rebuild_reuses_pooled_cards_and_sections(window):
+    card, section = window._card_pool["a"], window._section_pool["z1"]
+    window._rebuild_cards()
+    assert window._card_pool["a"] is card and window.cards["a"] is card
+    assert window._section_pool["z1"] is section
+
+
+def test_rebuild_drops_removed_variables_and_zones(window):
+    window.cfg["variables"] = [v for v in window.cfg["variables"] if v["id"] != "b"]
+    window.cfg["zones"] = [z for z in window.cfg["zones"] if z["id"] != "z2"]
+    window._rebuild_cards()
+    assert set(window._card_pool) == {"a"} and set(window.cards) == {"a"}
+    assert set(window._section_pool) == {"z1"}
+    assert "b" not in window._card_meta
@@ -5,15 +5,34 @@ import json
 import time
 import uuid
 import csv
-import glob
+import threading
+import queue
+import asyncio
+import heapq
+import struct
+import sqlite3
+import gzip
+import io
+import bisect
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QComboBox, QSpinBox, QDoubleSpinBox, QFrame, QScrollArea, QFileDialog, QMessageBox, QCheckBox, QGridLayout, QGroupBox, QDialog, QTabWidget, QToolBar, QAction, QStyle, QSizePolicy, QStyleFactory, QGraphicsDropShadowEffect, QDateTimeEdit, QListWidget, QListWidgetItem, QToolButton, QAbstractItemView
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QDateTime, QTimer
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QComboBox, QSpinBox, QDoubleSpinBox, QFrame, QScrollArea, QFileDialog, QMessageBox, QCheckBox, QGridLayout, QGroupBox, QDialog, QTabWidget, QToolBar, QAction, QStyle, QSizePolicy, QStyleFactory, QGraphicsDropShadowEffect, QDateTimeEdit, QListWidget, QListWidgetItem, QToolButton, QAbstractItemView, QListView, QStyledItemDelegate
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal, QSize, QDateTime, QTimer, QAbstractListModel, QModelIndex, QRectF
 from PyQt5.QtGui import QPalette, QColor, QPainter, QPen, QFont, QPainterPath, QPixmap, QLinearGradient, QBrush
-from pymodbus.client import ModbusSerialClient
+from pymodbus.client import ModbusSerialClient, ModbusTcpClient, AsyncModbusSerialClient, AsyncModbusTcpClient
+from pymodbus.pdu import ExceptionResponse
 from serial.tools import list_ports
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thermo_config.json")
+CACHE_FILE = os.path.join(os.path.dirname(CONFIG_FILE), "thermo_cache.json")
+BINARY_RECORD = struct.Struct("<qHf")
+_cache_lock = threading.Lock()
 
 
 def default_config():
@@ -24,9 +43,11 @@ def default_config():
             "parity": "N",
             "stopbits": 1,
             "bytesize": 8,
-            "timeout": 1.0
+            "timeout": 1.0,
+            "max_gap": 10
         },
         "poll_interval_ms": 1000,
+        "engine": "thread",
         "zones": [
             {
                 "id": str(uuid.uuid4()),
@@ -39,7 +60,9 @@ def default_config():
             }
         ],
         "ui": {
-            "density": "normal"
+            "density": "normal",
+            "view": "cards",
+            "render_fps": 10
         },
         "variables": [],
         "logging": {
@@ -47,7 +70,15 @@ def default_config():
             "folder": os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs"),
             "mode": "per_variable",
             "separator": ",",
-            "interval_sec": 10.0
+            "interval_sec": 10.0,
+            "flush_interval_sec": 2.0,
+            "flush_kb": 64,
+            "historian": False,
+            "deadband_mode": "none",
+            "deadband": 0.0,
+            "max_silence_sec": 300.0,
+            "archive_closed_days": True,
+            "retention_days": 0
         }
     }
 
@@ -72,6 +103,38 @@ def save_config(cfg):
         pass
 
 
+def load_cache():
+    if os.path.exists(CACHE_FILE):
+        try:
+            with open(CACHE_FILE, "r") as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
+
+
+def save_cache(cache):
+    try:
+        tmp = CACHE_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp, CACHE_FILE)
+    except Exception:
+        pass
+
+
+def load_bus_cache(bus_cfg):
+    with _cache_lock:
+        return load_cache().get("buses", {}).get(bus_label(bus_cfg), {})
+
+
+def store_bus_cache(bus_cfg, entry):
+    with _cache_lock:
+        cache = load_cache()
+        cache.setdefault("buses", {})[bus_label(bus_cfg)] = entry
+        save_cache(cache)
+
+
 def ensure_zones(cfg):
     changed = False
     if not isinstance(cfg, dict):
@@ -113,12 +176,18 @@ def ensure_zones(cfg):
             changed = True
     ui_cfg = cfg.get("ui")
     if not isinstance(ui_cfg, dict):
-        cfg["ui"] = {"density": "normal"}
+        cfg["ui"] = {"density": "normal", "view": "cards", "render_fps": 10}
         changed = True
     else:
         if "density" not in ui_cfg:
             ui_cfg["density"] = "normal"
             changed = True
+        if ui_cfg.get("view") not in ("cards", "tiles"):
+            ui_cfg["view"] = "cards"
+            changed = True
+        if "render_fps" not in ui_cfg:
+            ui_cfg["render_fps"] = 10
+            changed = True
     zone_ids = {z.get("id") for z in zones}
     default_zone_id = zones[0].get("id")
     for var in cfg.get("variables", []):
@@ -137,6 +206,30 @@ def ensure_zones(cfg):
     return changed
 
 
+def bus_configs(cfg):
+    main = dict(cfg.get("serial", {}))
+    buses = {None: main}
+    for bus in cfg.get("buses", []) or []:
+        bid = bus.get("id")
+        if not bid:
+            continue
+        merged = dict(main)
+        merged.update({k: v for k, v in bus.items() if k not in ("id", "name")})
+        buses[bid] = merged
+    return buses
+
+
+def split_variables_by_bus(cfg, variables):
+    known = set(bus_configs(cfg))
+    groups = {}
+    for var in variables or []:
+        bid = var.get("bus_id")
+        if bid not in known:
+            bid = None
+        groups.setdefault(bid, []).append(var)
+    return groups
+
+
 class VariableDialog(QWidget):
     def __init__(self, parent=None, data=None):
         super().__init__(parent)
@@ -226,17 +319,59 @@ class VariableDialog(QWidget):
         self.close()
 
 
+APP_STYLESHEET = """
+    QToolBar { spacing: 6px; }
+    QPushButton { border-radius: 6px; }
+    QGroupBox { font-weight: 600; }
+    VariableCard, VariableCard QFrame { border:1px solid #e5e7eb; border-radius:12px; background:#ffffff; }
+    VariableCard QPushButton { padding:10px 14px; border:1px solid #e5e7eb; border-radius:10px; background:#f8fafc; font-weight:600; }
+    VariableCard QPushButton:hover { background:#f1f5f9; }
+    VariableCard[state="stale"], VariableCard[state="stale"] QFrame { border-color:#e2e8f0; background:#f8fafc; }
+    VariableCard[state="stale"] QPushButton { border-color:#e2e8f0; background:#f1f5f9; }
+    VariableCard[state="stale"] QPushButton:hover { background:#e2e8f0; }
+    VariableCard[state="alarm"], VariableCard[state="alarm"] QFrame { border-color:#fca5a5; background:#fef2f2; }
+    VariableCard[state="alarm"] QPushButton { border-color:#fecaca; background:#fff5f5; }
+    VariableCard[state="alarm"] QPushButton:hover { background:#fee2e2; }
+    VariableCard[state="ack"], VariableCard[state="ack"] QFrame { border-color:#fcd34d; background:#fffbeb; }
+    VariableCard[state="ack"] QPushButton { border-color:#fde68a; background:#fff7db; }
+    VariableCard[state="ack"] QPushButton:hover { background:#fde68a; }
+    VariableCard QLabel#StatusDot { border-radius:5px; background:#94a3b8; }
+    VariableCard QLabel#StatusDot[level="ok"] { background:#22c55e; }
+    VariableCard QLabel#StatusDot[level="alarm"], VariableCard QLabel#StatusDot[level="error"] { background:#ef4444; }
+    VariableCard QLabel#StatusDot[level="ack"] { background:#f59e0b; }
+    VariableCard QLabel#StatusText { color:#64748b; }
+    VariableCard QLabel#StatusText[level="ok"] { color:#16a34a; }
+    VariableCard QLabel#StatusText[level="alarm"], VariableCard QLabel#StatusText[level="error"] { color:#dc2626; }
+    VariableCard QLabel#StatusText[level="ack"] { color:#b45309; }
+    VariableCard QLabel#Chip { color:#334155; background:#f1f5f9; border:1px solid #e2e8f0; border-radius:12px; padding:3px 10px; font-size:13px; }
+    VariableCard QLabel#Chip[tone="red"] { background:#fee2e2; border-color:#fecaca; color:#991b1b; }
+    VariableCard QLabel#Chip[tone="amber"] { background:#fef3c7; border-color:#fde68a; color:#92400e; }
+    AlarmRow[acked="true"], AlarmRow[acked="true"] QWidget { background:#fff7ed; border:1px solid #fed7aa; border-radius:10px; }
+"""
+
+
+def restyle(widget, dependents=()):
+    for w in (widget,) + tuple(dependents):
+        w.style().unpolish(w)
+        w.style().polish(w)
+    widget.update()
+
+
+def set_style_property(widget, name, value, dependents=()):
+    if widget.property(name) == value:
+        return False
+    widget.setProperty(name, value)
+    restyle(widget, dependents)
+    return True
+
+
 class VariableCard(QFrame):
     def __init__(self, var):
         super().__init__()
         self.var = var
         self.setFrameShape(QFrame.Panel)
         self.setFrameShadow(QFrame.Raised)
-        self.setStyleSheet(
-            "QFrame{border:1px solid #e5e7eb;border-radius:12px;background:#ffffff;}"
-            "QPushButton{padding:10px 14px;border:1px solid #e5e7eb;border-radius:10px;background:#f8fafc;font-weight:600;}"
-            "QPushButton:hover{background:#f1f5f9;}"
-        )
+        self.setProperty("state", "ok")
         shadow = QGraphicsDropShadowEffect(self)
         shadow.setBlurRadius(18)
         shadow.setOffset(0, 4)
@@ -254,10 +389,11 @@ class VariableCard(QFrame):
         status_layout.setContentsMargins(0, 0, 0, 0)
         status_layout.setSpacing(6)
         self.status_dot = QLabel()
+        self.status_dot.setObjectName("StatusDot")
         self.status_dot.setFixedSize(10, 10)
-        self.status_dot.setStyleSheet("background:#94a3b8;border-radius:5px;")
         self.status_text = QLabel("Sin datos")
-        self.status_text.setStyleSheet("color:#64748b;font-size:12px;")
+        self.status_text.setObjectName("StatusText")
+        self.status_text.setStyleSheet("font-size:12px;")
         status_layout.addWidget(self.status_dot)
         status_layout.addWidget(self.status_text)
         h.addWidget(self.title)
@@ -281,9 +417,8 @@ class VariableCard(QFrame):
         self.chip_scale = QLabel("")
         self.chip_offset = QLabel("")
         self.chip_cal = QLabel("")
-        self._chip_base = "color:#334155;background:#f1f5f9;border:1px solid #e2e8f0;border-radius:12px;padding:3px 10px;font-size:13px;"
         for ch in [self.chip_slave, self.chip_type, self.chip_addr, self.chip_shift, self.chip_scale, self.chip_offset, self.chip_cal]:
-            ch.setStyleSheet(self._chip_base)
+            ch.setObjectName("Chip")
             chips.addWidget(ch)
         chips.addStretch(1)
         self._main_layout.addLayout(chips)
@@ -296,6 +431,7 @@ class VariableCard(QFrame):
         b.addStretch(1)
         b.addWidget(self.config_btn)
         self._main_layout.addLayout(b)
+        self._state_dependents = (self.title, self.status_dot, self.status_text, self.value_label, self.unit_label, self.last_update_label, self.config_btn)
         self.set_density("normal", monitor=False)
 
     def _update_chips(self):
@@ -314,16 +450,28 @@ class VariableCard(QFrame):
         self.chip_offset.setVisible(abs(off) > 1e-9)
         if abs(off) > 1e-9:
             self.chip_offset.setText(f"off {off:+g}")
-            self.chip_offset.setStyleSheet(self._chip_base + "background:#fee2e2;border-color:#fecaca;color:#991b1b;")
-        else:
-            self.chip_offset.setStyleSheet(self._chip_base)
+        set_style_property(self.chip_offset, "tone", "red" if abs(off) > 1e-9 else "")
         cal = float(self.var.get('calibration', 0.0))
         self.chip_cal.setVisible(abs(cal) > 1e-9)
         if abs(cal) > 1e-9:
             self.chip_cal.setText(f"cal {cal:+g}")
-            self.chip_cal.setStyleSheet(self._chip_base + "background:#fef3c7;border-color:#fde68a;color:#92400e;")
+        set_style_property(self.chip_cal, "tone", "amber" if abs(cal) > 1e-9 else "")
+
+    def set_link_state(self, state):
+        if state == "open":
+            tone, tip = "red", "Esclavo sin respuesta, reintentando en segundo plano"
+        elif state == "half_open":
+            tone, tip = "amber", "Probando esclavo"
         else:
-            self.chip_cal.setStyleSheet(self._chip_base)
+            tone, tip = "", ""
+        if set_style_property(self.chip_slave, "tone", tone):
+            self.chip_slave.setToolTip(tip)
+
+    def _set_level(self, level, text):
+        if set_style_property(self.status_dot, "level", level):
+            set_style_property(self.status_text, "level", level)
+        if self.status_text.text() != text:
+            self.status_text.setText(text)
 
     def set_value(self, value, raw):
         dec = int(self.var.get("decimals", 1))
@@ -331,15 +479,12 @@ class VariableCard(QFrame):
             text = f"{float(value):.{dec}f}"
         except Exception:
             text = str(value)
-        self.value_label.setText(text)
-        self.status_dot.setStyleSheet("background:#22c55e;border-radius:5px;")
-        self.status_text.setStyleSheet("color:#16a34a;font-size:12px;")
-        self.status_text.setText("OK")
+        if self.value_label.text() != text:
+            self.value_label.setText(text)
+        self._set_level("ok", "OK")
 
     def set_error(self):
-        self.status_dot.setStyleSheet("background:#ef4444;border-radius:5px;")
-        self.status_text.setStyleSheet("color:#dc2626;font-size:12px;")
-        self.status_text.setText("Error")
+        self._set_level("error", "Error")
 
     def update_meta(self, var):
         self.var = var
@@ -348,47 +493,24 @@ class VariableCard(QFrame):
         self._update_chips()
 
     def set_last_update(self, text):
-        self.last_update_label.setText(text)
+        if self.last_update_label.text() != text:
+            self.last_update_label.setText(text)
 
     def set_state(self, stale=False, in_alarm=False, acked=False):
         if stale:
-            self.status_dot.setStyleSheet("background:#94a3b8;border-radius:5px;")
-            self.status_text.setStyleSheet("color:#64748b;font-size:12px;")
-            self.status_text.setText("SIN DATOS")
-            self.setStyleSheet(
-                "QFrame{border:1px solid #e2e8f0;border-radius:12px;background:#f8fafc;}"
-                "QPushButton{padding:10px 14px;border:1px solid #e2e8f0;border-radius:10px;background:#f1f5f9;font-weight:600;}"
-                "QPushButton:hover{background:#e2e8f0;}"
-            )
+            state, text = "stale", "SIN DATOS"
         elif in_alarm and not acked:
-            self.status_dot.setStyleSheet("background:#ef4444;border-radius:5px;")
-            self.status_text.setStyleSheet("color:#dc2626;font-size:12px;")
-            self.status_text.setText("ALARMA")
-            self.setStyleSheet(
-                "QFrame{border:1px solid #fca5a5;border-radius:12px;background:#fef2f2;}"
-                "QPushButton{padding:10px 14px;border:1px solid #fecaca;border-radius:10px;background:#fff5f5;font-weight:600;}"
-                "QPushButton:hover{background:#fee2e2;}"
-            )
+            state, text = "alarm", "ALARMA"
         elif in_alarm and acked:
-            self.status_dot.setStyleSheet("background:#f59e0b;border-radius:5px;")
-            self.status_text.setStyleSheet("color:#b45309;font-size:12px;")
-            self.status_text.setText("ALARMA ACK")
-            self.setStyleSheet(
-                "QFrame{border:1px solid #fcd34d;border-radius:12px;background:#fffbeb;}"
-                "QPushButton{padding:10px 14px;border:1px solid #fde68a;border-radius:10px;background:#fff7db;font-weight:600;}"
-                "QPushButton:hover{background:#fde68a;}"
-            )
+            state, text = "ack", "ALARMA ACK"
         else:
-            self.status_dot.setStyleSheet("background:#22c55e;border-radius:5px;")
-            self.status_text.setStyleSheet("color:#16a34a;font-size:12px;")
-            self.status_text.setText("OK")
-            self.setStyleSheet(
-                "QFrame{border:1px solid #e5e7eb;border-radius:12px;background:#ffffff;}"
-                "QPushButton{padding:10px 14px;border:1px solid #e5e7eb;border-radius:10px;background:#f8fafc;font-weight:600;}"
-                "QPushButton:hover{background:#f1f5f9;}"
-            )
+            state, text = "ok", "OK"
+        self._set_level(state, text)
+        set_style_property(self, "state", state, self._state_dependents)
 
     def set_density(self, mode="normal", monitor=False):
+        if (mode, monitor) == (self._density, self._monitor):
+            return
         self._density = mode
         self._monitor = monitor
         if monitor:
@@ -416,7 +538,7 @@ class VariableCard(QFrame):
         self.title.setStyleSheet(f"font-weight:700;font-size:{title_size}px;color:#0f172a;")
         self.value_label.setStyleSheet(f"font-size:{value_size}px;font-weight:700;color:#0f172a;")
         self.unit_label.setStyleSheet(f"font-size:{unit_size}px;color:#334155;background:#e2efff;border-radius:12px;padding:4px 10px;")
-        self.status_text.setStyleSheet(f"color:#64748b;font-size:{status_size}px;")
+        self.status_text.setStyleSheet(f"font-size:{status_size}px;")
         self.last_update_label.setStyleSheet(f"color:#94a3b8;font-size:{last_size}px;")
 
 class CollapsibleSection(QFrame):
@@ -459,6 +581,7 @@ class CollapsibleSection(QFrame):
         self.content_layout.setSpacing(12)
         self.content_layout.setContentsMargins(6, 6, 6, 6)
         self.content.setVisible(not collapsed)
+        self.empty_label = None
         layout.addWidget(self.content)
 
     def _on_toggled(self, checked):
@@ -467,10 +590,36 @@ class CollapsibleSection(QFrame):
         self.toggled.emit(self.zone_id, not checked)
 
     def set_title(self, title):
-        self.toggle_btn.setText(title)
+        if self.toggle_btn.text() != title:
+            self.toggle_btn.setText(title)
+
+    def set_collapsed(self, collapsed):
+        if self.toggle_btn.isChecked() == bool(collapsed):
+            self.toggle_btn.setChecked(not collapsed)
+
+    def set_empty(self, empty):
+        if empty and self.empty_label is None:
+            self.empty_label = QLabel("Sin variables")
+            self.empty_label.setStyleSheet("color:#94a3b8;padding:4px 8px;")
+            self.content_layout.addWidget(self.empty_label, 0, 0)
+        elif not empty and self.empty_label is not None:
+            self.content_layout.removeWidget(self.empty_label)
+            self.empty_label.deleteLater()
+            self.empty_label = None
+
+    def place(self, widget, row, col):
+        idx = self.content_layout.indexOf(widget)
+        if idx >= 0:
+            if self.content_layout.getItemPosition(idx)[:2] == (row, col):
+                return
+            self.content_layout.removeWidget(widget)
+        elif widget.parentWidget() is not None and widget.parentWidget().layout() is not None:
+            widget.parentWidget().layout().removeWidget(widget)
+        self.content_layout.addWidget(widget, row, col)
 
     def set_summary(self, text, alarm_count=0, zone_alarm=False):
-        self.summary_label.setText(text)
+        if self.summary_label.text() != text:
+            self.summary_label.setText(text)
         if alarm_count > 0 or zone_alarm:
             label = f"Alarmas {alarm_count}" if alarm_count > 0 else "Alarma zona"
             self.alarm_label.setText(label)
@@ -479,6 +628,148 @@ class CollapsibleSection(QFrame):
             self.alarm_label.setVisible(False)
 
 
+TILE_ROLE = Qt.UserRole + 1
+
+
+class CardTileModel(QAbstractListModel):
+    def __init__(self, provider):
+        super().__init__()
+        self._provider = provider
+        self._rows = []
+        self._index = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        vid = self._rows[index.row()]
+        if role == Qt.UserRole:
+            return vid
+        if role == TILE_ROLE:
+            return self._provider(vid)
+        return None
+
+    def set_rows(self, vids):
+        vids = list(vids)
+        if vids == self._rows:
+            self.refresh()
+            return
+        self.beginResetModel()
+        self._rows = vids
+        self._index = {vid: i for i, vid in enumerate(vids)}
+        self.endResetModel()
+
+    def refresh(self, vids=None):
+        if not self._rows:
+            return
+        if vids is None:
+            self.dataChanged.emit(self.index(0), self.index(len(self._rows) - 1))
+            return
+        rows = [self._index[vid] for vid in vids if vid in self._index]
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)))
+
+
+class CardTileDelegate(QStyledItemDelegate):
+    SIZES = {
+        "compact": (220, 112, 13, 26, 11),
+        "normal": (270, 140, 15, 32, 12),
+        "monitor": (340, 180, 20, 44, 14),
+    }
+    STATES = {
+        "ok": ("#ffffff", "#e5e7eb", "#22c55e", "#16a34a", "OK"),
+        "stale": ("#f8fafc", "#e2e8f0", "#94a3b8", "#64748b", "SIN DATOS"),
+        "alarm": ("#fef2f2", "#fca5a5", "#ef4444", "#dc2626", "ALARMA"),
+        "ack": ("#fffbeb", "#fcd34d", "#f59e0b", "#b45309", "ALARMA ACK"),
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mode = "normal"
+
+    def set_mode(self, density, monitor=False):
+        mode = "monitor" if monitor else density
+        if mode not in self.SIZES:
+            mode = "normal"
+        changed = mode != self.mode
+        self.mode = mode
+        return changed
+
+    def sizeHint(self, option, index):
+        w, h, title_px = self.SIZES[self.mode][:3]
+        if str(index.data(Qt.UserRole) or "").startswith("zone:"):
+            view = self.parent()
+            if isinstance(view, QListView):
+                w = max(w, view.viewport().width() - 2 * view.spacing() - 1)
+            return QSize(w, title_px + 22)
+        return QSize(w, h)
+
+    def _font(self, size, bold=False):
+        font = QFont()
+        font.setPixelSize(size)
+        font.setBold(bold)
+        return font
+
+    def paint(self, p, option, index):
+        tile = index.data(TILE_ROLE) or {}
+        if "header" in tile:
+            return self._paint_header(p, option, tile)
+        _, _, title_px, value_px, small_px = self.SIZES[self.mode]
+        bg, border, dot, fg, label = self.STATES.get(tile.get("state"), self.STATES["stale"])
+        p.save()
+        p.setRenderHint(QPainter.Antialiasing)
+        rect = QRectF(option.rect).adjusted(4, 4, -4, -4)
+        p.setPen(QPen(QColor(border)))
+        p.setBrush(QColor(bg))
+        p.drawRoundedRect(rect, 12, 12)
+        inner = rect.adjusted(12, 8, -12, -8)
+        small = self._font(small_px)
+        p.setFont(small)
+        status_w = p.fontMetrics().horizontalAdvance(label)
+        p.setPen(QColor(fg))
+        p.drawText(QRectF(inner.right() - status_w, inner.top(), status_w, title_px + 6), Qt.AlignRight | Qt.AlignVCenter, label)
+        p.setPen(Qt.NoPen)
+        p.setBrush(QColor(dot))
+        p.drawEllipse(QRectF(inner.right() - status_w - 14, inner.top() + (title_px + 6) / 2.0 - 5, 10, 10))
+        p.setFont(self._font(title_px, True))
+        p.setPen(QColor("#0f172a"))
+        title_w = inner.width() - status_w - 22
+        p.drawText(QRectF(inner.left(), inner.top(), title_w, title_px + 6), Qt.AlignLeft | Qt.AlignVCenter, p.fontMetrics().elidedText(tile.get("name", ""), Qt.ElideRight, int(title_w)))
+        value_top = inner.top() + title_px + 8
+        p.setFont(self._font(value_px, True))
+        value = tile.get("value", "--")
+        value_w = p.fontMetrics().horizontalAdvance(value)
+        p.drawText(QRectF(inner.left(), value_top, value_w, value_px + 8), Qt.AlignLeft | Qt.AlignVCenter, value)
+        p.setFont(self._font(title_px))
+        p.setPen(QColor("#334155"))
+        p.drawText(QRectF(inner.left() + value_w + 8, value_top, inner.width() - value_w - 8, value_px + 8), Qt.AlignLeft | Qt.AlignVCenter, tile.get("unit", ""))
+        p.setFont(small)
+        line_h = small_px + 4
+        p.setPen(QColor("#991b1b") if tile.get("link") == "open" else QColor("#64748b"))
+        p.drawText(QRectF(inner.left(), inner.bottom() - 2 * line_h, inner.width(), line_h), Qt.AlignLeft | Qt.AlignVCenter, tile.get("meta", ""))
+        p.setPen(QColor("#94a3b8"))
+        p.drawText(QRectF(inner.left(), inner.bottom() - line_h, inner.width(), line_h), Qt.AlignLeft | Qt.AlignVCenter, tile.get("last", ""))
+        p.restore()
+
+    def _paint_header(self, p, option, tile):
+        _, _, title_px, _, small_px = self.SIZES[self.mode]
+        rect = QRectF(option.rect).adjusted(4, 0, -4, -1)
+        p.save()
+        p.setPen(QPen(QColor("#e2e8f0")))
+        p.drawLine(rect.bottomLeft(), rect.bottomRight())
+        p.setFont(self._font(title_px, True))
+        p.setPen(QColor("#0f172a"))
+        title_w = p.fontMetrics().horizontalAdvance(tile["header"])
+        p.drawText(QRectF(rect.left(), rect.top(), title_w, rect.height()), Qt.AlignLeft | Qt.AlignVCenter, tile["header"])
+        p.setFont(self._font(small_px))
+        p.setPen(QColor("#dc2626") if tile.get("alarm") else QColor("#64748b"))
+        summary_rect = QRectF(rect.left() + title_w + 12, rect.top(), rect.width() - title_w - 12, rect.height())
+        p.drawText(summary_rect, Qt.AlignLeft | Qt.AlignVCenter, p.fontMetrics().elidedText(tile.get("summary", ""), Qt.ElideRight, int(summary_rect.width())))
+        p.restore()
+
+
 class AlarmRow(QWidget):
     ack_clicked = pyqtSignal(str)
 
@@ -504,224 +795,720 @@ class AlarmRow(QWidget):
     def _on_ack(self):
         self.ack_clicked.emit(self.alarm_id)
 
+    def set_text(self, title, detail):
+        if self.title_label.text() != title:
+            self.title_label.setText(title)
+        if self.detail_label.text() != detail:
+            self.detail_label.setText(detail)
+
     def set_acked(self, acked):
-        if acked:
-            self.ack_btn.setEnabled(False)
-            self.ack_btn.setText("ACK")
-            self.setStyleSheet("background:#fff7ed;border:1px solid #fed7aa;border-radius:10px;")
+        self.ack_btn.setEnabled(not acked)
+        set_style_property(self, "acked", bool(acked), (self.title_label, self.detail_label, self.ack_btn))
+
+
+class AlarmListModel(QAbstractListModel):
+    def __init__(self):
+        super().__init__()
+        self._rows = []
+        self.row_size = QSize()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.UserRole:
+            return row
+        if role == Qt.SizeHintRole:
+            return self.row_size
+        return None
+
+    def sync(self, alarms):
+        alarms = [tuple(a) for a in alarms]
+        wanted = {a[0] for a in alarms}
+        for i in reversed(range(len(self._rows))):
+            if self._rows[i][0] not in wanted:
+                self.beginRemoveRows(QModelIndex(), i, i)
+                del self._rows[i]
+                self.endRemoveRows()
+        for pos, alarm in enumerate(alarms):
+            if pos < len(self._rows) and self._rows[pos][0] == alarm[0]:
+                if self._rows[pos] != alarm:
+                    self._rows[pos] = alarm
+                    self.dataChanged.emit(self.index(pos), self.index(pos))
+                continue
+            found = next((i for i in range(pos + 1, len(self._rows)) if self._rows[i][0] == alarm[0]), None)
+            if found is None:
+                self.beginInsertRows(QModelIndex(), pos, pos)
+                self._rows.insert(pos, alarm)
+                self.endInsertRows()
+                continue
+            self.beginMoveRows(QModelIndex(), found, found, QModelIndex(), pos)
+            self._rows.insert(pos, self._rows.pop(found))
+            self.endMoveRows()
+            if self._rows[pos] != alarm:
+                self._rows[pos] = alarm
+                self.dataChanged.emit(self.index(pos), self.index(pos))
+
+
+def _rtu_framer():
+    try:
+        from pymodbus import FramerType
+        return FramerType.RTU
+    except ImportError:
+        from pymodbus.framer import ModbusRtuFramer
+        return ModbusRtuFramer
+
+
+def make_modbus_client(bus_cfg, timeout, asynchronous=False):
+    transport = bus_cfg.get("transport", "serial")
+    if transport in ("tcp", "rtu_tcp"):
+        cls = AsyncModbusTcpClient if asynchronous else ModbusTcpClient
+        client_kwargs = {
+            "host": bus_cfg.get("host", "127.0.0.1"),
+            "port": int(bus_cfg.get("tcp_port", 502)),
+            "timeout": timeout,
+        }
+        if transport == "rtu_tcp":
+            client_kwargs["framer"] = _rtu_framer()
+    else:
+        cls = AsyncModbusSerialClient if asynchronous else ModbusSerialClient
+        client_kwargs = {
+            "port": bus_cfg.get("port"),
+            "baudrate": int(bus_cfg.get("baudrate", 9600)),
+            "parity": bus_cfg.get("parity", "N"),
+            "stopbits": int(bus_cfg.get("stopbits", 1)),
+            "bytesize": int(bus_cfg.get("bytesize", 8)),
+            "timeout": timeout,
+        }
+    try:
+        client = cls(**client_kwargs, retries=0, retry_on_empty=False)
+    except TypeError:
+        client = cls(**client_kwargs)
+        try:
+            if hasattr(client, "retries"):
+                client.retries = 0
+            if hasattr(client, "retry_on_empty"):
+                client.retry_on_empty = False
+        except Exception:
+            pass
+    return client
+
+
+def bus_label(bus_cfg):
+    if bus_cfg.get("transport", "serial") in ("tcp", "rtu_tcp"):
+        return f"{bus_cfg.get('host', '127.0.0.1')}:{bus_cfg.get('tcp_port', 502)}"
+    return str(bus_cfg.get("port", ""))
+
+
+def poll_interval(var):
+    return int(var.get("poll_interval_ms", 1000)) / 1000.0
+
+
+def convert_register(var, reg):
+    dtype = var.get("data_type", "uint16")
+    r = int(reg)
+    if dtype == "int16" and r > 32767:
+        r = r - 65536
+    scale = float(var.get("scale", 1.0))
+    offset = float(var.get("offset", 0.0))
+    calibration = float(var.get("calibration", 0.0))
+    shift = int(var.get("decimal_shift", 0))
+    factor = (10.0 ** (-shift)) if shift != 0 else 1.0
+    return r * factor * scale + offset + calibration
+
+
+class ModbusExceptionReply(RuntimeError):
+    pass
+
+
+def check_registers(resp, count):
+    if isinstance(resp, ExceptionResponse):
+        raise ModbusExceptionReply(str(resp))
+    if hasattr(resp, "isError") and resp.isError():
+        raise RuntimeError(str(resp))
+    regs = getattr(resp, "registers", None)
+    if not regs or len(regs) < count:
+        raise RuntimeError("Respuesta incompleta")
+    return [int(r) for r in regs[:count]]
+
+
+def set_client_timeout(client, timeout):
+    params = getattr(client, "comm_params", None)
+    if params is not None and hasattr(params, "timeout_connect"):
+        try:
+            params.timeout_connect = timeout
+        except Exception:
+            pass
+    sock = getattr(client, "socket", None)
+    if sock is not None and hasattr(sock, "settimeout"):
+        try:
+            sock.settimeout(timeout)
+        except Exception:
+            pass
+
+
+def read_registers(client, typ, addr, count, slave):
+    fn = client.read_holding_registers if typ == "holding" else client.read_input_registers
+    try:
+        return fn(address=addr, count=count, slave=slave)
+    except TypeError:
+        return fn(address=addr, count=count, device_id=slave)
+
+
+class ModbusClientPool:
+    def __init__(self, bus_cfg, timeout):
+        self.bus_cfg = bus_cfg
+        self.timeout = timeout
+        if bus_cfg.get("transport", "serial") in ("tcp", "rtu_tcp"):
+            self.size = max(1, int(bus_cfg.get("pool_size", 2)))
+        else:
+            self.size = 1
+        self._clients = []
+        self._idle = queue.Queue()
+
+    def connect(self):
+        for _ in range(self.size):
+            client = make_modbus_client(self.bus_cfg, self.timeout)
+            try:
+                ok = client.connect()
+            except Exception:
+                if not self._clients:
+                    raise
+                ok = False
+            if not ok:
+                if not self._clients:
+                    return False
+                break
+            self._clients.append(client)
+            self._idle.put(client)
+        self.size = len(self._clients)
+        return True
+
+    def acquire(self):
+        return self._idle.get()
+
+    def release(self, client):
+        self._idle.put(client)
+
+    def close(self):
+        for client in self._clients:
+            try:
+                client.close()
+            except Exception:
+                pass
+        self._clients = []
+        self._idle = queue.Queue()
+
+
+class ReadPlanner:
+    MAX_COUNT = 125
+
+    def __init__(self, max_gap=10, max_count=MAX_COUNT):
+        self.max_gap = max(0, int(max_gap))
+        self.max_count = max(1, min(self.MAX_COUNT, int(max_count)))
+
+    def plan(self, variables):
+        groups = {}
+        for var in variables or []:
+            if not var.get("enabled", True):
+                continue
+            key = (int(var.get("slave", 1)), var.get("type", "holding"))
+            groups.setdefault(key, []).append(var)
+        blocks = []
+        for key in sorted(groups):
+            slave, typ = key
+            vlist = sorted(groups[key], key=lambda v: int(v.get("address", 0)))
+            block = None
+            for var in vlist:
+                addr = int(var.get("address", 0))
+                if block is not None:
+                    end = block["start"] + block["count"]
+                    if addr - end <= self.max_gap and addr - block["start"] < self.max_count:
+                        block["count"] = max(block["count"], addr - block["start"] + 1)
+                        block["vars"].append(var)
+                        continue
+                block = {"slave": slave, "type": typ, "start": addr, "count": 1, "vars": [var]}
+                blocks.append(block)
+        return blocks
+
+
+def var_in_alarm(var, value):
+    if not var.get("alarm_enabled"):
+        return False
+    min_v = var.get("alarm_min")
+    max_v = var.get("alarm_max")
+    if min_v is not None and value < min_v:
+        return True
+    if max_v is not None and value > max_v:
+        return True
+    return False
+
+
+def estimate_request_time(bus_cfg, count):
+    turnaround = float(bus_cfg.get("turnaround_ms", 15)) / 1000.0
+    if bus_cfg.get("transport", "serial") == "tcp":
+        return turnaround
+    baud = max(1, int(bus_cfg.get("baudrate", 9600)))
+    bits = 1 + int(bus_cfg.get("bytesize", 8)) + int(bus_cfg.get("stopbits", 1))
+    if bus_cfg.get("parity", "N") != "N":
+        bits += 1
+    char_time = bits / float(baud)
+    frame_chars = 8 + 5 + 2 * int(count) + 7
+    return frame_chars * char_time + turnaround
+
+
+class SlaveHealth:
+    FAILURE_THRESHOLD = 3
+    BACKOFF_BASE = 1.0
+    BACKOFF_MAX = 60.0
+    MIN_TIMEOUT = 0.02
+
+    def __init__(self, max_timeout, initial_timeout=None):
+        self.max_timeout = max(self.MIN_TIMEOUT, float(max_timeout))
+        self.timeout = min(self.max_timeout, float(initial_timeout or max_timeout))
+        self.srtt = None
+        self.rttvar = 0.0
+        self.failures = 0
+        self.state = "closed"
+        self.retry_at = 0.0
+
+    def seed(self, latency):
+        self.srtt = float(latency)
+        self.rttvar = self.srtt / 2.0
+        self.timeout = min(self.max_timeout, max(self.MIN_TIMEOUT, self.srtt + 4.0 * self.rttvar))
+
+    def allow(self, now):
+        if self.state == "open":
+            if now < self.retry_at:
+                return False
+            self.state = "half_open"
+        return True
+
+    def success(self, elapsed):
+        if self.srtt is None:
+            self.srtt = elapsed
+            self.rttvar = elapsed / 2.0
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - elapsed)
+            self.srtt = 0.875 * self.srtt + 0.125 * elapsed
+        self.timeout = min(self.max_timeout, max(self.MIN_TIMEOUT, self.srtt + 4.0 * self.rttvar))
+        self.failures = 0
+        previous, self.state = self.state, "closed"
+        return previous != self.state
+
+    def failure(self, now):
+        self.failures += 1
+        self.timeout = min(self.max_timeout, self.timeout * 2.0)
+        previous = self.state
+        if self.state == "half_open" or self.failures >= self.FAILURE_THRESHOLD:
+            backoff = self.BACKOFF_BASE * 2 ** max(0, self.failures - self.FAILURE_THRESHOLD)
+            self.retry_at = now + min(self.BACKOFF_MAX, backoff)
+            self.state = "open"
+        return previous != self.state
+
+
+class PollScheduler:
+    PRIORITY_WEIGHTS = (1.0, 0.5, 0.25)
+    LOAD_CHECK_EVERY = 50
+    MISSED_REPORT_RATIO = 0.1
+
+    def __init__(self, bus_cfg):
+        self.bus_cfg = bus_cfg or {}
+        self.next_due = {}
+        self.alarm_vars = set()
+        self.learned_costs = {}
+        self.missed = 0
+        self._blocks = []
+        self._waiting = []
+        self._ready = []
+        self._generation = 0
+        self._completed = 0
+        self._feasible = True
+        self._lock = threading.Lock()
+
+    def set_plan(self, blocks):
+        with self._lock:
+            self._generation += 1
+            self._blocks = list(blocks)
+            self._waiting = []
+            self._ready = []
+            for idx, block in enumerate(self._blocks):
+                block["interval"] = min(poll_interval(v) for v in block["vars"])
+                block["cost"] = self.learned_costs.get(self.block_key(block)) or estimate_request_time(self.bus_cfg, block["count"])
+                block["seq"] = idx
+                block["generation"] = self._generation
+                release = min(self.next_due.get(v.get("id"), 0) for v in block["vars"])
+                self._waiting.append((release, idx, block))
+            heapq.heapify(self._waiting)
+
+    @staticmethod
+    def block_key(block):
+        return f"{block['slave']}:{block['type']}:{block['start']}:{block['count']}"
+
+    def priority(self, block):
+        level = 0
+        for var in block["vars"]:
+            if var.get("id") in self.alarm_vars:
+                return 2
+            if var.get("alarm_enabled"):
+                level = 1
+        return level
+
+    def _release(self, now):
+        while self._waiting and self._waiting[0][0] <= now:
+            release, idx, block = heapq.heappop(self._waiting)
+            weight = self.PRIORITY_WEIGHTS[self.priority(block)]
+            deadline = release + block["interval"] * weight
+            heapq.heappush(self._ready, (deadline, idx, block))
+
+    def pop(self, now):
+        with self._lock:
+            self._release(now)
+            if not self._ready:
+                return None
+            deadline, _, block = heapq.heappop(self._ready)
+            if now > deadline:
+                self.missed += 1
+            return block
+
+    def wake_at(self):
+        with self._lock:
+            if self._ready:
+                return time.monotonic()
+            if self._waiting:
+                return self._waiting[0][0]
+            return None
+
+    def observe(self, var, value):
+        vid = var.get("id")
+        if var_in_alarm(var, value):
+            self.alarm_vars.add(vid)
         else:
-            self.ack_btn.setEnabled(True)
-            self.ack_btn.setText("ACK")
-            self.setStyleSheet("")
+            self.alarm_vars.discard(vid)
+
+    def complete(self, block, elapsed=None, release_at=None):
+        now = time.monotonic()
+        with self._lock:
+            for var in block["vars"]:
+                self.next_due[var.get("id")] = release_at or now + poll_interval(var)
+            if block.get("generation") != self._generation:
+                return
+            if elapsed is not None:
+                block["cost"] = 0.8 * block["cost"] + 0.2 * elapsed
+                self.learned_costs[self.block_key(block)] = block["cost"]
+            heapq.heappush(self._waiting, (release_at or now + block["interval"], block["seq"], block))
+            self._completed += 1
+
+    def utilization(self):
+        return sum(b["cost"] / max(1e-3, b["interval"]) for b in self._blocks)
+
+    def load_report(self, force=False):
+        with self._lock:
+            if not force and self._completed < self.LOAD_CHECK_EVERY:
+                return None
+            completed, self._completed = self._completed, 0
+            missed, self.missed = self.missed, 0
+        load = self.utilization()
+        feasible = load <= 1.0
+        changed = feasible != self._feasible
+        self._feasible = feasible
+        lagging = missed > 0 and missed >= self.MISSED_REPORT_RATIO * max(1, completed)
+        if not changed and not force and not lagging:
+            return None
+        label = bus_label(self.bus_cfg)
+        late = f", {missed} lecturas atrasadas" if missed else ""
+        if feasible:
+            return f"Bus {label}: carga {load:.0%}{late}"
+        cycle = sum(b["cost"] for b in self._blocks)
+        return f"Bus {label}: carga {load:.0%}, intervalos no alcanzables (ciclo mínimo {cycle * 1000:.0f} ms){late}"
 
 
 class PollingWorker(QThread):
-    value_updated = pyqtSignal(str, float, int)
+    values_ready = pyqtSignal(list)
     error = pyqtSignal(str, str)
     status = pyqtSignal(str)
     connected = pyqtSignal(bool, str)
-    BLOCK_START = 104
-    BLOCK_COUNT = 8
+    slave_state = pyqtSignal(str, int, str)
+    FLUSH_INTERVAL = 0.1
 
-    def __init__(self, serial_cfg, variables, logging_cfg=None):
+    def __init__(self, serial_cfg, variables, logging_cfg=None, logger=None, bus_id=None):
         super().__init__()
         self.serial_cfg = serial_cfg
+        self.bus_id = bus_id
         self.variables = list(variables)
         self.running = False
-        self.client = None
-        self.next_due = {}
+        self.pool = None
         self.logging_cfg = logging_cfg or {}
-        self.logger = CSVLogger(self.logging_cfg)
+        self._owns_logger = logger is None
+        self.logger = logger or CSVLogger(self.logging_cfg)
+        self.planner = ReadPlanner(
+            max_gap=self.serial_cfg.get("max_gap", 10),
+            max_count=self.serial_cfg.get("max_block", ReadPlanner.MAX_COUNT),
+        )
+        self.plan = self.planner.plan(self.variables)
+        self.scheduler = PollScheduler(self.serial_cfg)
+        self.scheduler.set_plan(self.plan)
+        self._pending_plan = None
+        self._wake = threading.Event()
+        self.health = {}
+        self._health_lock = threading.Lock()
+        self.max_timeout = float(self.serial_cfg.get("timeout", 1.0))
         self.block_offsets = {}
-        self.block_retry = {}
         self.block_cache = {}
+        self._values = []
+        self._flushed_at = 0.0
 
     def set_variables(self, variables):
         self.variables = list(variables)
-        try:
-            self.logger.set_variables_snapshot(self.variables)
-        except Exception:
-            pass
-        self.block_offsets = {}
-        self.block_retry = {}
-        self.block_cache = {}
+        if self._owns_logger:
+            try:
+                self.logger.set_variables_snapshot(self.variables)
+            except Exception:
+                pass
+        self._pending_plan = self.planner.plan(self.variables)
+        self._wake.set()
 
     def set_logging(self, logging_cfg):
         self.logging_cfg = logging_cfg or {}
-        self.logger.update_config(self.logging_cfg)
+        if self._owns_logger:
+            self.logger.update_config(self.logging_cfg)
 
-    def run(self):
-        cfg_timeout = float(self.serial_cfg.get("timeout", 1.0))
-        timeout = min(cfg_timeout, 0.1)
-        client_kwargs = {
-            "port": self.serial_cfg.get("port"),
-            "baudrate": int(self.serial_cfg.get("baudrate", 9600)),
-            "parity": self.serial_cfg.get("parity", "N"),
-            "stopbits": int(self.serial_cfg.get("stopbits", 1)),
-            "bytesize": int(self.serial_cfg.get("bytesize", 8)),
-            "timeout": timeout,
-        }
-        try:
-            self.client = ModbusSerialClient(**client_kwargs, retries=0, retry_on_empty=False)
-        except TypeError:
-            self.client = ModbusSerialClient(**client_kwargs)
+    def _apply_pending_plan(self):
+        plan, self._pending_plan = self._pending_plan, None
+        if plan is None:
+            return
+        layout = {(b["slave"], b["type"], b["start"], b["count"]) for b in plan}
+        old_layout = {(b["slave"], b["type"], b["start"], b["count"]) for b in self.plan}
+        self.plan = plan
+        self.scheduler.set_plan(plan)
+        if layout != old_layout:
+            self.block_cache = {k: v for k, v in self.block_cache.items() if k in layout}
+        self._report_load(force=True)
+
+    def _report_load(self, force=False):
+        message = self.scheduler.load_report(force=force)
+        if message:
+            self.status.emit(message)
+
+    def _initial_timeout(self):
+        if self.serial_cfg.get("transport", "serial") in ("tcp", "rtu_tcp"):
+            return self.max_timeout
+        return min(self.max_timeout, 0.25)
+
+    def _health(self, slave):
+        with self._health_lock:
+            health = self.health.get(slave)
+            if health is None:
+                health = SlaveHealth(self.max_timeout, self._initial_timeout())
+                self.health[slave] = health
+            return health
+
+    def _record(self, slave, health, ok, elapsed=None):
+        with self._health_lock:
+            changed = health.success(elapsed) if ok else health.failure(time.monotonic())
+            if changed:
+                self.slave_state.emit(str(self.bus_id or ""), int(slave), health.state)
+            return health.retry_at if health.state == "open" else None
+
+    def _load_cache(self):
+        entry = load_bus_cache(self.serial_cfg)
+        for key, offset in entry.get("offsets", {}).items():
             try:
-                if hasattr(self.client, "retries"):
-                    self.client.retries = 0
-                if hasattr(self.client, "retry_on_empty"):
-                    self.client.retry_on_empty = False
+                slave, typ = key.split(":", 1)
+                self.block_offsets[(int(slave), typ)] = int(offset)
             except Exception:
-                pass
+                continue
+        for slave, latency in entry.get("latency", {}).items():
+            try:
+                self._health(int(slave)).seed(latency)
+            except Exception:
+                continue
+        self.scheduler.learned_costs.update(entry.get("blocks", {}))
+        self.scheduler.set_plan(self.plan)
+
+    def _save_cache(self):
+        store_bus_cache(self.serial_cfg, {
+            "offsets": {f"{slave}:{typ}": offset for (slave, typ), offset in self.block_offsets.items()},
+            "latency": {str(slave): h.srtt for slave, h in self.health.items() if h.srtt is not None},
+            "blocks": dict(self.scheduler.learned_costs),
+        })
+
+    def run(self):
+        self.pool = ModbusClientPool(self.serial_cfg, self._initial_timeout())
         try:
-            if not self.client.connect():
-                message = f"No se pudo conectar a {self.serial_cfg.get('port')}"
+            if not self.pool.connect():
+                message = f"No se pudo conectar a {bus_label(self.serial_cfg)}"
                 self.connected.emit(False, message)
                 return
         except Exception as e:
             self.connected.emit(False, str(e))
             return
         self.connected.emit(True, "")
-        self._build_block_map(self.variables)
+        executor = ThreadPoolExecutor(max_workers=self.pool.size) if self.pool.size > 1 else None
+        self._load_cache()
+        self._build_block_map(self.plan)
+        self._save_cache()
+        self._report_load(force=True)
         self.running = True
         while self.running:
+            self._apply_pending_plan()
             now = time.monotonic()
-            vars_snapshot = list(self.variables)
-            idle = True
-            next_wake = None
-            block_groups = {}
-            block_start = self.BLOCK_START
-            block_end = self.BLOCK_START + self.BLOCK_COUNT - 1
-            for var in vars_snapshot:
-                if not var.get("enabled", True):
-                    continue
-                vid = var.get("id")
-                interval = int(var.get("poll_interval_ms", 1000)) / 1000.0
-                due = self.next_due.get(vid, 0)
-                if now < due:
-                    if next_wake is None or due < next_wake:
-                        next_wake = due
-                    continue
-                slave = int(var.get("slave", 1))
-                typ = var.get("type", "holding")
-                addr = int(var.get("address", 0))
-                if block_start <= addr <= block_end:
-                    idle = False
-                    key = (slave, typ)
-                    lst = block_groups.get(key)
-                    if lst is None:
-                        lst = []
-                        block_groups[key] = lst
-                    lst.append(var)
-                else:
-                    self.next_due[vid] = time.monotonic() + interval
-            for key, vlist in block_groups.items():
-                slave, typ = key
-                try:
-                    regs = self._read_block_for_slave(slave, typ)
-                    for var in vlist:
-                        vid = var.get("id")
-                        interval = int(var.get("poll_interval_ms", 1000)) / 1000.0
-                        addr = int(var.get("address", 0))
-                        idx = addr - block_start
-                        if idx < 0 or idx >= len(regs):
-                            self.error.emit(vid, "Direccion fuera de bloque")
-                            self.next_due[vid] = time.monotonic() + interval
-                            continue
-                        reg = regs[idx]
-                        value = self.convert_value(var, reg)
-                        self.value_updated.emit(vid, value, reg)
-                        try:
-                            self.logger.log(var, reg, value)
-                        except Exception:
-                            pass
-                        self.next_due[vid] = time.monotonic() + interval
-                except Exception as e:
-                    for var in vlist:
-                        vid = var.get("id")
-                        interval = int(var.get("poll_interval_ms", 1000)) / 1000.0
-                        self.error.emit(vid, str(e))
-                        self.next_due[vid] = time.monotonic() + interval
-            if idle:
-                sleep_for = 0.005
-                if next_wake is not None:
-                    remaining = next_wake - time.monotonic()
-                    if remaining > 0:
-                        sleep_for = min(0.01, remaining)
-                time.sleep(sleep_for)
-        try:
-            self.client.close()
-        except Exception:
-            pass
+            batch = []
+            while len(batch) < self.pool.size:
+                block = self.scheduler.pop(now)
+                if block is None:
+                    break
+                batch.append(block)
+            if not batch:
+                self._flush_values()
+                wake_at = self.scheduler.wake_at()
+                self._wake.wait(None if wake_at is None else max(0.0, wake_at - now))
+                self._wake.clear()
+                continue
+            if executor and len(batch) > 1:
+                list(executor.map(self._poll_block, batch))
+            else:
+                for block in batch:
+                    self._poll_block(block)
+            if time.monotonic() - self._flushed_at >= self.FLUSH_INTERVAL:
+                self._flush_values()
+            self._report_load()
+        self._flush_values()
+        if executor:
+            executor.shutdown(wait=True)
+        self.pool.close()
+        self._save_cache()
+        if self._owns_logger:
+            self.logger.close()
 
     def stop(self):
         self.running = False
+        self._wake.set()
 
-    def _build_block_map(self, vars_list):
-        self.block_offsets = {}
-        self.block_retry = {}
-        self.block_cache = {}
-        block_start = self.BLOCK_START
-        block_end = block_start + self.BLOCK_COUNT - 1
-        pairs = set()
-        for var in vars_list or []:
-            if not var.get("enabled", True):
+    def _flush_values(self):
+        self._flushed_at = time.monotonic()
+        if not self._values:
+            return
+        batch, self._values = self._values, []
+        self.values_ready.emit(batch)
+
+    def _poll_block(self, block):
+        slave = block["slave"]
+        health = self._health(slave)
+        with self._health_lock:
+            previous = health.state
+            allowed = health.allow(time.monotonic())
+            if allowed and health.state != previous:
+                self.slave_state.emit(str(self.bus_id or ""), int(slave), health.state)
+            retry_at, timeout = health.retry_at, health.timeout
+        if not allowed:
+            self.scheduler.complete(block, release_at=retry_at)
+            return
+        started = time.monotonic()
+        try:
+            regs = self._read_planned_block(block, timeout)
+        except ModbusExceptionReply as e:
+            elapsed = time.monotonic() - started
+            self._record(slave, health, True, elapsed)
+            for var in block["vars"]:
+                self.error.emit(var.get("id"), str(e))
+            self.scheduler.complete(block, elapsed)
+            return
+        except Exception as e:
+            release_at = self._record(slave, health, False)
+            for var in block["vars"]:
+                self.error.emit(var.get("id"), str(e))
+            self.scheduler.complete(block, release_at=release_at)
+            return
+        elapsed = time.monotonic() - started
+        self._record(slave, health, True, elapsed)
+        ts = time.time()
+        for var in block["vars"]:
+            vid = var.get("id")
+            idx = int(var.get("address", 0)) - block["start"]
+            if idx < 0 or idx >= len(regs):
+                self.error.emit(vid, "Direccion fuera de bloque")
                 continue
-            addr = int(var.get("address", 0))
-            if addr < block_start or addr > block_end:
+            reg = regs[idx]
+            value = self.convert_value(var, reg)
+            self.scheduler.observe(var, value)
+            self._values.append((vid, value, reg, ts))
+            try:
+                self.logger.log(var, reg, value)
+            except Exception:
+                pass
+        self.scheduler.complete(block, elapsed)
+
+    def _build_block_map(self, plan):
+        self.block_cache = {}
+        first_blocks = {}
+        for block in plan or []:
+            if (block["slave"], block["type"]) in self.block_offsets:
                 continue
-            slave = int(var.get("slave", 1))
-            typ = var.get("type", "holding")
-            pairs.add((slave, typ))
-        for key in sorted(pairs):
+            first_blocks.setdefault((block["slave"], block["type"]), block)
+        for key in sorted(first_blocks):
             slave, typ = key
-            offset, regs = self._detect_block_offset(slave, typ)
+            block = first_blocks[key]
+            health = self._health(slave)
+            if not health.allow(time.monotonic()):
+                continue
+            started = time.monotonic()
+            try:
+                offset, regs = self._detect_block_offset(slave, typ, block["start"], block["count"], health.timeout)
+            except ModbusExceptionReply:
+                self._record(slave, health, True, time.monotonic() - started)
+                continue
             if offset is None:
-                self.block_retry[key] = time.monotonic() + 5.0
+                self._record(slave, health, False)
                 continue
+            self._record(slave, health, True, time.monotonic() - started)
             self.block_offsets[key] = offset
             if regs:
-                self.block_cache[key] = regs
+                self.block_cache[(slave, typ, block["start"], block["count"])] = regs
 
-    def _detect_block_offset(self, slave, typ):
+    def _detect_block_offset(self, slave, typ, start, count, timeout=None):
+        reply = None
         for offset in (0, 1):
-            start = self.BLOCK_START - offset
-            if start < 0:
+            addr = start - offset
+            if addr < 0:
                 continue
             try:
-                regs = self.read_block(slave, typ, start, self.BLOCK_COUNT)
+                regs = self.read_block(slave, typ, addr, count, timeout)
                 return offset, regs
+            except ModbusExceptionReply as e:
+                reply = e
             except Exception:
                 continue
+        if reply is not None:
+            raise reply
         return None, None
 
-    def _read_block_for_slave(self, slave, typ):
+    def _read_planned_block(self, block, timeout=None):
+        slave, typ = block["slave"], block["type"]
+        start, count = block["start"], block["count"]
         key = (slave, typ)
-        cached = self.block_cache.pop(key, None)
+        cached = self.block_cache.pop((slave, typ, start, count), None)
         if cached is not None:
             return cached
         offset = self.block_offsets.get(key)
-        now = time.monotonic()
         if offset is None:
-            retry_at = self.block_retry.get(key, 0)
-            if now < retry_at:
-                raise RuntimeError("Sin mapa")
-            offset, regs = self._detect_block_offset(slave, typ)
+            offset, regs = self._detect_block_offset(slave, typ, start, count, timeout)
             if offset is None:
-                self.block_retry[key] = now + 5.0
                 raise RuntimeError("Sin respuesta")
             self.block_offsets[key] = offset
             return regs
-        start = self.BLOCK_START - offset
         try:
-            return self.read_block(slave, typ, start, self.BLOCK_COUNT)
+            return self.read_block(slave, typ, start - offset, count, timeout)
         except Exception:
             alt = 1 - offset
-            try:
-                regs = self.read_block(slave, typ, self.BLOCK_START - alt, self.BLOCK_COUNT)
-                self.block_offsets[key] = alt
-                return regs
-            except Exception as e:
-                raise e
+            if start - alt < 0:
+                raise
+            regs = self.read_block(slave, typ, start - alt, count, timeout)
+            self.block_offsets[key] = alt
+            return regs
 
     def read_var(self, var):
         addr = int(var.get("address", 0))
@@ -732,59 +1519,1006 @@ class PollingWorker(QThread):
         return reg, value
 
     def read_raw(self, slave, typ, addr):
-        if typ == "holding":
-            resp = self.client.read_holding_registers(address=addr, count=1, slave=slave)
+        return self.read_block(slave, typ, addr, 1)[0]
+
+    def read_block(self, slave, typ, addr, count, timeout=None):
+        client = self.pool.acquire()
+        try:
+            if timeout is not None:
+                set_client_timeout(client, timeout)
+            resp = read_registers(client, typ, addr, count, slave)
+        finally:
+            self.pool.release(client)
+        return check_registers(resp, count)
+
+    def convert_value(self, var, reg):
+        return convert_register(var, reg)
+
+
+class PollingCoordinator(QObject):
+    values_ready = pyqtSignal(list)
+    error = pyqtSignal(str, str)
+    status = pyqtSignal(str)
+    connected = pyqtSignal(bool, str)
+    slave_state = pyqtSignal(str, int, str)
+
+    def __init__(self, cfg):
+        super().__init__()
+        self.cfg = cfg
+        self.logger = CSVLogger(cfg.get("logging", {}))
+        self.logger.set_variables_snapshot(cfg.get("variables", []))
+        self.bus_cfgs = bus_configs(cfg)
+        self.workers = {}
+        self._started = False
+        self._pending = set()
+        self._connect_errors = []
+        self._any_connected = False
+        groups = split_variables_by_bus(cfg, cfg.get("variables", []))
+        if not groups:
+            groups = {None: []}
+        for bid, vlist in groups.items():
+            self._add_worker(bid, vlist)
+
+    def _bus_label(self, bid):
+        return bus_label(self.bus_cfgs.get(bid, {})) or str(bid)
+
+    def _add_worker(self, bid, variables):
+        worker = PollingWorker(self.bus_cfgs.get(bid, {}), variables, self.cfg.get("logging", {}), logger=self.logger, bus_id=bid)
+        worker.values_ready.connect(self.values_ready)
+        worker.error.connect(self.error)
+        worker.status.connect(self.status)
+        worker.slave_state.connect(self.slave_state)
+        worker.connected.connect(lambda ok, message, bid=bid: self._on_worker_connected(bid, ok, message))
+        self.workers[bid] = worker
+        return worker
+
+    def _on_worker_connected(self, bid, ok, message):
+        if ok:
+            self._any_connected = True
         else:
-            resp = self.client.read_input_registers(address=addr, count=1, slave=slave)
-        if hasattr(resp, "isError") and resp.isError():
-            raise RuntimeError(str(resp))
-        return int(resp.registers[0])
-
-    def read_block(self, slave, typ, addr, count):
-        if typ == "holding":
-            resp = self.client.read_holding_registers(address=addr, count=count, slave=slave)
+            self._connect_errors.append(f"{self._bus_label(bid)}: {message}" if bid is not None else message)
+        if bid not in self._pending:
+            if not ok:
+                self.status.emit(message)
+            return
+        self._pending.discard(bid)
+        if self._pending:
+            return
+        if self._any_connected:
+            self.connected.emit(True, "; ".join(self._connect_errors))
         else:
-            resp = self.client.read_input_registers(address=addr, count=count, slave=slave)
-        if hasattr(resp, "isError") and resp.isError():
-            raise RuntimeError(str(resp))
-        regs = getattr(resp, "registers", None)
-        if not regs or len(regs) < count:
-            raise RuntimeError("Respuesta incompleta")
-        return [int(r) for r in regs]
+            self.connected.emit(False, "; ".join(self._connect_errors))
 
-    def convert_value(self, var, reg):
-        dtype = var.get("data_type", "uint16")
-        r = int(reg)
-        if dtype == "int16" and r > 32767:
-            r = r - 65536
-        scale = float(var.get("scale", 1.0))
-        offset = float(var.get("offset", 0.0))
-        calibration = float(var.get("calibration", 0.0))
-        shift = int(var.get("decimal_shift", 0))
-        factor = (10.0 ** (-shift)) if shift != 0 else 1.0
-        return r * factor * scale + offset + calibration
+    def start(self):
+        self._started = True
+        self._pending = set(self.workers)
+        self._connect_errors = []
+        self._any_connected = False
+        for worker in list(self.workers.values()):
+            worker.start()
+
+    def stop(self):
+        self._started = False
+        for worker in self.workers.values():
+            worker.stop()
+
+    def wait(self, msecs=2000):
+        ok = True
+        for worker in self.workers.values():
+            ok = worker.wait(msecs) and ok
+        return ok
+
+    def isRunning(self):
+        return any(w.isRunning() for w in self.workers.values())
+
+    def set_variables(self, variables):
+        self.cfg = dict(self.cfg, variables=list(variables))
+        self.logger.set_variables_snapshot(variables)
+        groups = split_variables_by_bus(self.cfg, variables)
+        for bid, worker in self.workers.items():
+            worker.set_variables(groups.pop(bid, []))
+        for bid, vlist in groups.items():
+            worker = self._add_worker(bid, vlist)
+            if self._started:
+                worker.start()
+
+    def set_logging(self, logging_cfg):
+        self.cfg = dict(self.cfg, logging=logging_cfg or {})
+        self.logger.update_config(logging_cfg)
+
+
+class AsyncPollingWorker(QThread):
+    values_ready = pyqtSignal(list)
+    error = pyqtSignal(str, str)
+    status = pyqtSignal(str)
+    connected = pyqtSignal(bool, str)
+    slave_state = pyqtSignal(str, int, str)
+    FLUSH_INTERVAL = PollingWorker.FLUSH_INTERVAL
+
+    def __init__(self, cfg):
+        super().__init__()
+        self.cfg = cfg
+        self.bus_cfgs = bus_configs(cfg)
+        self.variables = list(cfg.get("variables", []))
+        self.logger = CSVLogger(cfg.get("logging", {}))
+        self.logger.set_variables_snapshot(self.variables)
+        self.running = False
+        self.block_offsets = {}
+        self.health = {}
+        self._loop = None
+        self._clients = {}
+        self._wakes = {}
+        self._schedulers = {}
+        self._tasks = []
+        self._values = []
+        self._flushed_at = 0.0
+
+    def _groups(self):
+        groups = split_variables_by_bus(self.cfg, self.variables)
+        return groups or {None: []}
+
+    def _build_schedule(self, bid, variables):
+        bus_cfg = self.bus_cfgs.get(bid, {})
+        planner = ReadPlanner(
+            max_gap=bus_cfg.get("max_gap", 10),
+            max_count=bus_cfg.get("max_block", ReadPlanner.MAX_COUNT),
+        )
+        scheduler = self._schedulers.get(bid)
+        if scheduler is None:
+            scheduler = PollScheduler(bus_cfg)
+            self._schedulers[bid] = scheduler
+            self._load_cache(bid, scheduler)
+        scheduler.set_plan(planner.plan(variables))
+        self._report_load(scheduler, force=True)
+
+    def _report_load(self, scheduler, force=False):
+        message = scheduler.load_report(force=force)
+        if message:
+            self.status.emit(message)
+
+    def _timeout(self, bid):
+        bus_cfg = self.bus_cfgs.get(bid, {})
+        cfg_timeout = float(bus_cfg.get("timeout", 1.0))
+        if bus_cfg.get("transport", "serial") in ("tcp", "rtu_tcp"):
+            return cfg_timeout
+        return min(cfg_timeout, 0.25)
+
+    def _health(self, bid, slave):
+        health = self.health.get((bid, slave))
+        if health is None:
+            health = SlaveHealth(float(self.bus_cfgs.get(bid, {}).get("timeout", 1.0)), self._timeout(bid))
+            self.health[(bid, slave)] = health
+        return health
+
+    def _record(self, bid, slave, health, ok, elapsed=None):
+        changed = health.success(elapsed) if ok else health.failure(time.monotonic())
+        if changed:
+            self.slave_state.emit(str(bid or ""), int(slave), health.state)
+
+    def _load_cache(self, bid, scheduler):
+        entry = load_bus_cache(self.bus_cfgs.get(bid, {}))
+        for key, offset in entry.get("offsets", {}).items():
+            try:
+                slave, typ = key.split(":", 1)
+                self.block_offsets[(bid, int(slave), typ)] = int(offset)
+            except Exception:
+                continue
+        for slave, latency in entry.get("latency", {}).items():
+            try:
+                self._health(bid, int(slave)).seed(latency)
+            except Exception:
+                continue
+        scheduler.learned_costs.update(entry.get("blocks", {}))
+
+    def _save_cache(self):
+        for bid, scheduler in self._schedulers.items():
+            store_bus_cache(self.bus_cfgs.get(bid, {}), {
+                "offsets": {f"{slave}:{typ}": offset for (b, slave, typ), offset in self.block_offsets.items() if b == bid},
+                "latency": {str(slave): h.srtt for (b, slave), h in self.health.items() if b == bid and h.srtt is not None},
+                "blocks": dict(scheduler.learned_costs),
+            })
+
+    def run(self):
+        self.running = True
+        try:
+            asyncio.run(self._main())
+        except Exception as e:
+            self.status.emit(str(e))
+        self.running = False
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        groups = self._groups()
+        results = await asyncio.gather(*[self._connect_bus(bid) for bid in groups])
+        errors = [message for ok, message in results if not ok]
+        if not any(ok for ok, _ in results):
+            self.connected.emit(False, "; ".join(errors))
+            self._close_clients()
+            return
+        self.connected.emit(True, "; ".join(errors))
+        for bid, vlist in groups.items():
+            if bid in self._clients:
+                self._start_bus(bid, vlist)
+        while self.running and self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = [t for t in self._tasks if not t.done()]
+        self._flush_values()
+        self._save_cache()
+        self._close_clients()
+
+    async def _connect_bus(self, bid):
+        bus_cfg = self.bus_cfgs.get(bid, {})
+        try:
+            client = make_modbus_client(bus_cfg, self._timeout(bid), asynchronous=True)
+            ok = await client.connect()
+        except Exception as e:
+            return False, str(e)
+        if not ok:
+            try:
+                client.close()
+            except Exception:
+                pass
+            return False, f"No se pudo conectar a {bus_label(bus_cfg)}"
+        self._clients[bid] = client
+        return True, ""
+
+    def _start_bus(self, bid, variables):
+        self._wakes[bid] = asyncio.Event()
+        self._build_schedule(bid, variables)
+        self._tasks.append(asyncio.ensure_future(self._poll_bus(bid)))
+
+    def _close_clients(self):
+        for client in self._clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        self._clients = {}
+
+    async def _sleep(self, bid, delay):
+        wake = self._wakes[bid]
+        try:
+            await asyncio.wait_for(wake.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+        wake.clear()
+
+    async def _poll_bus(self, bid):
+        client = self._clients[bid]
+        while self.running:
+            scheduler = self._schedulers[bid]
+            now = time.monotonic()
+            block = scheduler.pop(now)
+            if block is None:
+                self._flush_values()
+                wake_at = scheduler.wake_at()
+                await self._sleep(bid, None if wake_at is None else max(0.0, wake_at - now))
+                continue
+            health = self._health(bid, block["slave"])
+            previous = health.state
+            if not health.allow(now):
+                scheduler.complete(block, release_at=health.retry_at)
+                continue
+            if health.state != previous:
+                self.slave_state.emit(str(bid or ""), int(block["slave"]), health.state)
+            started = time.monotonic()
+            ok = await self._poll_block(client, bid, block, scheduler, health.timeout)
+            elapsed = time.monotonic() - started
+            self._record(bid, block["slave"], health, ok, elapsed)
+            if ok:
+                scheduler.complete(block, elapsed)
+            else:
+                scheduler.complete(block, release_at=health.retry_at if health.state == "open" else None)
+            if time.monotonic() - self._flushed_at >= self.FLUSH_INTERVAL:
+                self._flush_values()
+            self._report_load(scheduler)
+
+    async def _read(self, client, slave, typ, addr, count, timeout):
+        set_client_timeout(client, timeout)
+        resp = await asyncio.wait_for(read_registers(client, typ, addr, count, slave), timeout)
+        return check_registers(resp, count)
+
+    async def _detect_offset(self, client, slave, typ, start, count, timeout):
+        reply = None
+        for offset in (0, 1):
+            if start - offset < 0:
+                continue
+            try:
+                return offset, await self._read(client, slave, typ, start - offset, count, timeout)
+            except ModbusExceptionReply as e:
+                reply = e
+            except Exception:
+                continue
+        if reply is not None:
+            raise reply
+        return None, None
+
+    async def _read_planned_block(self, client, bid, block, timeout):
+        slave, typ = block["slave"], block["type"]
+        start, count = block["start"], block["count"]
+        key = (bid, slave, typ)
+        offset = self.block_offsets.get(key)
+        if offset is None:
+            offset, regs = await self._detect_offset(client, slave, typ, start, count, timeout)
+            if offset is None:
+                raise RuntimeError("Sin respuesta")
+            self.block_offsets[key] = offset
+            return regs
+        try:
+            return await self._read(client, slave, typ, start - offset, count, timeout)
+        except Exception:
+            alt = 1 - offset
+            if start - alt < 0:
+                raise
+            regs = await self._read(client, slave, typ, start - alt, count, timeout)
+            self.block_offsets[key] = alt
+            return regs
+
+    async def _poll_block(self, client, bid, block, scheduler, timeout):
+        try:
+            regs = await self._read_planned_block(client, bid, block, timeout)
+        except ModbusExceptionReply as e:
+            for var in block["vars"]:
+                self.error.emit(var.get("id"), str(e))
+            return True
+        except Exception as e:
+            for var in block["vars"]:
+                self.error.emit(var.get("id"), str(e) or type(e).__name__)
+            return False
+        ts = time.time()
+        for var in block["vars"]:
+            vid = var.get("id")
+            idx = int(var.get("address", 0)) - block["start"]
+            if idx < 0 or idx >= len(regs):
+                self.error.emit(vid, "Direccion fuera de bloque")
+                continue
+            reg = regs[idx]
+            value = convert_register(var, reg)
+            scheduler.observe(var, value)
+            self._values.append((vid, value, reg, ts))
+            try:
+                self.logger.log(var, reg, value)
+            except Exception:
+                pass
+        return True
+
+    def _apply_variables(self, variables):
+        self.variables = list(variables)
+        groups = self._groups()
+        for bid in list(self._schedulers):
+            self._build_schedule(bid, groups.pop(bid, []))
+        for bid in groups:
+            if bid in self._clients:
+                continue
+            self._tasks.append(asyncio.ensure_future(self._late_start(bid, groups[bid])))
+        self._wake_all()
+
+    async def _late_start(self, bid, variables):
+        ok, message = await self._connect_bus(bid)
+        if not ok:
+            self.status.emit(message)
+            return
+        self._start_bus(bid, variables)
+
+    def _flush_values(self):
+        self._flushed_at = time.monotonic()
+        if not self._values:
+            return
+        batch, self._values = self._values, []
+        self.values_ready.emit(batch)
+
+    def _wake_all(self):
+        for wake in self._wakes.values():
+            wake.set()
+
+    def _call_in_loop(self, fn, *args):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return False
+        try:
+            loop.call_soon_threadsafe(fn, *args)
+        except RuntimeError:
+            return False
+        return True
+
+    def set_variables(self, variables):
+        self.logger.set_variables_snapshot(variables)
+        if not self._call_in_loop(self._apply_variables, list(variables)):
+            self.variables = list(variables)
+
+    def set_logging(self, logging_cfg):
+        self.logger.update_config(logging_cfg)
+
+    def stop(self):
+        self.running = False
+        self._call_in_loop(self._wake_all)
+
+
+def make_poller(cfg):
+    if cfg.get("engine") == "asyncio":
+        return AsyncPollingWorker(cfg)
+    return PollingCoordinator(cfg)
+
+
+def historian_path(log_cfg):
+    folder = (log_cfg or {}).get("folder") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+    return os.path.join(folder, "historian.db")
+
+
+class SQLiteHistorian:
+    ROLLUP_RESOLUTIONS = (60, 900, 3600)
+
+    def __init__(self, path, readonly=False):
+        self.path = path
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            return
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS samples ("
+            "variable_id TEXT NOT NULL, ts INTEGER NOT NULL, raw INTEGER, value REAL, "
+            "PRIMARY KEY (variable_id, ts)) WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS variables (id TEXT PRIMARY KEY, name TEXT, unit TEXT)")
+        has_rollups = self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollups'").fetchone()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rollups ("
+            "variable_id TEXT NOT NULL, res INTEGER NOT NULL, bucket INTEGER NOT NULL, "
+            "vmin REAL, vmax REAL, vsum REAL, n INTEGER, "
+            "PRIMARY KEY (variable_id, res, bucket)) WITHOUT ROWID"
+        )
+        if not has_rollups:
+            for res in self.ROLLUP_RESOLUTIONS:
+                self.conn.execute(
+                    "INSERT INTO rollups SELECT variable_id, ?, (ts / ?) * ?, MIN(value), MAX(value), SUM(value), COUNT(*) "
+                    "FROM samples GROUP BY variable_id, ts / ?",
+                    (res, res * 1000, res, res * 1000),
+                )
+        self.conn.commit()
+
+    def insert(self, rows, meta=None):
+        with self.conn:
+            if meta:
+                self.conn.executemany("INSERT OR REPLACE INTO variables (id, name, unit) VALUES (?, ?, ?)", meta)
+            inserted = []
+            for row in rows:
+                if self.conn.execute("INSERT OR IGNORE INTO samples (variable_id, ts, raw, value) VALUES (?, ?, ?, ?)", row).rowcount:
+                    inserted.append(row)
+            self._add_rollups(inserted)
+
+    def _add_rollups(self, rows):
+        buckets = {}
+        for vid, ts, _, value in rows:
+            for res in self.ROLLUP_RESOLUTIONS:
+                key = (vid, res, (ts // (res * 1000)) * res)
+                agg = buckets.get(key)
+                if agg is None:
+                    buckets[key] = [value, value, value, 1]
+                else:
+                    agg[0] = min(agg[0], value)
+                    agg[1] = max(agg[1], value)
+                    agg[2] += value
+                    agg[3] += 1
+        self.conn.executemany(
+            "INSERT INTO rollups (variable_id, res, bucket, vmin, vmax, vsum, n) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (variable_id, res, bucket) DO UPDATE SET "
+            "vmin = MIN(vmin, excluded.vmin), vmax = MAX(vmax, excluded.vmax), vsum = vsum + excluded.vsum, n = n + excluded.n",
+            [key + tuple(agg) for key, agg in buckets.items()],
+        )
+
+    @classmethod
+    def pick_resolution(cls, span_sec, pixels):
+        for res in sorted(cls.ROLLUP_RESOLUTIONS, reverse=True):
+            if span_sec / res >= pixels:
+                return res
+        return None
+
+    def query_rollup(self, vid, res, start_ms, end_ms):
+        cur = self.conn.execute(
+            "SELECT bucket, vmin, vsum / n, vmax FROM rollups WHERE variable_id = ? AND res = ? AND bucket >= ? AND bucket * 1000 < ? ORDER BY bucket",
+            (vid, int(res), int(start_ms) // 1000 // int(res) * int(res), int(end_ms)),
+        )
+        return [(bucket + res / 2.0, vmin, avg, vmax) for bucket, vmin, avg, vmax in cur]
+
+    def query(self, vid, start_ms, end_ms):
+        cur = self.conn.execute(
+            "SELECT ts, value FROM samples WHERE variable_id = ? AND ts >= ? AND ts < ? ORDER BY ts",
+            (vid, int(start_ms), int(end_ms)),
+        )
+        return [(ts / 1000.0, value) for ts, value in cur]
+
+    def stats(self, vid, start_ms, end_ms):
+        return self.conn.execute(
+            "SELECT MIN(value), AVG(value), MAX(value), COUNT(*) FROM samples WHERE variable_id = ? AND ts >= ? AND ts < ?",
+            (vid, int(start_ms), int(end_ms)),
+        ).fetchone()
+
+    def close(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+
+_manifests = {}
+_manifests_lock = threading.Lock()
+_open_logs = set()
+_open_logs_lock = threading.Lock()
+
+
+def log_manifest(folder):
+    key = os.path.abspath(folder)
+    with _manifests_lock:
+        manifest = _manifests.get(key)
+        if manifest is None:
+            manifest = LogManifest(key)
+            _manifests[key] = manifest
+        return manifest
+
+
+class LogManifest:
+    VERSION = 2
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.path = os.path.join(folder, "manifest.json")
+        self.lock = threading.RLock()
+        self.data = {"archives": {}}
+        self._listed_mtime = None
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.data.update(json.load(f))
+            except Exception:
+                pass
+        if "files" not in self.data or self.data.get("version") != self.VERSION:
+            self.rebuild()
+        else:
+            self.refresh()
+
+    @staticmethod
+    def file_key(vid, date):
+        return f"{vid or ''}|{date}"
+
+    def _folder_mtime(self):
+        try:
+            return os.stat(self.folder).st_mtime_ns
+        except Exception:
+            return None
+
+    def _scan(self, fname):
+        info = LogMaintenance.classify(fname, self.folder)
+        if info is None:
+            return None
+        kind, vid, date, _ = info
+        try:
+            size, first, last = self._edges(os.path.join(self.folder, fname), kind)
+        except Exception:
+            return None
+        return self.file_key(vid, date), {"path": fname, "kind": kind, "size": size, "first": first, "last": last}
+
+    def rebuild(self):
+        self._listed_mtime = self._folder_mtime()
+        files = {}
+        try:
+            names = os.listdir(self.folder)
+        except Exception:
+            names = []
+        for fname in names:
+            scanned = self._scan(fname)
+            if scanned is not None:
+                files.setdefault(scanned[0], []).append(scanned[1])
+        with self.lock:
+            self.data["files"] = files
+            self.data["version"] = self.VERSION
+        self.save()
+
+    def refresh(self):
+        mtime = self._folder_mtime()
+        if mtime is None or mtime == self._listed_mtime:
+            return
+        self._listed_mtime = mtime
+        with self.lock:
+            indexed = {e["path"] for entries in self.data["files"].values() for e in entries}
+        try:
+            names = set(os.listdir(self.folder))
+        except Exception:
+            return
+        added = [s for s in map(self._scan, sorted(names - indexed)) if s is not None]
+        gone = indexed - names
+        if not added and not gone:
+            return
+        with self.lock:
+            files = self.data["files"]
+            for key in list(files):
+                entries = [e for e in files[key] if e["path"] not in gone]
+                if entries:
+                    files[key] = entries
+                else:
+                    files.pop(key)
+            for key, entry in added:
+                entries = files.setdefault(key, [])
+                if all(e["path"] != entry["path"] for e in entries):
+                    entries.append(entry)
+        self.save()
+
+    @staticmethod
+    def _edges(path, kind):
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if kind == "bin":
+                count = size // BINARY_RECORD.size
+                if not count:
+                    return size, None, None
+                f.seek(0)
+                first = BINARY_RECORD.unpack(f.read(BINARY_RECORD.size))[0] / 1000.0
+                f.seek((count - 1) * BINARY_RECORD.size)
+                last = BINARY_RECORD.unpack(f.read(BINARY_RECORD.size))[0] / 1000.0
+                return size, first, last
+            f.seek(0)
+            head = f.read(512).split(b"\n")
+            f.seek(max(0, size - 512))
+            tail = [l for l in f.read().split(b"\n") if l.strip()]
+        if len(head) < 3 or not tail:
+            return size, None, None
+        try:
+            first = datetime.fromisoformat(head[1][:19].decode()).timestamp()
+            last = datetime.fromisoformat(tail[-1][:19].decode()).timestamp()
+        except Exception:
+            return size, None, None
+        return size, first, last
+
+    def file_entry(self, vid, date, path):
+        fname = os.path.basename(path)
+        with self.lock:
+            entries = self.data["files"].setdefault(self.file_key(vid, date), [])
+            for entry in entries:
+                if entry["path"] == fname:
+                    return entry
+            entry = {"path": fname, "kind": "bin" if fname.endswith(".bin") else "csv", "size": 0, "first": None, "last": None}
+            entries.append(entry)
+            return entry
+
+    def drop_file(self, vid, date, path):
+        fname = os.path.basename(path)
+        key = self.file_key(vid, date)
+        with self.lock:
+            entries = [e for e in self.data["files"].get(key, []) if e["path"] != fname]
+            if entries:
+                self.data["files"][key] = entries
+            else:
+                self.data["files"].pop(key, None)
+
+    def files_for(self, kind, vid, start, end):
+        paths = []
+        day = datetime.fromtimestamp(start).date()
+        with self.lock:
+            while day <= datetime.fromtimestamp(end).date():
+                entries = self.data["files"].get(self.file_key(vid, day.strftime("%Y-%m-%d")), [])
+                day += timedelta(days=1)
+                for entry in entries:
+                    if entry.get("kind") != kind:
+                        continue
+                    if entry.get("first") is not None and entry.get("last") is not None and (entry["last"] < start or entry["first"] > end):
+                        continue
+                    paths.append(os.path.join(self.folder, entry["path"]))
+        return paths
+
+    def save(self):
+        with self.lock:
+            try:
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self.data, f, indent=1)
+                os.replace(tmp, self.path)
+            except Exception:
+                pass
+
+    def archives_for(self, kind, vid, start, end):
+        months = set()
+        day = datetime.fromtimestamp(start).date()
+        while day <= datetime.fromtimestamp(end).date():
+            months.add(day.strftime("%Y-%m"))
+            day += timedelta(days=1)
+        paths = []
+        with self.lock:
+            for rel, entry in sorted(self.data["archives"].items()):
+                if entry.get("kind") != kind or entry.get("vid") != vid or entry.get("month") not in months:
+                    continue
+                if entry.get("first") is not None and (entry["last"] < start or entry["first"] > end):
+                    continue
+                paths.append(os.path.join(self.folder, "archive", rel))
+        return paths
+
+
+class LogMaintenance:
+    _running = threading.Lock()
+
+    def __init__(self, log_cfg):
+        self.cfg = log_cfg or {}
+        self.folder = self.cfg.get("folder") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+        self.archive = bool(self.cfg.get("archive_closed_days", True))
+        try:
+            self.retention_days = int(self.cfg.get("retention_days", 0) or 0)
+        except Exception:
+            self.retention_days = 0
+        self.manifest = log_manifest(self.folder)
+
+    def start(self):
+        if (not self.archive and self.retention_days <= 0) or self._running.locked():
+            return
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def run(self):
+        if not self._running.acquire(blocking=False):
+            return
+        try:
+            today = datetime.now().strftime("%Y-%m-%d")
+            if self.archive:
+                self._archive_closed(today)
+            if self.retention_days > 0:
+                self._apply_retention((datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d"))
+        except Exception:
+            pass
+        finally:
+            self._running.release()
+
+    @staticmethod
+    def classify(fname, folder=None):
+        def is_date(text):
+            try:
+                datetime.strptime(text, "%Y-%m-%d")
+                return True
+            except Exception:
+                return False
+        if fname.endswith(".csv"):
+            stem, _, date = fname[:-4].rpartition("_")
+            if not stem or not is_date(date):
+                return None
+            if stem == "termo":
+                return "csv", None, date, f"termo_{date[:7]}.csv.gz"
+            vid = LogMaintenance.row_variable_id(os.path.join(folder, fname)) if folder else None
+            if vid is None:
+                name, _, suffix = stem.rpartition("_")
+                vid = suffix if name and len(suffix) == 36 and suffix.count("-") == 4 else stem
+            return "csv", vid, date, f"{stem}_{date[:7]}.csv.gz"
+        elif fname.endswith(".bin"):
+            parts = fname[:-4].rsplit("_", 1)
+            if len(parts) == 2 and is_date(parts[1]):
+                return "bin", parts[0], parts[1], f"{parts[0]}_{parts[1][:7]}.bin.gz"
+        return None
+
+    @staticmethod
+    def row_variable_id(path):
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore", newline="") as f:
+                header = f.readline()
+                row = f.readline()
+        except Exception:
+            return None
+        if not header.startswith("timestamp") or len(header) <= len("timestamp") or not row.strip():
+            return None
+        fields = next(csv.reader([row], delimiter=header[len("timestamp")]), [])
+        return fields[1] if len(fields) > 1 and fields[1] else None
+
+    def _archive_closed(self, today):
+        archive_dir = os.path.join(self.folder, "archive")
+        changed = False
+        for fname in sorted(os.listdir(self.folder)):
+            info = self.classify(fname, self.folder)
+            if info is None or info[2] >= today:
+                continue
+            path = os.path.join(self.folder, fname)
+            try:
+                with _open_logs_lock:
+                    if os.path.abspath(path) in _open_logs:
+                        continue
+                    os.makedirs(archive_dir, exist_ok=True)
+                    self._archive_file(path, archive_dir, *info)
+                changed = True
+            except Exception:
+                continue
+        if changed:
+            self.manifest.save()
+
+    def _archive_file(self, path, archive_dir, kind, vid, date, rel):
+        size = os.path.getsize(path)
+        with self.manifest.lock:
+            entry = self.manifest.data["archives"].setdefault(rel, {"kind": kind, "vid": vid, "month": date[:7], "days": {}, "first": None, "last": None})
+            if entry["days"].get(date) != size:
+                with open(path, "rb") as f:
+                    data = f.read()
+                first, last = self._span(data, kind)
+                if kind == "csv" and os.path.exists(os.path.join(archive_dir, rel)):
+                    data = data.split(b"\n", 1)[1] if b"\n" in data else b""
+                with gzip.open(os.path.join(archive_dir, rel), "ab") as gz:
+                    gz.write(data)
+                entry["days"][date] = size
+                if first is not None:
+                    entry["first"] = first if entry["first"] is None else min(entry["first"], first)
+                    entry["last"] = last if entry["last"] is None else max(entry["last"], last)
+                entry["size"] = os.path.getsize(os.path.join(archive_dir, rel))
+                self.manifest.save()
+        os.remove(path)
+        self.manifest.drop_file(vid, date, path)
+
+    @staticmethod
+    def _span(data, kind):
+        try:
+            if kind == "bin":
+                count = len(data) // BINARY_RECORD.size
+                if not count:
+                    return None, None
+                first = BINARY_RECORD.unpack_from(data, 0)[0] / 1000.0
+                last = BINARY_RECORD.unpack_from(data, (count - 1) * BINARY_RECORD.size)[0] / 1000.0
+                return first, last
+            lines = [l for l in data.decode("utf-8", "ignore").splitlines()[1:] if l.strip()]
+            if not lines:
+                return None, None
+            stamps = [datetime.fromisoformat(l[:19]).timestamp() for l in (lines[0], lines[-1])]
+            return min(stamps), max(stamps)
+        except Exception:
+            return None, None
+
+    def _apply_retention(self, cutoff):
+        for fname in os.listdir(self.folder):
+            info = self.classify(fname, self.folder)
+            if info is not None and info[2] < cutoff:
+                path = os.path.join(self.folder, fname)
+                try:
+                    with _open_logs_lock:
+                        if os.path.abspath(path) in _open_logs:
+                            continue
+                        os.remove(path)
+                    self.manifest.drop_file(info[1], info[2], fname)
+                except Exception:
+                    pass
+        with self.manifest.lock:
+            archives = self.manifest.data["archives"]
+            for rel in [r for r, e in archives.items() if e.get("month", "") < cutoff[:7]]:
+                try:
+                    os.remove(os.path.join(self.folder, "archive", rel))
+                except Exception:
+                    pass
+                archives.pop(rel, None)
+        self.manifest.save()
+        path = historian_path(self.cfg)
+        if os.path.exists(path):
+            try:
+                cutoff_ms = int(datetime.strptime(cutoff, "%Y-%m-%d").timestamp() * 1000)
+                conn = sqlite3.connect(path, timeout=30)
+                with conn:
+                    conn.execute("DELETE FROM samples WHERE ts < ?", (cutoff_ms,))
+                    conn.execute("DELETE FROM rollups WHERE bucket < ?", (cutoff_ms // 1000,))
+                conn.close()
+            except Exception:
+                pass
+
+
+class DeadbandFilter:
+    MODES = ("none", "absolute", "percent", "swinging_door")
+
+    def __init__(self, mode, band, max_silence):
+        self.mode = mode if mode in self.MODES else "none"
+        self.band = max(0.0, float(band or 0.0))
+        self.max_silence = max(0.0, float(max_silence or 0.0))
+        self.archived = None
+        self.last = None
+        self.slope_low = None
+        self.slope_high = None
+
+    def offer(self, ts, raw, value):
+        sample = (ts, raw, value)
+        if self.mode == "none" or self.archived is None:
+            return self._archive(sample)
+        if self.max_silence and (ts - self.archived[0]).total_seconds() >= self.max_silence:
+            return self.pending() + self._archive(sample)
+        if self.mode == "swinging_door":
+            return self._swinging_door(sample)
+        ref = self.archived[2]
+        band = abs(ref) * self.band / 100.0 if self.mode == "percent" else self.band
+        if abs(value - ref) >= band:
+            return self._archive(sample)
+        self.last = sample
+        return []
+
+    def _archive(self, sample):
+        self.archived = sample
+        self.last = None
+        self.slope_low = None
+        self.slope_high = None
+        return [sample]
+
+    def _swinging_door(self, sample):
+        t0, _, v0 = self.archived
+        dt = (sample[0] - t0).total_seconds()
+        if dt <= 0:
+            return []
+        low = (sample[2] - self.band - v0) / dt
+        high = (sample[2] + self.band - v0) / dt
+        slope_low = low if self.slope_low is None else max(self.slope_low, low)
+        slope_high = high if self.slope_high is None else min(self.slope_high, high)
+        if slope_low <= slope_high:
+            self.slope_low, self.slope_high = slope_low, slope_high
+            self.last = sample
+            return []
+        out = [self.last] if self.last is not None else []
+        if self.last is not None:
+            self.archived = self.last
+            self.last = None
+            self.slope_low = self.slope_high = None
+            return out + self._swinging_door(sample)
+        return out + self._archive(sample)
+
+    def pending(self):
+        return [self.last] if self.mode == "swinging_door" and self.last is not None else []
 
 
 class CSVLogger:
+    MAX_OPEN_FILES = 32
+    MANIFEST_SAVE_SEC = 30.0
+    HISTORIAN_BACKLOG = 200000
+    HISTORIAN_RETRY_SEC = 5.0
+    HEADER = ["timestamp","variable_id","variable_name","raw","value","unit"]
+
     def __init__(self, cfg):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._handles = OrderedDict()
+        self._day = None
+        self._meta = {}
+        self._historian = None
+        self._hist_rows = []
+        self._hist_retry_at = 0.0
+        self._hist_meta = {}
+        self._hist_new_meta = False
+        self._filters = {}
+        self._index = {}
+        self._index_saved = 0.0
+        self._index_dirty = False
+        self._lock = threading.Lock()
         self.update_config(cfg)
         self._vars = []
         self._last_ts = {}
 
     def update_config(self, cfg):
+        with self._lock:
+            self._drain_filters()
         self.cfg = cfg or {}
         self.enabled = bool(self.cfg.get("enabled", False))
         self.folder = self.cfg.get("folder") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
-        self.mode = self.cfg.get("mode", "per_variable")  # daily | single | per_variable
+        self.mode = self.cfg.get("mode", "per_variable")  # daily | single | per_variable | binary
         self.sep = self.cfg.get("separator", ",")
         try:
             self.interval_sec = float(self.cfg.get("interval_sec", 10.0))
         except Exception:
             self.interval_sec = 10.0
+        try:
+            self.flush_interval = max(0.1, float(self.cfg.get("flush_interval_sec", 2.0)))
+        except Exception:
+            self.flush_interval = 2.0
+        try:
+            self.flush_bytes = max(1, int(self.cfg.get("flush_kb", 64))) * 1024
+        except Exception:
+            self.flush_bytes = 64 * 1024
+        self.historian = bool(self.cfg.get("historian", False))
+        self.deadband_mode = self.cfg.get("deadband_mode", "none")
+        try:
+            self.deadband = float(self.cfg.get("deadband", 0.0))
+        except Exception:
+            self.deadband = 0.0
+        try:
+            self.max_silence = float(self.cfg.get("max_silence_sec", 300.0))
+        except Exception:
+            self.max_silence = 300.0
         try:
             os.makedirs(self.folder, exist_ok=True)
         except Exception:
             pass
+        if self._thread is not None:
+            self._queue.put(("reset",))
 
     def set_variables_snapshot(self, vars_list):
         self._vars = list(vars_list or [])
@@ -795,6 +2529,8 @@ class CSVLogger:
 
     def _file_for(self, var, ts):
         date_str = ts.strftime("%Y-%m-%d")
+        if self.mode == "binary":
+            return os.path.join(self.folder, f"{var.get('id')}_{date_str}.bin")
         if self.mode == "single":
             return os.path.join(self.folder, "termo_log.csv")
         if self.mode == "per_variable":
@@ -808,6 +2544,10 @@ class CSVLogger:
     def log(self, var, raw, value):
         if not self.enabled:
             return
+        with self._lock:
+            self._log(var, raw, value)
+
+    def _log(self, var, raw, value):
         ts = datetime.now()
         # Throttle by interval per variable id
         try:
@@ -819,33 +2559,278 @@ class CSVLogger:
                         return
                 self._last_ts[vid] = ts
         except Exception:
-            pass
-        path = self._file_for(var, ts)
+            pass
+        for sample_ts, sample_raw, sample_value in self._filter_for(var).offer(ts, raw, float(value)):
+            self._enqueue(sample_ts, var, sample_raw, sample_value)
+
+    def _filter_for(self, var):
+        band = var.get("log_deadband")
+        if band is None:
+            band = self.deadband
+        vid = var.get("id")
+        entry = self._filters.get(vid)
+        if entry is None or entry[0] is not var:
+            filt = entry[1] if entry is not None and entry[1].band == float(band) else DeadbandFilter(self.deadband_mode, band, self.max_silence)
+            entry = (var, filt)
+            self._filters[vid] = entry
+        return entry[1]
+
+    def _enqueue(self, ts, var, raw, value):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._writer, daemon=True)
+            self._thread.start()
+        self._queue.put(("row", ts, var, raw, value))
+
+    def _drain_filters(self):
+        for var, filt in self._filters.values():
+            for ts, raw, value in filt.pending():
+                self._enqueue(ts, var, raw, value)
+        self._filters = {}
+
+    def flush(self, timeout=5.0):
+        self._request("flush", timeout)
+
+    def close(self, timeout=5.0):
+        with self._lock:
+            self._drain_filters()
+        self._request("close", timeout)
+        self._thread = None
+
+    def _request(self, kind, timeout):
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put((kind, done))
+        done.wait(timeout)
+
+    def _writer(self):
+        pending = 0
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+            if item is not None:
+                kind = item[0]
+                if kind == "row":
+                    pending += self._write(*item[1:])
+                    self._queue_historian(*item[1:])
+                elif kind == "reset":
+                    self._flush_historian()
+                    self._close_historian()
+                    self._close_handles()
+                    self._meta = {}
+                    pending = 0
+                elif kind in ("flush", "close"):
+                    self._drain()
+                    self._flush_handles()
+                    self._save_index(force=True)
+                    self._flush_historian()
+                    pending = 0
+                    last_flush = time.monotonic()
+                    if kind == "close":
+                        self._close_historian()
+                        self._close_handles()
+                        item[1].set()
+                        return
+                    item[1].set()
+            if self._hist_rows and self._queue.empty() and time.monotonic() >= self._hist_retry_at:
+                self._flush_historian()
+            if pending and (pending >= self.flush_bytes or time.monotonic() - last_flush >= self.flush_interval):
+                self._flush_handles()
+                pending = 0
+                last_flush = time.monotonic()
+
+    def _drain(self):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item[0] == "row":
+                self._write(*item[1:])
+                self._queue_historian(*item[1:])
+            elif item[0] == "reset":
+                self._close_handles()
+            else:
+                self._queue.put(item)
+                return
+
+    def _write(self, ts, var, raw, value):
+        if self.mode == "binary":
+            return self._write_binary(ts, var, raw, value)
+        try:
+            path = self._file_for(var, ts)
+            writer = self._handle(path, ts.strftime("%Y-%m-%d"))
+            self._index_sample(path, var, ts)
+            return writer.writerow([
+                ts.isoformat(timespec="seconds"),
+                var.get("id"),
+                var.get("name"),
+                int(raw),
+                float(value),
+                var.get("unit",""),
+            ]) or 0
+        except Exception:
+            return 0
+
+    def _queue_historian(self, ts, var, raw, value):
+        if not self.historian:
+            return
+        vid = var.get("id")
+        try:
+            self._hist_rows.append((vid, int(ts.timestamp() * 1000), int(raw), float(value)))
+        except Exception:
+            return
+        meta = (vid, var.get("name"), var.get("unit", ""))
+        if self._hist_meta.get(vid) != meta:
+            self._hist_meta[vid] = meta
+            self._hist_new_meta = True
+
+    def _flush_historian(self):
+        rows, self._hist_rows = self._hist_rows, []
+        if not rows:
+            return
+        try:
+            if self._historian is None:
+                self._historian = SQLiteHistorian(historian_path(self.cfg))
+                self._hist_new_meta = True
+            meta = list(self._hist_meta.values()) if self._hist_new_meta else None
+            self._historian.insert(rows, meta)
+            self._hist_new_meta = False
+            self._hist_retry_at = 0.0
+        except Exception:
+            self._close_historian()
+            self._hist_rows = (rows + self._hist_rows)[-self.HISTORIAN_BACKLOG:]
+            self._hist_retry_at = time.monotonic() + self.HISTORIAN_RETRY_SEC
+
+    def _close_historian(self):
+        if self._historian is not None:
+            self._historian.close()
+            self._historian = None
+
+    def _write_binary(self, ts, var, raw, value):
         try:
-            is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+            self._write_meta(var)
+            path = self._file_for(var, ts)
+            f = self._handle(path, ts.strftime("%Y-%m-%d"), binary=True)
+            self._index_sample(path, var, ts)
+            return f.write(BINARY_RECORD.pack(int(ts.timestamp() * 1000), int(raw) & 0xFFFF, float(value)))
         except Exception:
-            is_new = True
+            return 0
+
+    def _index_sample(self, path, var, ts):
+        if self.mode == "single":
+            return
+        manifest = log_manifest(self.folder)
+        entry = self._index.get(path)
+        if entry is None:
+            vid = None if self.mode == "daily" else var.get("id")
+            entry = manifest.file_entry(vid, ts.strftime("%Y-%m-%d"), path)
+            self._index[path] = entry
+        stamp = ts.timestamp()
+        with manifest.lock:
+            if entry["first"] is None or stamp < entry["first"]:
+                entry["first"] = stamp
+            if entry["last"] is None or stamp > entry["last"]:
+                entry["last"] = stamp
+        self._index_dirty = True
+
+    def _save_index(self, force=False):
+        if not self._index_dirty:
+            return
+        if not force and time.monotonic() - self._index_saved < self.MANIFEST_SAVE_SEC:
+            return
+        manifest = log_manifest(self.folder)
+        with manifest.lock:
+            for path, (f, _) in self._handles.items():
+                entry = self._index.get(path)
+                if entry is not None:
+                    try:
+                        entry["size"] = f.tell()
+                    except Exception:
+                        pass
+        manifest.save()
+        self._index_dirty = False
+        self._index_saved = time.monotonic()
+
+    def _write_meta(self, var):
+        vid = var.get("id")
+        meta = {"id": vid, "name": var.get("name"), "unit": var.get("unit", ""), "record": BINARY_RECORD.format, "fields": ["timestamp_ms", "raw", "value"]}
+        if self._meta.get(vid) == meta:
+            return
         try:
-            with open(path, "a", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f, delimiter=self.sep)
-                if is_new:
-                    writer.writerow(["timestamp","variable_id","variable_name","raw","value","unit"]) 
-                writer.writerow([
-                    ts.isoformat(timespec="seconds"),
-                    var.get("id"),
-                    var.get("name"),
-                    int(raw),
-                    float(value),
-                    var.get("unit",""),
-                ])
+            with open(os.path.join(self.folder, f"{vid}.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f, indent=2, ensure_ascii=False)
+            self._meta[vid] = meta
         except Exception:
             pass
 
+    def _handle(self, path, day, binary=False):
+        if self._day is None or day > self._day:
+            self._close_handles()
+            self._day = day
+            LogMaintenance(self.cfg).start()
+        entry = self._handles.get(path)
+        if entry is not None:
+            self._handles.move_to_end(path)
+            return entry[0] if binary else entry[1]
+        while len(self._handles) >= self.MAX_OPEN_FILES:
+            old, (f, _) = self._handles.popitem(last=False)
+            try:
+                if old in self._index:
+                    self._index.pop(old)["size"] = f.tell()
+                f.close()
+            except Exception:
+                pass
+            with _open_logs_lock:
+                _open_logs.discard(os.path.abspath(old))
+        if binary:
+            with _open_logs_lock:
+                f = open(path, "ab")
+                _open_logs.add(os.path.abspath(path))
+            self._handles[path] = (f, None)
+            return f
+        with _open_logs_lock:
+            try:
+                is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+            except Exception:
+                is_new = True
+            f = open(path, "a", newline="", encoding="utf-8")
+            _open_logs.add(os.path.abspath(path))
+        writer = csv.writer(f, delimiter=self.sep)
+        if is_new:
+            writer.writerow(self.HEADER)
+        self._handles[path] = (f, writer)
+        return writer
+
+    def _flush_handles(self):
+        for f, _ in self._handles.values():
+            try:
+                f.flush()
+            except Exception:
+                pass
+        self._save_index()
+
+    def _close_handles(self):
+        self._save_index(force=True)
+        self._index = {}
+        while self._handles:
+            path, (f, _) = self._handles.popitem()
+            try:
+                f.close()
+            except Exception:
+                pass
+            with _open_logs_lock:
+                _open_logs.discard(os.path.abspath(path))
+
 
 class VariableForm(QFrame):
     delete_requested = pyqtSignal(str)
 
-    def __init__(self, var, zones=None):
+    def __init__(self, var, zones=None, buses=None):
         super().__init__()
         self.var = dict(var)
         if not self.var.get("id"):
@@ -869,6 +2854,8 @@ class VariableForm(QFrame):
         g = QGridLayout()
         self.zone_combo = QComboBox()
         self.set_zones(zones or [])
+        self.bus_combo = QComboBox()
+        self.set_buses(buses or [])
         self.alarm_enable = QCheckBox("Alarma")
         self.alarm_enable.setChecked(bool(self.var.get("alarm_enabled", False)))
         self.alarm_min_spin = QDoubleSpinBox(); self.alarm_min_spin.setDecimals(2); self.alarm_min_spin.setRange(-1e6, 1e6)
@@ -889,9 +2876,12 @@ class VariableForm(QFrame):
         self.calib_spin = QDoubleSpinBox(); self.calib_spin.setDecimals(6); self.calib_spin.setRange(-1e6,1e6); self.calib_spin.setSingleStep(0.1); self.calib_spin.setValue(float(self.var.get("calibration",0.0)))
         self.decimals_spin = QSpinBox(); self.decimals_spin.setRange(0,6); self.decimals_spin.setValue(int(self.var.get("decimals",1)))
         self.interval_spin = QSpinBox(); self.interval_spin.setRange(50,60000); self.interval_spin.setSingleStep(50); self.interval_spin.setValue(int(self.var.get("poll_interval_ms",1000)))
+        self.deadband_spin = QDoubleSpinBox(); self.deadband_spin.setDecimals(3); self.deadband_spin.setRange(-1.0,1e6); self.deadband_spin.setSingleStep(0.1); self.deadband_spin.setSpecialValueText("Global")
+        self.deadband_spin.setValue(-1.0 if self.var.get("log_deadband") is None else float(self.var.get("log_deadband")))
         self.enabled_check = QCheckBox("Activo"); self.enabled_check.setChecked(bool(self.var.get("enabled",True)))
         fields = [
             ("Zona", self.zone_combo),
+            ("Bus", self.bus_combo),
             ("Alarmas", self.alarm_enable),
             ("Alarma min", self.alarm_min_spin),
             ("Alarma max", self.alarm_max_spin),
@@ -905,6 +2895,7 @@ class VariableForm(QFrame):
             ("Calibración", self.calib_spin),
             ("Decimales", self.decimals_spin),
             ("Intervalo ms", self.interval_spin),
+            ("Banda muerta log", self.deadband_spin),
         ]
         for i,(lbl,w) in enumerate(fields):
             g.addWidget(QLabel(lbl), i//2, (i%2)*2)
@@ -931,12 +2922,23 @@ class VariableForm(QFrame):
             self.zone_combo.setCurrentIndex(zone_ids.index(desired_id))
             self.var["zone_id"] = desired_id
 
+    def set_buses(self, buses):
+        current_id = self.bus_combo.currentData() if self.bus_combo.count() else self.var.get("bus_id")
+        self.bus_combo.clear()
+        self.bus_combo.addItem("Principal", None)
+        bus_ids = [None]
+        for bus in buses:
+            self.bus_combo.addItem(bus.get("name") or bus.get("port") or "Bus", bus.get("id"))
+            bus_ids.append(bus.get("id"))
+        self.bus_combo.setCurrentIndex(bus_ids.index(current_id) if current_id in bus_ids else 0)
+
     def data(self):
         return {
             "id": self.var.get("id"),
             "name": self.name_edit.text().strip() or "Temperatura",
             "unit": self.unit_edit.text().strip() or "°C",
             "zone_id": self.zone_combo.currentData() or self.var.get("zone_id"),
+            "bus_id": self.bus_combo.currentData(),
             "alarm_enabled": bool(self.alarm_enable.isChecked()),
             "alarm_min": float(self.alarm_min_spin.value()) if self.alarm_enable.isChecked() else None,
             "alarm_max": float(self.alarm_max_spin.value()) if self.alarm_enable.isChecked() else None,
@@ -950,6 +2952,7 @@ class VariableForm(QFrame):
             "calibration": float(self.calib_spin.value()),
             "decimals": int(self.decimals_spin.value()),
             "poll_interval_ms": int(self.interval_spin.value()),
+            "log_deadband": None if self.deadband_spin.value() < 0 else float(self.deadband_spin.value()),
             "enabled": bool(self.enabled_check.isChecked()),
         }
 
@@ -1009,7 +3012,18 @@ class SettingsDialog(QDialog):
         self.byte_combo = QComboBox(); self.byte_combo.addItems(["7","8"]) 
         self.timeout_spin = QDoubleSpinBox(); self.timeout_spin.setRange(0.02,10.0); self.timeout_spin.setSingleStep(0.02)
         self.global_poll_spin = QSpinBox(); self.global_poll_spin.setRange(50,60000); self.global_poll_spin.setSingleStep(50)
+        self.max_gap_spin = QSpinBox(); self.max_gap_spin.setRange(0, ReadPlanner.MAX_COUNT - 1)
+        self.transport_combo = QComboBox(); self.transport_combo.addItems(["serial","tcp","rtu_tcp"])
+        self.host_edit = QLineEdit()
+        self.tcp_port_spin = QSpinBox(); self.tcp_port_spin.setRange(1,65535)
+        self.pool_spin = QSpinBox(); self.pool_spin.setRange(1,8)
+        self.engine_combo = QComboBox(); self.engine_combo.addItems(["thread","asyncio"])
+        self.engine_combo.setCurrentText(self._cfg.get("engine", "thread"))
         ser = self._cfg.get("serial", {})
+        self.transport_combo.setCurrentText(ser.get("transport", "serial"))
+        self.host_edit.setText(ser.get("host", ""))
+        self.tcp_port_spin.setValue(int(ser.get("tcp_port", 502)))
+        self.pool_spin.setValue(int(ser.get("pool_size", 2)))
         self.port_combo.setCurrentText(ser.get("port", "COM3"))
         self.baud_combo.setCurrentText(str(ser.get("baudrate", 9600)))
         self.parity_combo.setCurrentText(ser.get("parity", "N"))
@@ -1017,6 +3031,9 @@ class SettingsDialog(QDialog):
         self.byte_combo.setCurrentText(str(ser.get("bytesize", 8)))
         self.timeout_spin.setValue(float(ser.get("timeout", 1.0)))
         self.global_poll_spin.setValue(int(self._cfg.get("poll_interval_ms", 1000)))
+        self.max_gap_spin.setValue(int(ser.get("max_gap", 10)))
+        self.render_fps_spin = QSpinBox(); self.render_fps_spin.setRange(1, 60)
+        self.render_fps_spin.setValue(int(self._cfg.get("ui", {}).get("render_fps", 10)))
         refresh_btn = QPushButton("Buscar puertos")
         refresh_btn.clicked.connect(self._refresh_ports)
         g.addWidget(QLabel("Puerto"),0,0); g.addWidget(self.port_combo,0,1)
@@ -1026,9 +3043,145 @@ class SettingsDialog(QDialog):
         g.addWidget(QLabel("Data bits"),2,0); g.addWidget(self.byte_combo,2,1)
         g.addWidget(QLabel("Timeout (s)"),2,2); g.addWidget(self.timeout_spin,2,3)
         g.addWidget(QLabel("Intervalo global (ms)"),3,0); g.addWidget(self.global_poll_spin,3,1)
+        g.addWidget(QLabel("Hueco máx. agrupado (reg)"),3,2); g.addWidget(self.max_gap_spin,3,3)
+        g.addWidget(QLabel("Transporte"),4,0); g.addWidget(self.transport_combo,4,1)
+        g.addWidget(QLabel("Host"),4,2); g.addWidget(self.host_edit,4,3)
+        g.addWidget(QLabel("Puerto TCP"),5,0); g.addWidget(self.tcp_port_spin,5,1)
+        g.addWidget(QLabel("Conexiones TCP"),5,2); g.addWidget(self.pool_spin,5,3)
+        g.addWidget(QLabel("Motor de sondeo"),1,4); g.addWidget(self.engine_combo,2,4)
+        g.addWidget(QLabel("Refresco pantalla (fps)"),3,4); g.addWidget(self.render_fps_spin,4,4)
         g.addWidget(refresh_btn,0,4)
+        buses_box = QGroupBox("Buses adicionales")
+        bg = QGridLayout(buses_box)
+        self.buses_list = QListWidget()
+        self.buses_list.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
+        self._bus_meta = {}
+        self._loading_bus_meta = False
+        for bus in self._cfg.get("buses", []) or []:
+            bid = bus.get("id") or str(uuid.uuid4())
+            self._bus_meta[bid] = {k: v for k, v in bus.items() if k not in ("id", "name")}
+            item = QListWidgetItem(bus.get("name") or bus.get("port") or "Bus")
+            item.setData(Qt.UserRole, bid)
+            item.setFlags(item.flags() | Qt.ItemIsEditable)
+            self.buses_list.addItem(item)
+        self.bus_port_combo = QComboBox(); self.bus_port_combo.setEditable(True)
+        self.bus_port_combo.addItems([self.port_combo.itemText(i) for i in range(self.port_combo.count())])
+        self.bus_baud_combo = QComboBox(); self.bus_baud_combo.addItems(["1200","2400","4800","9600","19200","38400","57600","115200"])
+        self.bus_parity_combo = QComboBox(); self.bus_parity_combo.addItems(["N","E","O"])
+        self.bus_stop_combo = QComboBox(); self.bus_stop_combo.addItems(["1","2"])
+        self.bus_byte_combo = QComboBox(); self.bus_byte_combo.addItems(["7","8"])
+        self.bus_transport_combo = QComboBox(); self.bus_transport_combo.addItems(["serial","tcp","rtu_tcp"])
+        self.bus_host_edit = QLineEdit()
+        self.bus_tcp_port_spin = QSpinBox(); self.bus_tcp_port_spin.setRange(1,65535)
+        self.bus_add_btn = QPushButton("Añadir bus")
+        self.bus_del_btn = QPushButton("Eliminar bus")
+        bg.addWidget(self.buses_list, 0, 0, 8, 1)
+        bg.addWidget(QLabel("Puerto"), 0, 1); bg.addWidget(self.bus_port_combo, 0, 2)
+        bg.addWidget(QLabel("Baudios"), 1, 1); bg.addWidget(self.bus_baud_combo, 1, 2)
+        bg.addWidget(QLabel("Paridad"), 2, 1); bg.addWidget(self.bus_parity_combo, 2, 2)
+        bg.addWidget(QLabel("Stop bits"), 3, 1); bg.addWidget(self.bus_stop_combo, 3, 2)
+        bg.addWidget(QLabel("Data bits"), 4, 1); bg.addWidget(self.bus_byte_combo, 4, 2)
+        bg.addWidget(QLabel("Transporte"), 5, 1); bg.addWidget(self.bus_transport_combo, 5, 2)
+        bg.addWidget(QLabel("Host"), 6, 1); bg.addWidget(self.bus_host_edit, 6, 2)
+        bg.addWidget(QLabel("Puerto TCP"), 7, 1); bg.addWidget(self.bus_tcp_port_spin, 7, 2)
+        bus_btns = QHBoxLayout(); bus_btns.addWidget(self.bus_add_btn); bus_btns.addWidget(self.bus_del_btn); bus_btns.addStretch(1)
+        bg.addLayout(bus_btns, 8, 0, 1, 3)
+        g.addWidget(buses_box, 6, 0, 1, 5)
+        g.setRowStretch(7, 1)
+        self.bus_add_btn.clicked.connect(self._add_bus)
+        self.bus_del_btn.clicked.connect(self._remove_bus)
+        self.buses_list.currentItemChanged.connect(self._load_bus_meta)
+        self.buses_list.itemChanged.connect(lambda _: self._refresh_var_bus_options())
+        for wdg in [self.bus_port_combo, self.bus_baud_combo, self.bus_parity_combo, self.bus_stop_combo, self.bus_byte_combo, self.bus_transport_combo]:
+            wdg.currentTextChanged.connect(self._on_bus_meta_changed)
+        self.bus_host_edit.textChanged.connect(self._on_bus_meta_changed)
+        self.bus_tcp_port_spin.valueChanged.connect(self._on_bus_meta_changed)
+        self._set_bus_fields_enabled(False)
+        if self.buses_list.count() > 0:
+            self.buses_list.setCurrentRow(0)
         self.tabs.addTab(w, "Comunicación")
 
+    def _set_bus_fields_enabled(self, enabled):
+        for wdg in [self.bus_port_combo, self.bus_baud_combo, self.bus_parity_combo, self.bus_stop_combo, self.bus_byte_combo, self.bus_transport_combo, self.bus_host_edit, self.bus_tcp_port_spin, self.bus_del_btn]:
+            wdg.setEnabled(enabled)
+
+    def _load_bus_meta(self, current, previous=None):
+        self._loading_bus_meta = True
+        bid = current.data(Qt.UserRole) if current else None
+        self._set_bus_fields_enabled(bool(bid))
+        meta = self._bus_meta.get(bid, {})
+        ser = self._cfg.get("serial", {})
+        self.bus_port_combo.setCurrentText(str(meta.get("port", "")))
+        self.bus_baud_combo.setCurrentText(str(meta.get("baudrate", ser.get("baudrate", 9600))))
+        self.bus_parity_combo.setCurrentText(meta.get("parity", ser.get("parity", "N")))
+        self.bus_stop_combo.setCurrentText(str(meta.get("stopbits", ser.get("stopbits", 1))))
+        self.bus_byte_combo.setCurrentText(str(meta.get("bytesize", ser.get("bytesize", 8))))
+        self.bus_transport_combo.setCurrentText(meta.get("transport", "serial"))
+        self.bus_host_edit.setText(meta.get("host", ""))
+        self.bus_tcp_port_spin.setValue(int(meta.get("tcp_port", 502)))
+        self._loading_bus_meta = False
+
+    def _on_bus_meta_changed(self, *_):
+        if self._loading_bus_meta:
+            return
+        item = self.buses_list.currentItem()
+        bid = item.data(Qt.UserRole) if item else None
+        if not bid:
+            return
+        meta = self._bus_meta.setdefault(bid, {})
+        meta["port"] = self.bus_port_combo.currentText().strip()
+        meta["baudrate"] = int(self.bus_baud_combo.currentText())
+        meta["parity"] = self.bus_parity_combo.currentText()
+        meta["stopbits"] = int(self.bus_stop_combo.currentText())
+        meta["bytesize"] = int(self.bus_byte_combo.currentText())
+        meta["transport"] = self.bus_transport_combo.currentText()
+        meta["host"] = self.bus_host_edit.text().strip()
+        meta["tcp_port"] = int(self.bus_tcp_port_spin.value())
+
+    def _add_bus(self):
+        bid = str(uuid.uuid4())
+        item = QListWidgetItem(f"Bus {self.buses_list.count() + 2}")
+        item.setData(Qt.UserRole, bid)
+        item.setFlags(item.flags() | Qt.ItemIsEditable)
+        self._bus_meta[bid] = {}
+        self.buses_list.addItem(item)
+        self.buses_list.setCurrentItem(item)
+        self._on_bus_meta_changed()
+        self._refresh_var_bus_options()
+
+    def _remove_bus(self):
+        row = self.buses_list.currentRow()
+        if row < 0:
+            return
+        if QMessageBox.question(
+            self,
+            "Buses",
+            "¿Eliminar el bus? Sus variables pasarán al bus principal.",
+        ) != QMessageBox.Yes:
+            return
+        item = self.buses_list.takeItem(row)
+        self._bus_meta.pop(item.data(Qt.UserRole), None)
+        self._refresh_var_bus_options()
+
+    def _current_buses(self):
+        buses = []
+        for i in range(self.buses_list.count()):
+            item = self.buses_list.item(i)
+            bid = item.data(Qt.UserRole)
+            bus = {"id": bid, "name": item.text().strip() or f"Bus {i + 2}"}
+            bus.update(self._bus_meta.get(bid, {}))
+            buses.append(bus)
+        return buses
+
+    def _refresh_var_bus_options(self):
+        if not hasattr(self, "vars_layout"):
+            return
+        buses = self._current_buses()
+        for i in range(self.vars_layout.count()):
+            w = self.vars_layout.itemAt(i).widget()
+            if isinstance(w, VariableForm):
+                w.set_buses(buses)
+
     def _build_zones_tab(self):
         w = QWidget(); v = QVBoxLayout(w)
         self.zones_list = QListWidget()
@@ -1228,14 +3381,32 @@ class SettingsDialog(QDialog):
         self.log_enabled.setChecked(bool(log.get("enabled", False)))
         self.log_folder = QLineEdit(log.get("folder", os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")))
         self.log_browse = QPushButton("Examinar…")
-        self.log_mode = QComboBox(); self.log_mode.addItems(["per_variable","daily","single"]); self.log_mode.setCurrentText(log.get("mode","per_variable"))
+        self.log_mode = QComboBox(); self.log_mode.addItems(["per_variable","daily","single","binary"]); self.log_mode.setCurrentText(log.get("mode","per_variable"))
         self.log_sep = QComboBox(); self.log_sep.addItems([",",";","\t"]); self.log_sep.setCurrentText(log.get("separator", ","))
         self.log_interval = QDoubleSpinBox(); self.log_interval.setDecimals(1); self.log_interval.setRange(0.0, 3600.0); self.log_interval.setSingleStep(0.5); self.log_interval.setValue(float(log.get("interval_sec", 10.0)))
+        self.log_flush = QDoubleSpinBox(); self.log_flush.setDecimals(1); self.log_flush.setRange(0.1, 600.0); self.log_flush.setSingleStep(0.5); self.log_flush.setValue(float(log.get("flush_interval_sec", 2.0)))
+        self.log_flush_kb = QSpinBox(); self.log_flush_kb.setRange(1, 65536); self.log_flush_kb.setValue(int(log.get("flush_kb", 64)))
+        self.log_deadband_mode = QComboBox(); self.log_deadband_mode.addItems(list(DeadbandFilter.MODES)); self.log_deadband_mode.setCurrentText(log.get("deadband_mode", "none"))
+        self.log_deadband = QDoubleSpinBox(); self.log_deadband.setDecimals(3); self.log_deadband.setRange(0.0, 1e6); self.log_deadband.setSingleStep(0.1); self.log_deadband.setValue(float(log.get("deadband", 0.0)))
+        self.log_silence = QDoubleSpinBox(); self.log_silence.setDecimals(0); self.log_silence.setRange(0.0, 86400.0); self.log_silence.setSingleStep(60.0); self.log_silence.setValue(float(log.get("max_silence_sec", 300.0)))
+        self.log_archive = QCheckBox("Comprimir días cerrados en archivos mensuales")
+        self.log_archive.setChecked(bool(log.get("archive_closed_days", True)))
+        self.log_retention = QSpinBox(); self.log_retention.setRange(0, 3650); self.log_retention.setSpecialValueText("Sin límite"); self.log_retention.setValue(int(log.get("retention_days", 0)))
+        self.log_historian = QCheckBox("Historiador SQLite (historian.db)")
+        self.log_historian.setChecked(bool(log.get("historian", False)))
         g.addWidget(self.log_enabled, 0, 0, 1, 2)
         g.addWidget(QLabel("Carpeta"), 1, 0); g.addWidget(self.log_folder, 1, 1); g.addWidget(self.log_browse, 1, 2)
         g.addWidget(QLabel("Modo"), 2, 0); g.addWidget(self.log_mode, 2, 1)
         g.addWidget(QLabel("Separador"), 3, 0); g.addWidget(self.log_sep, 3, 1)
         g.addWidget(QLabel("Intervalo de guardado (s)"), 4, 0); g.addWidget(self.log_interval, 4, 1)
+        g.addWidget(QLabel("Volcado a disco cada (s)"), 5, 0); g.addWidget(self.log_flush, 5, 1)
+        g.addWidget(QLabel("Volcado a disco cada (KB)"), 6, 0); g.addWidget(self.log_flush_kb, 6, 1)
+        g.addWidget(self.log_historian, 7, 0, 1, 2)
+        g.addWidget(QLabel("Banda muerta"), 8, 0); g.addWidget(self.log_deadband_mode, 8, 1)
+        g.addWidget(QLabel("Banda (unidades o %)"), 9, 0); g.addWidget(self.log_deadband, 9, 1)
+        g.addWidget(QLabel("Silencio máx. (s)"), 10, 0); g.addWidget(self.log_silence, 10, 1)
+        g.addWidget(self.log_archive, 11, 0, 1, 2)
+        g.addWidget(QLabel("Retención (días)"), 12, 0); g.addWidget(self.log_retention, 12, 1)
         self.log_browse.clicked.connect(self._browse_logs)
         self.tabs.addTab(w, "Histórico")
 
@@ -1275,7 +3446,7 @@ class SettingsDialog(QDialog):
                 "poll_interval_ms": int(self.global_poll_spin.value()) if hasattr(self, 'global_poll_spin') else int(self._cfg.get("poll_interval_ms", 1000)),
                 "enabled": True,
             }
-        form = VariableForm(var, zones=zones)
+        form = VariableForm(var, zones=zones, buses=self._current_buses())
         form.delete_requested.connect(self._remove_var_form)
         self.vars_layout.addWidget(form)
 
@@ -1304,10 +3475,17 @@ class SettingsDialog(QDialog):
                 "stopbits": int(self.stop_combo.currentText()),
                 "bytesize": int(self.byte_combo.currentText()),
                 "timeout": float(self.timeout_spin.value()),
+                "max_gap": int(self.max_gap_spin.value()),
+                "transport": self.transport_combo.currentText(),
+                "host": self.host_edit.text().strip(),
+                "tcp_port": int(self.tcp_port_spin.value()),
+                "pool_size": int(self.pool_spin.value()),
             },
             "poll_interval_ms": int(self.global_poll_spin.value()),
+            "engine": self.engine_combo.currentText(),
+            "buses": self._current_buses(),
             "zones": self._current_zones(),
-            "ui": self._cfg.get("ui", {"density": "normal"}),
+            "ui": dict(self._cfg.get("ui", {"density": "normal"}), render_fps=int(self.render_fps_spin.value())),
             "variables": [],
             "logging": {
                 "enabled": bool(self.log_enabled.isChecked()),
@@ -1315,6 +3493,14 @@ class SettingsDialog(QDialog):
                 "mode": self.log_mode.currentText(),
                 "separator": self.log_sep.currentText(),
                 "interval_sec": float(self.log_interval.value()),
+                "flush_interval_sec": float(self.log_flush.value()),
+                "flush_kb": int(self.log_flush_kb.value()),
+                "historian": bool(self.log_historian.isChecked()),
+                "deadband_mode": self.log_deadband_mode.currentText(),
+                "deadband": float(self.log_deadband.value()),
+                "max_silence_sec": float(self.log_silence.value()),
+                "archive_closed_days": bool(self.log_archive.isChecked()),
+                "retention_days": int(self.log_retention.value()),
             }
         }
         for i in range(self.vars_layout.count()):
@@ -1328,6 +3514,424 @@ class SettingsDialog(QDialog):
         return self._cfg
 
 
+def iso_to_epoch(stamps):
+    if np is not None and len(stamps):
+        try:
+            naive = np.array(stamps, dtype="datetime64[s]").astype(np.int64)
+            hours, inverse = np.unique(naive // 3600, return_inverse=True)
+            shift = np.array([time.mktime(time.gmtime(int(h) * 3600)[:8] + (-1,)) - int(h) * 3600 for h in hours])
+            return naive + shift[inverse]
+        except Exception:
+            pass
+    out = array("d")
+    for stamp in stamps:
+        try:
+            out.append(datetime.fromisoformat(stamp).timestamp())
+        except Exception:
+            out.append(float("nan"))
+    return out
+
+
+def parse_floats(texts):
+    if np is not None:
+        try:
+            return np.array(texts, dtype=float)
+        except ValueError:
+            pass
+    out = array("d")
+    for text in texts:
+        try:
+            out.append(float(text))
+        except ValueError:
+            out.append(float("nan"))
+    return out
+
+
+def join_arrays(chunks):
+    if np is not None:
+        return np.concatenate([np.asarray(c, dtype=float) for c in chunks]) if chunks else np.empty(0)
+    out = array("d")
+    for chunk in chunks:
+        out.extend(chunk)
+    return out
+
+
+class SeriesBuffer:
+    def __init__(self):
+        self.size = 0
+        if np is not None:
+            self.ts, self.values = np.empty(0), np.empty(0)
+        else:
+            self.ts, self.values = array("d"), array("d")
+
+    def __len__(self):
+        return self.size
+
+    def extend(self, ts, values):
+        if np is None:
+            self.ts.extend(ts)
+            self.values.extend(values)
+            self.size = len(self.ts)
+            return
+        ts = np.asarray(ts, dtype=float)
+        values = np.asarray(values, dtype=float)
+        need = self.size + len(ts)
+        if need > len(self.ts):
+            cap = max(need, 2 * len(self.ts), 4096)
+            for name in ("ts", "values"):
+                grown = np.empty(cap)
+                grown[:self.size] = getattr(self, name)[:self.size]
+                setattr(self, name, grown)
+        self.ts[self.size:need] = ts
+        self.values[self.size:need] = values
+        self.size = need
+
+    def arrays(self):
+        if np is None:
+            return self.ts, self.values
+        return self.ts[:self.size], self.values[:self.size]
+
+
+def clip_series(ts, values, start, end):
+    if np is not None:
+        ts = np.asarray(ts, dtype=float)
+        values = np.asarray(values, dtype=float)
+        keep = np.isfinite(ts) & np.isfinite(values)
+        if not keep.all():
+            ts, values = ts[keep], values[keep]
+        order = np.argsort(ts, kind="stable")
+        ts, values = ts[order], values[order]
+        lo = int(np.searchsorted(ts, start, side="left"))
+        hi = int(np.searchsorted(ts, end, side="right"))
+        return ts[lo:hi], values[lo:hi]
+    pairs = sorted(p for p in zip(ts, values) if start <= p[0] <= end and p[1] == p[1])
+    return array("d", [p[0] for p in pairs]), array("d", [p[1] for p in pairs])
+
+
+def series_extent(values):
+    if not len(values):
+        return None
+    if np is not None:
+        values = np.asarray(values, dtype=float)
+        return float(np.nanmin(values)), float(np.nanmax(values))
+    return min(values), max(values)
+
+
+def series_stats(values):
+    if np is not None:
+        values = np.asarray(values, dtype=float)
+        return float(values.min()), float(values.mean()), float(values.max())
+    return min(values), sum(values) / len(values), max(values)
+
+
+def decimate_minmax(ts, values, start, end, buckets):
+    buckets = max(1, int(buckets))
+    span = max(1e-9, end - start)
+    if np is not None:
+        ts = np.asarray(ts, dtype=float)
+        values = np.asarray(values, dtype=float)
+        lo = max(0, int(np.searchsorted(ts, start, side="left")) - 1)
+        hi = min(len(ts), int(np.searchsorted(ts, end, side="right")) + 1)
+        ts, values = ts[lo:hi], values[lo:hi]
+        if len(ts) <= 2 * buckets:
+            return ts, values
+        bucket = np.clip(np.floor((ts - start) / span * buckets), -1, buckets).astype(np.int64)
+        order = np.lexsort((values, bucket))
+        ordered = bucket[order]
+        first = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+        last = np.r_[first[1:] - 1, len(ordered) - 1]
+        keep = np.unique(np.concatenate((order[first], order[last])))
+        return ts[keep], values[keep]
+    lo = max(0, bisect.bisect_left(ts, start) - 1)
+    hi = min(len(ts), bisect.bisect_right(ts, end) + 1)
+    if hi - lo <= 2 * buckets:
+        return ts[lo:hi], values[lo:hi]
+    keep = []
+    current = imin = imax = None
+    for i in range(lo, hi):
+        b = int((ts[i] - start) / span * buckets // 1)
+        if b != current:
+            if current is not None:
+                keep.extend(sorted({imin, imax}))
+            current, imin, imax = b, i, i
+        elif values[i] < values[imin]:
+            imin = i
+        elif values[i] > values[imax]:
+            imax = i
+    keep.extend(sorted({imin, imax}))
+    return array("d", (ts[i] for i in keep)), array("d", (values[i] for i in keep))
+
+
+class LogReader:
+    SEEK_MIN_BYTES = 1024 * 1024
+    SEEK_SLACK_SEC = 120.0
+    HISTORIAN_GAP_SEC = 60.0
+    _seek_index = {}
+    _seek_lock = threading.Lock()
+
+    def __init__(self, log_cfg):
+        self.cfg = log_cfg or {}
+        self.folder = self.cfg.get("folder") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+        self.mode = self.cfg.get("mode", "per_variable")
+        self.sep = self.cfg.get("separator") or ","
+        self.manifest = log_manifest(self.folder)
+        self.manifest.refresh()
+
+    def read(self, vids, start, end):
+        parts = {vid: ([], []) for vid in vids}
+        for vid, ts, values in self.iter_chunks(vids, start, end):
+            parts[vid][0].append(ts)
+            parts[vid][1].append(values)
+        return {vid: clip_series(join_arrays(ts), join_arrays(values), start, end) for vid, (ts, values) in parts.items()}
+
+    def iter_chunks(self, vids, start, end):
+        missing = {vid: [(start, end)] for vid in vids}
+        if self.cfg.get("historian") and os.path.exists(historian_path(self.cfg)):
+            try:
+                historian = SQLiteHistorian(historian_path(self.cfg), readonly=True)
+            except Exception:
+                historian = None
+            if historian is not None:
+                try:
+                    yield from self._historian_chunks(historian, vids, start, end, missing)
+                finally:
+                    historian.close()
+        missing = {vid: [(lo, hi if hi >= end else hi - 0.001) for lo, hi in spans] for vid, spans in missing.items() if spans}
+        if self.mode == "binary":
+            for vid, spans in missing.items():
+                for lo, hi in spans:
+                    yield from self._binary_chunks(vid, lo, hi)
+            return
+        merged = []
+        gap = self._historian_gap()
+        for lo, hi, vid in sorted((lo, hi, vid) for vid, spans in missing.items() for lo, hi in spans):
+            if merged and lo <= merged[-1][1] + gap:
+                merged[-1][1] = max(merged[-1][1], hi)
+                merged[-1][2].add(vid)
+            else:
+                merged.append([lo, hi, {vid}])
+        for lo, hi, group in merged:
+            for vid, ts, values in self._csv_chunks(sorted(group), lo, hi):
+                for a, b in missing[vid]:
+                    if b < lo or a > hi:
+                        continue
+                    span_ts, span_values = clip_series(ts, values, a, b)
+                    if len(span_ts):
+                        yield vid, span_ts, span_values
+
+    def _historian_gap(self):
+        try:
+            gap = max(self.HISTORIAN_GAP_SEC, 2.0 * float(self.cfg.get("interval_sec", 10.0) or 0.0))
+            if self.cfg.get("deadband_mode", "none") != "none":
+                gap = max(gap, float(self.cfg.get("max_silence_sec", 300.0) or 0.0))
+        except Exception:
+            gap = self.HISTORIAN_GAP_SEC
+        return gap
+
+    @staticmethod
+    def _add_span(spans, lo, hi):
+        if spans and spans[-1][1] == lo:
+            spans[-1] = (spans[-1][0], hi)
+        else:
+            spans.append((lo, hi))
+
+    def _historian_chunks(self, historian, vids, start, end, missing):
+        gap = self._historian_gap()
+        for vid in vids:
+            spans = missing[vid] = []
+            day = start
+            while day <= end:
+                hi = min(end, day + 86400)
+                try:
+                    points = historian.query(vid, day * 1000, hi * 1000 if hi < end else end * 1000 + 1)
+                except Exception:
+                    points = []
+                if points:
+                    yield (vid,) + clip_series([p[0] for p in points], [p[1] for p in points], start, end)
+                    if points[0][0] - day > gap:
+                        self._add_span(spans, day, points[0][0])
+                    for (a, _), (b, _) in zip(points, points[1:]):
+                        if b - a > gap:
+                            self._add_span(spans, a + 0.001, b)
+                    if hi - points[-1][0] > gap:
+                        self._add_span(spans, points[-1][0] + 0.001, hi)
+                else:
+                    self._add_span(spans, day, hi)
+                if hi >= end:
+                    break
+                day = hi
+
+    def _binary_chunks(self, vid, start, end):
+        paths = self.manifest.archives_for("bin", vid, start, end) + self.manifest.files_for("bin", vid, start, end)
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            try:
+                with (gzip.open if path.endswith(".gz") else open)(path, "rb") as f:
+                    data = f.read()
+            except Exception:
+                continue
+            data = data[:len(data) - len(data) % BINARY_RECORD.size]
+            if np is not None:
+                recs = np.frombuffer(data, dtype=np.dtype([("ts", "<i8"), ("raw", "<u2"), ("value", "<f4")]))
+                ts, values = recs["ts"] / 1000.0, recs["value"].astype(float)
+            else:
+                ts, values = array("d"), array("d")
+                for stamp, _, value in BINARY_RECORD.iter_unpack(data):
+                    ts.append(stamp / 1000.0)
+                    values.append(value)
+            ts, values = clip_series(ts, values, start, end)
+            if len(ts):
+                yield vid, ts, values
+
+    def _csv_paths(self, vids, start, end):
+        paths = {}
+        for key in (vids if self.mode == "per_variable" else [None]):
+            for path in self.manifest.archives_for("csv", key, start, end) + self.manifest.files_for("csv", key, start, end):
+                paths.setdefault(path, set()).update([key] if key else vids)
+        if self.mode != "per_variable":
+            paths.setdefault(os.path.join(self.folder, "termo_log.csv"), set()).update(vids)
+        return paths
+
+    def _csv_chunks(self, vids, start, end):
+        slack = self.SEEK_SLACK_SEC
+        if self.cfg.get("deadband_mode") == "swinging_door":
+            slack = max(slack, float(self.cfg.get("max_silence_sec", 300.0) or 0.0))
+        since = datetime.fromtimestamp(start - slack).isoformat(timespec="seconds")
+        until = datetime.fromtimestamp(end + slack).isoformat(timespec="seconds")
+        for path, wanted in self._csv_paths(vids, start, end).items():
+            raw = {vid: ([], []) for vid in wanted}
+            self._parse_csv(path, raw, since, until)
+            for vid, (stamps, values) in raw.items():
+                if stamps:
+                    ts, values = clip_series(iso_to_epoch(stamps), parse_floats(values), start, end)
+                    if len(ts):
+                        yield vid, ts, values
+
+    def _seek(self, f, size, since):
+        f.seek(0)
+        lo = len(f.readline())
+        hi = size
+        with self._seek_lock:
+            index = self._seek_index.get(f.name)
+            if index is None or index[0] > size:
+                index = (size, [])
+            index = (max(index[0], size), index[1])
+            self._seek_index[f.name] = index
+            points = index[1]
+            i = bisect.bisect_left(points, (since, -1))
+            if i > 0:
+                lo = max(lo, points[i - 1][1])
+            if i < len(points):
+                hi = min(hi, points[i][1])
+        while hi - lo > 65536:
+            mid = (lo + hi) // 2
+            f.seek(mid)
+            f.readline()
+            offset = f.tell()
+            line = f.readline()
+            if not line or offset >= hi:
+                hi = mid
+                continue
+            stamp = line[:19].decode("utf-8", "ignore")
+            with self._seek_lock:
+                bisect.insort(points, (stamp, offset))
+            if stamp < since:
+                lo = offset
+            else:
+                hi = mid
+        return lo
+
+    def _parse_csv(self, path, targets, since, until):
+        if not os.path.exists(path):
+            return
+        sep = self.sep
+        try:
+            if path.endswith(".gz"):
+                f = gzip.open(path, "rt", encoding="utf-8")
+                f.readline()
+            else:
+                raw = open(path, "rb")
+                try:
+                    size = os.fstat(raw.fileno()).st_size
+                    if size > self.SEEK_MIN_BYTES:
+                        raw.seek(self._seek(raw, size, since))
+                    else:
+                        raw.readline()
+                    f = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                except Exception:
+                    raw.close()
+                    raise
+            with f:
+                for parts in csv.reader(f, delimiter=sep):
+                    if len(parts) < 5:
+                        continue
+                    stamp = parts[0]
+                    if stamp < since:
+                        continue
+                    if stamp > until:
+                        break
+                    target = targets.get(parts[1])
+                    if target is None:
+                        continue
+                    target[0].append(parts[0])
+                    target[1].append(parts[4])
+        except Exception:
+            pass
+
+
+class GraphLoader(QThread):
+    chunk = pyqtSignal(str, object, object, object)
+
+    def __init__(self, log_cfg, vids, start, end, resolution=None):
+        super().__init__()
+        self.log_cfg = log_cfg or {}
+        self.vids = list(vids)
+        self.start_ts = start
+        self.end_ts = end
+        self.resolution = resolution
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        raw_vids = list(self.vids)
+        if self.resolution:
+            raw_vids = self._load_rollups()
+        if self.cancelled or not raw_vids:
+            return
+        chunks = LogReader(self.log_cfg).iter_chunks(raw_vids, self.start_ts, self.end_ts)
+        try:
+            for vid, ts, values in chunks:
+                if self.cancelled:
+                    break
+                self.chunk.emit(vid, ts, values, None)
+        finally:
+            chunks.close()
+
+    def _load_rollups(self):
+        try:
+            historian = SQLiteHistorian(historian_path(self.log_cfg), readonly=True)
+        except Exception:
+            return self.vids
+        missing = []
+        try:
+            for vid in self.vids:
+                if self.cancelled:
+                    break
+                rows = historian.query_rollup(vid, self.resolution, self.start_ts * 1000, self.end_ts * 1000 + 1)
+                if not rows:
+                    missing.append(vid)
+                    continue
+                self.chunk.emit(vid, [r[0] for r in rows], [r[2] for r in rows], [(r[0], r[1], r[3]) for r in rows])
+        except Exception:
+            pass
+        finally:
+            historian.close()
+        return missing
+
+
 class BasicPlot(QWidget):
     def __init__(self):
         super().__init__()
@@ -1336,30 +3940,69 @@ class BasicPlot(QWidget):
         self._x_max = 1.0
         self._y_min = 0.0
         self._y_max = 1.0
+        self._full_x = (0.0, 1.0)
+        self._decimated = {}
         self._colors = [QColor('#1f77b4'), QColor('#ff7f0e'), QColor('#2ca02c'), QColor('#d62728'), QColor('#9467bd'), QColor('#8c564b')]
 
     def set_data(self, series):
+        zoomed = (self._x_min, self._x_max) != self._full_x
         self._series = series or []
+        self._decimated = {}
         xs = []
         ys = []
         for s in self._series:
             if not s.get('visible', True):
                 continue
-            for x, y in s.get('points', []):
-                xs.append(float(x))
-                ys.append(float(y))
+            for arr, out in ((s.get('ts', []), xs), (s.get('values', []), ys)):
+                extent = series_extent(arr)
+                if extent:
+                    out.extend(extent)
+            for x, lo, hi in s.get('band', []):
+                ys.append(float(lo))
+                ys.append(float(hi))
             for th in [s.get('alarm_min'), s.get('alarm_max')]:
                 if th is not None:
                     ys.append(float(th))
         if xs and ys:
-            self._x_min = min(xs); self._x_max = max(xs)
+            x_min, x_max = min(xs), max(xs)
             self._y_min = min(ys); self._y_max = max(ys)
-            if self._x_min == self._x_max:
-                self._x_max = self._x_min + 1.0
+            if x_min == x_max:
+                x_max = x_min + 1.0
             if self._y_min == self._y_max:
                 self._y_max = self._y_min + 1.0
+            self._full_x = (x_min, x_max)
+            if not zoomed:
+                self._x_min, self._x_max = x_min, x_max
+        self.update()
+
+    def reset_zoom(self):
+        self._x_min, self._x_max = self._full_x
+        self.update()
+
+    def wheelEvent(self, e):
+        plot_w = max(10, self.width() - 80)
+        frac = min(1.0, max(0.0, (e.pos().x() - 60) / plot_w))
+        factor = 0.8 if e.angleDelta().y() > 0 else 1.25
+        full_min, full_max = self._full_x
+        span = min(full_max - full_min, max(1.0, (self._x_max - self._x_min) * factor))
+        anchor = self._x_min + (self._x_max - self._x_min) * frac
+        x_min = min(max(full_min, anchor - span * frac), full_max - span)
+        self._x_min, self._x_max = x_min, x_min + span
         self.update()
 
+    def mouseDoubleClickEvent(self, e):
+        self.reset_zoom()
+
+    def _visible_points(self, idx, s, plot_w):
+        ts = s.get('ts', [])
+        key = (plot_w, self._x_min, self._x_max, len(ts))
+        cached = self._decimated.get(idx)
+        if cached is None or cached[0] != key:
+            xs, ys = decimate_minmax(ts, s.get('values', []), self._x_min, self._x_max, plot_w)
+            cached = (key, xs, ys)
+            self._decimated[idx] = cached
+        return cached[1], cached[2]
+
     def paintEvent(self, e):
         try:
             p = QPainter(self)
@@ -1403,19 +4046,40 @@ class BasicPlot(QWidget):
                         continue
                     ypx = top + plot_h - int((float(th) - self._y_min) / denom_y * plot_h)
                     p.drawLine(left, ypx, left + plot_w, ypx)
+            p.setClipRect(left, top, plot_w + 1, plot_h + 1)
+            # Min/max envelope of downsampled series
+            for idx, s in enumerate(self._series):
+                band = s.get('band')
+                if not s.get('visible', True) or not band:
+                    continue
+                fill = QColor(self._colors[idx % len(self._colors)])
+                fill.setAlpha(50)
+                path = QPainterPath()
+                for i, (x, lo, hi) in enumerate(band):
+                    xpx = left + (float(x) - self._x_min) / denom_x * plot_w
+                    ypx = top + plot_h - (float(hi) - self._y_min) / denom_y * plot_h
+                    if i == 0:
+                        path.moveTo(xpx, ypx)
+                    else:
+                        path.lineTo(xpx, ypx)
+                for x, lo, hi in reversed(band):
+                    xpx = left + (float(x) - self._x_min) / denom_x * plot_w
+                    path.lineTo(xpx, top + plot_h - (float(lo) - self._y_min) / denom_y * plot_h)
+                path.closeSubpath()
+                p.fillPath(path, fill)
             # Series lines
             for idx, s in enumerate(self._series):
                 if not s.get('visible', True):
                     continue
-                pts = s.get('points', [])
-                if not pts:
+                if not len(s.get('ts', [])):
                     continue
+                xs, ys = self._visible_points(idx, s, plot_w)
                 color = self._colors[idx % len(self._colors)]
-                pen = QPen(color); pen.setWidth(2)
+                pen = QPen(color); pen.setWidth(2 if len(xs) <= plot_w else 1)
                 p.setPen(pen)
                 path = QPainterPath()
                 first = True
-                for x, y in pts:
+                for x, y in zip(xs, ys):
                     xpx = left + (float(x) - self._x_min) / denom_x * plot_w
                     ypx = top + plot_h - (float(y) - self._y_min) / denom_y * plot_h
                     if first:
@@ -1433,6 +4097,9 @@ class BasicPlot(QWidget):
 
 
 class GraphsDialog(QDialog):
+    STOP_WAIT_MS = 200
+    _retired_loaders = []
+
     def __init__(self, parent, cfg):
         super().__init__(parent)
         self.setWindowTitle("Gráficos")
@@ -1440,6 +4107,7 @@ class GraphsDialog(QDialog):
         self.cfg = cfg
         self.log_cfg = self.cfg.get("logging", {})
         self.log_folder = self.log_cfg.get("folder") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+        self._historian = self._open_historian()
         layout = QVBoxLayout(self)
         top = QHBoxLayout()
         self.vars_list = QListWidget()
@@ -1475,9 +4143,14 @@ class GraphsDialog(QDialog):
         controls.addLayout(quick_row)
         btn_row = QHBoxLayout()
         self.plot_btn = QPushButton("Graficar")
+        self.cancel_btn = QPushButton("Cancelar")
+        self.cancel_btn.setEnabled(False)
         self.export_btn = QPushButton("Exportar PNG")
+        self.load_label = QLabel("")
+        btn_row.addWidget(self.load_label)
         btn_row.addStretch(1)
         btn_row.addWidget(self.plot_btn)
+        btn_row.addWidget(self.cancel_btn)
         btn_row.addWidget(self.export_btn)
         controls.addLayout(btn_row)
         top.addLayout(controls, 0)
@@ -1494,7 +4167,14 @@ class GraphsDialog(QDialog):
         layout.addWidget(self.plot_area, 1)
         self.legend_bar = QHBoxLayout()
         layout.addLayout(self.legend_bar)
+        self._loader = None
+        self._loading = {}
+        self._load_dirty = False
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setInterval(200)
+        self._repaint_timer.timeout.connect(self._render_partial)
         self.plot_btn.clicked.connect(self.on_plot)
+        self.cancel_btn.clicked.connect(self.on_cancel_load)
         self.export_btn.clicked.connect(self.on_export_png)
         self.btn_1h.clicked.connect(lambda: self._quick_range(hours=1))
         self.btn_6h.clicked.connect(lambda: self._quick_range(hours=6))
@@ -1505,71 +4185,16 @@ class GraphsDialog(QDialog):
 
         self.setStyleSheet("QDialog{background:#ffffff;} QPushButton{padding:8px 12px;border:1px solid #e2e8f0;border-radius:10px;background:#f8fafc;} QPushButton:hover{background:#f1f5f9;}")
 
-    def _safe(self, s):
-        s = str(s)
-        return "".join(ch if ch.isalnum() or ch in ("-","_"," ") else "_" for ch in s).strip()
-
-    def _iter_dates(self, start_dt, end_dt):
-        cur = start_dt.date()
-        end_date = end_dt.date()
-        while cur.daysTo(end_date) >= 0:
-            yield cur
-            cur = cur.addDays(1)
-
-    def _read_rows_for_var(self, var, start_dt, end_dt):
-        rows = []
-        if self.log_cfg.get("mode") == "per_variable":
-            vid = var.get("id")
-            for d in self._iter_dates(start_dt, end_dt):
-                date_str = d.toString("yyyy-MM-dd")
-                name = self._safe(var.get("name", var.get("id", "var")))
-                paths = set()
-                if vid:
-                    pattern = os.path.join(self.log_folder, f"*_{vid}_{date_str}.csv")
-                    paths.update(glob.glob(pattern))
-                paths.add(os.path.join(self.log_folder, f"{name}_{date_str}.csv"))
-                for path in sorted(paths):
-                    rows.extend(self._read_csv(path, var))
-        else:
-            for d in self._iter_dates(start_dt, end_dt):
-                date_str = d.toString("yyyy-MM-dd")
-                daily = os.path.join(self.log_folder, f"termo_{date_str}.csv")
-                rows.extend(self._read_csv(daily, var))
-            single = os.path.join(self.log_folder, "termo_log.csv")
-            rows.extend(self._read_csv(single, var))
-        start_py = start_dt.toPyDateTime()
-        end_py = end_dt.toPyDateTime()
-        rows = [r for r in rows if r[0] >= start_py and r[0] <= end_py]
-        rows.sort(key=lambda x: x[0])
-        return rows
-
-    def _read_csv(self, path, var):
-        data = []
+    def _open_historian(self):
+        if not self.log_cfg.get("historian"):
+            return None
+        path = historian_path(self.log_cfg)
         if not os.path.exists(path):
-            return data
+            return None
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                sep = (self.log_cfg.get("separator") or ",")
-                reader = csv.reader(f, delimiter=sep)
-                header = None
-                for row in reader:
-                    if not header:
-                        header = row
-                        continue
-                    try:
-                        ts = QDateTime.fromString(row[0], Qt.ISODate)
-                        vid = row[1]
-                        name = row[2]
-                        val = float(row[4])
-                    except Exception:
-                        continue
-                    if not ts.isValid():
-                        continue
-                    if vid == var.get("id"):
-                        data.append((ts.toPyDateTime(), val))
+            return SQLiteHistorian(path, readonly=True)
         except Exception:
-            pass
-        return data
+            return None
 
     def on_plot(self):
         selected = [i.data(Qt.UserRole) for i in self.vars_list.selectedItems()]
@@ -1581,44 +4206,133 @@ class GraphsDialog(QDialog):
         if since > until:
             QMessageBox.warning(self, "Gráficos", "El rango de tiempo es inválido")
             return
+        self._stop_loader()
         for i in reversed(range(self._plot_area_layout.count())):
             w = self._plot_area_layout.itemAt(i).widget()
             if w:
                 w.setParent(None)
-        series = []
+        self._clear_legend()
+        res = None
+        if self._historian is not None:
+            res = SQLiteHistorian.pick_resolution(since.secsTo(until), max(200, self.plot_area.width()))
+        self._since, self._until = since, until
+        self._loading = {}
         for var in selected:
-            rows = self._read_rows_for_var(var, since, until)
-            if not rows:
+            self._loading[var.get("id")] = {"var": var, "data": SeriesBuffer(), "band": None}
+        self._series = []
+        self._basic_plot = BasicPlot()
+        self._plot_area_layout.addWidget(self._basic_plot)
+        self._loaded_samples = 0
+        self._loader = GraphLoader(self.log_cfg, list(self._loading), since.toMSecsSinceEpoch() / 1000.0, until.toMSecsSinceEpoch() / 1000.0, res)
+        self._loader.chunk.connect(self._on_chunk)
+        self._loader.finished.connect(self._on_load_finished)
+        self.cancel_btn.setEnabled(True)
+        self.load_label.setText("Cargando...")
+        self._repaint_timer.start()
+        self._loader.start()
+
+    def on_cancel_load(self):
+        if self._loader is not None:
+            self._loader.cancel()
+            self.load_label.setText("Cancelando...")
+
+    def _stop_loader(self):
+        loader, self._loader = self._loader, None
+        self._repaint_timer.stop()
+        if loader is not None:
+            loader.cancel()
+            try:
+                loader.chunk.disconnect()
+                loader.finished.disconnect()
+            except Exception:
+                pass
+            if not loader.wait(self.STOP_WAIT_MS):
+                self._retired_loaders.append(loader)
+                loader.finished.connect(lambda loader=loader: GraphsDialog._retire_loader(loader))
+                if loader.isFinished():
+                    self._retire_loader(loader)
+        self.cancel_btn.setEnabled(False)
+
+    @classmethod
+    def _retire_loader(cls, loader):
+        if loader in cls._retired_loaders:
+            cls._retired_loaders.remove(loader)
+
+    def _on_chunk(self, vid, ts, values, band):
+        entry = self._loading.get(vid)
+        if entry is None:
+            return
+        entry["data"].extend(ts, values)
+        if band:
+            entry["band"] = band
+        self._loaded_samples += len(ts)
+        self._load_dirty = True
+
+    def _series_from(self, entry, final=False):
+        ts, values = entry["data"].arrays()
+        if final:
+            ts, values = clip_series(ts, values, float("-inf"), float("inf"))
+        var = entry["var"]
+        series = {
+            "name": var.get("name"),
+            "ts": ts,
+            "values": values,
+            "visible": True,
+            "alarm_min": var.get("alarm_min") if var.get("alarm_enabled") else None,
+            "alarm_max": var.get("alarm_max") if var.get("alarm_enabled") else None,
+        }
+        if entry["band"]:
+            series["band"] = entry["band"]
+        return series, values
+
+    def _render_partial(self):
+        if not self._load_dirty or self._basic_plot is None:
+            return
+        self._load_dirty = False
+        self._basic_plot.set_data([self._series_from(e)[0] for e in self._loading.values() if len(e["data"])])
+        self.load_label.setText(f"Cargando... {self._loaded_samples} muestras")
+
+    def _on_load_finished(self):
+        cancelled = self._loader is not None and self._loader.cancelled
+        self._loader = None
+        self._repaint_timer.stop()
+        self.cancel_btn.setEnabled(False)
+        series = []
+        for vid, entry in self._loading.items():
+            if not len(entry["data"]):
                 continue
-            points = [(r[0].timestamp(), r[1]) for r in rows]
-            values = [r[1] for r in rows]
-            if not values:
+            s, values = self._series_from(entry, final=True)
+            if not len(values):
                 continue
-            avg = sum(values) / max(1, len(values))
-            alarm_min = var.get("alarm_min") if var.get("alarm_enabled") else None
-            alarm_max = var.get("alarm_max") if var.get("alarm_enabled") else None
-            series.append({
-                "name": var.get("name"),
-                "points": points,
-                "min": min(values),
-                "max": max(values),
-                "avg": avg,
-                "visible": True,
-                "alarm_min": alarm_min,
-                "alarm_max": alarm_max,
-            })
+            s["min"], s["avg"], s["max"] = series_stats(values)
+            if self._historian is not None:
+                try:
+                    hmin, havg, hmax, count = self._historian.stats(vid, self._since.toMSecsSinceEpoch(), self._until.toMSecsSinceEpoch() + 1)
+                    if count:
+                        s["min"], s["avg"], s["max"] = hmin, havg, hmax
+                except Exception:
+                    pass
+            series.append(s)
+        self._loading = {}
+        self._series = series
+        if self._basic_plot is not None:
+            self._basic_plot.set_data(self._series)
+        self.load_label.setText("Cancelado" if cancelled else f"{self._loaded_samples} muestras")
         if not series:
-            QMessageBox.information(self, "Gráficos", "No hay datos en el rango seleccionado")
+            if not cancelled:
+                QMessageBox.information(self, "Gráficos", "No hay datos en el rango seleccionado")
             return
-        self._series = series
-        self._basic_plot = BasicPlot()
-        self._basic_plot.set_data(self._series)
-        self._plot_area_layout.addWidget(self._basic_plot)
+        self._build_legend()
+
+    def _clear_legend(self):
         for i in reversed(range(self.legend_bar.count())):
             it = self.legend_bar.itemAt(i)
             w = it.widget() if it else None
             if w:
                 w.setParent(None)
+
+    def _build_legend(self):
+        self._clear_legend()
         colors = ['#1f77b4','#ff7f0e','#2ca02c','#d62728','#9467bd','#8c564b']
         for idx, s in enumerate(self._series):
             swatch = QLabel()
@@ -1632,6 +4346,13 @@ class GraphsDialog(QDialog):
             box.setContentsMargins(0,0,12,0)
             self.legend_bar.addWidget(cont)
 
+    def done(self, result):
+        self._stop_loader()
+        if self._historian is not None:
+            self._historian.close()
+            self._historian = None
+        super().done(result)
+
     def _toggle_series(self, idx, checked):
         if not hasattr(self, '_series') or not self._series:
             return
@@ -1685,13 +4406,22 @@ class MainWindow(QMainWindow):
         self.alarm_ack = set()
         self.zone_alarm_state = {}
         self.zone_alarm_ack = set()
+        self.slave_states = {}
         self.zone_sections = {}
         self.zone_vars_map = {}
         self.var_map = {}
         self.zone_stats = {}
         self.global_last_update = None
+        self._dirty_vars = set()
+        self._dirty_zones = set()
+        self._alarms_dirty = False
+        self._alarm_details = {}
+        self._stale_due = {}
+        self._stale_heap = []
+        self._last_age_pass = 0.0
         self.monitor_mode = False
         self.density_mode = self.cfg.get("ui", {}).get("density", "normal")
+        self.view_mode = self.cfg.get("ui", {}).get("view", "cards")
         cw = QWidget()
         self.setCentralWidget(cw)
         root = QVBoxLayout(cw)
@@ -1827,6 +4557,8 @@ class MainWindow(QMainWindow):
         self.stale_filter = QComboBox(); self.stale_filter.addItems(["Todos", "Sin datos", "Actualizados"])
         self.density_combo = QComboBox(); self.density_combo.addItems(["Normal", "Compacto"])
         self.density_combo.setCurrentText("Compacto" if self.density_mode == "compact" else "Normal")
+        self.view_combo = QComboBox(); self.view_combo.addItems(["Tarjetas", "Mosaico"])
+        self.view_combo.setCurrentText("Mosaico" if self.view_mode == "tiles" else "Tarjetas")
         filter_layout.addWidget(QLabel("Buscar"))
         filter_layout.addWidget(self.search_edit, 1)
         filter_layout.addWidget(QLabel("Zona"))
@@ -1839,6 +4571,8 @@ class MainWindow(QMainWindow):
         filter_layout.addWidget(self.stale_filter)
         filter_layout.addWidget(QLabel("Densidad"))
         filter_layout.addWidget(self.density_combo)
+        filter_layout.addWidget(QLabel("Vista"))
+        filter_layout.addWidget(self.view_combo)
         root.addWidget(self.filter_bar)
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
@@ -1848,6 +4582,21 @@ class MainWindow(QMainWindow):
         self.cards_layout.setSpacing(12)
         self.cards_layout.setAlignment(Qt.AlignTop)
         self.scroll.setWidget(self.cards_container)
+        self.tile_model = CardTileModel(self._tile_state)
+        self.tile_view = QListView()
+        self.tile_delegate = CardTileDelegate(self.tile_view)
+        self.tile_view.setViewMode(QListView.IconMode)
+        self.tile_view.setFlow(QListView.LeftToRight)
+        self.tile_view.setWrapping(True)
+        self.tile_view.setResizeMode(QListView.Adjust)
+        self.tile_view.setMovement(QListView.Static)
+        self.tile_view.setUniformItemSizes(False)
+        self.tile_view.setSpacing(6)
+        self.tile_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.tile_view.setStyleSheet("QListView{border:0;background:transparent;}")
+        self.tile_view.setItemDelegate(self.tile_delegate)
+        self.tile_view.setModel(self.tile_model)
+        self.tile_view.doubleClicked.connect(self.on_tile_activated)
         self.alarm_panel = QFrame()
         self.alarm_panel.setStyleSheet("QFrame{background:#ffffff;border-left:1px solid #e2e8f0;}")
         self.alarm_panel.setMinimumWidth(260)
@@ -1856,8 +4605,15 @@ class MainWindow(QMainWindow):
         alarm_layout.setSpacing(8)
         self.alarms_title = QLabel("Alarmas (0)")
         self.alarms_title.setStyleSheet("font-weight:700;color:#0f172a;")
-        self.alarms_list = QListWidget()
+        self.alarm_model = AlarmListModel()
+        self.alarm_model.row_size = AlarmRow("", "", "").sizeHint()
+        self.alarm_model.rowsInserted.connect(self._on_alarm_rows_inserted)
+        self.alarm_model.dataChanged.connect(self._on_alarm_rows_changed)
+        self.alarms_list = QListView()
         self.alarms_list.setSpacing(4)
+        self.alarms_list.setUniformItemSizes(True)
+        self.alarms_list.setSelectionMode(QAbstractItemView.NoSelection)
+        self.alarms_list.setModel(self.alarm_model)
         alarm_layout.addWidget(self.alarms_title)
         alarm_layout.addWidget(self.alarms_list, 1)
         content_wrap = QWidget()
@@ -1865,11 +4621,15 @@ class MainWindow(QMainWindow):
         content_layout.setContentsMargins(0, 0, 0, 0)
         content_layout.setSpacing(0)
         content_layout.addWidget(self.scroll, 1)
+        content_layout.addWidget(self.tile_view, 1)
         content_layout.addWidget(self.alarm_panel)
         root.addWidget(content_wrap, 1)
         self.status_label = QLabel("Listo")
         root.addWidget(self.status_label)
         self.cards = {}
+        self._card_pool = {}
+        self._card_meta = {}
+        self._section_pool = {}
         self._refresh_zone_filter()
         self._rebuild_cards()
         self.search_edit.textChanged.connect(self.on_filters_changed)
@@ -1878,6 +4638,7 @@ class MainWindow(QMainWindow):
         self.alarm_filter.currentIndexChanged.connect(self.on_filters_changed)
         self.stale_filter.currentIndexChanged.connect(self.on_filters_changed)
         self.density_combo.currentTextChanged.connect(self.on_density_changed)
+        self.view_combo.currentTextChanged.connect(self.on_view_changed)
         self.monitor_btn.toggled.connect(self.set_monitor_mode)
         self.connect_btn.clicked.connect(self.on_connect)
         self.disconnect_btn.clicked.connect(self.on_disconnect)
@@ -1891,9 +4652,9 @@ class MainWindow(QMainWindow):
         self.h_add_btn.clicked.connect(self.on_add_variable)
         self.h_save_btn.clicked.connect(self.on_save_config)
         self.h_load_btn.clicked.connect(self.on_load_config)
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.refresh_status)
-        self.status_timer.start(1000)
+        self.render_timer = QTimer()
+        self.render_timer.timeout.connect(self._render_frame)
+        self._apply_render_rate()
         self._update_connection_indicator("disconnected")
 
     def _refresh_ports(self):
@@ -1944,6 +4705,52 @@ class MainWindow(QMainWindow):
         save_config(self.cfg)
         self._rebuild_cards()
 
+    def on_view_changed(self, text):
+        self.view_mode = "tiles" if text == "Mosaico" else "cards"
+        self.cfg.setdefault("ui", {})["view"] = self.view_mode
+        save_config(self.cfg)
+        self._rebuild_cards()
+
+    def on_tile_activated(self, index):
+        vid = index.data(Qt.UserRole)
+        if vid in self.var_map and not self.monitor_mode:
+            self.on_open_settings(vid)
+
+    def _tile_state(self, vid):
+        if vid.startswith("zone:"):
+            zid = vid.split(":", 1)[1]
+            zone = next((z for z in self.cfg.get("zones", []) if z.get("id") == zid), {})
+            return {
+                "header": zone.get("name", "Zona"),
+                "summary": self.zone_stats.get(zid, {}).get("summary", ""),
+                "alarm": bool(self.zone_alarm_state.get(zid)) or any(self.alarm_state.get(v) for v in self.zone_vars_map.get(zid, [])),
+            }
+        var = self.var_map.get(vid)
+        if not var:
+            return {}
+        now = datetime.now()
+        in_alarm = self.alarm_state.get(vid, False)
+        if self._is_stale(var, now):
+            state = "stale"
+        elif in_alarm:
+            state = "ack" if vid in self.alarm_ack else "alarm"
+        else:
+            state = "ok"
+        value = self.last_values.get(vid)
+        try:
+            text = f"{float(value):.{int(var.get('decimals', 1))}f}" if value is not None else "--"
+        except Exception:
+            text = str(value)
+        return {
+            "name": var.get("name", "Temperatura"),
+            "unit": var.get("unit", "°C"),
+            "value": text,
+            "state": state,
+            "meta": f"S{var.get('slave', 1)} · {var.get('type', 'holding')} · R{var.get('address', 0)}",
+            "link": self.slave_states.get(self._slave_key(var), "closed"),
+            "last": self._format_last_update(self.last_update.get(vid), now),
+        }
+
     def set_monitor_mode(self, enabled):
         self.monitor_mode = bool(enabled)
         self.monitor_btn.setText("Salir monitor" if self.monitor_mode else "Modo monitor")
@@ -2014,15 +4821,7 @@ class MainWindow(QMainWindow):
         return f"Actualizado: {last_dt.strftime('%H:%M:%S')} (hace {delta}s)"
 
     def _evaluate_var_alarm(self, var, value):
-        if not var.get("alarm_enabled"):
-            return False
-        min_v = var.get("alarm_min")
-        max_v = var.get("alarm_max")
-        if min_v is not None and value < min_v:
-            return True
-        if max_v is not None and value > max_v:
-            return True
-        return False
+        return var_in_alarm(var, value)
 
     def _evaluate_zone_alarm(self, zone, avg_value):
         if not zone.get("alarm_enabled") or avg_value is None:
@@ -2035,10 +4834,15 @@ class MainWindow(QMainWindow):
             return True
         return False
 
-    def _update_zone_summaries(self, now):
-        self.zone_stats = {}
+    def _update_zone_summaries(self, now, zone_ids=None):
+        if zone_ids is None:
+            self.zone_stats = {}
+        alarm_changed = False
+        headers = []
         for zone in self.cfg.get("zones", []):
             zone_id = zone.get("id")
+            if zone_ids is not None and zone_id not in zone_ids:
+                continue
             var_ids = self.zone_vars_map.get(zone_id, [])
             values = []
             active = 0
@@ -2076,8 +4880,13 @@ class MainWindow(QMainWindow):
                 "active": active,
                 "total": total,
                 "unit": unit_label,
+                "summary": summary,
             }
             zone_alarm = self._evaluate_zone_alarm(zone, avg)
+            if bool(zone_alarm) != bool(self.zone_alarm_state.get(zone_id)):
+                alarm_changed = True
+            elif zone_alarm and self._alarm_details.get(f"zone:{zone_id}") != self._zone_alarm_detail(zone, self.zone_stats[zone_id]):
+                alarm_changed = True
             self.zone_alarm_state[zone_id] = zone_alarm
             if not zone_alarm:
                 self.zone_alarm_ack.discard(zone_id)
@@ -2085,52 +4894,71 @@ class MainWindow(QMainWindow):
             section = self.zone_sections.get(zone_id)
             if section:
                 section.set_summary(summary, alarm_count=alarm_count, zone_alarm=zone_alarm)
+            headers.append(f"zone:{zone_id}")
+        self.tile_model.refresh(headers)
+        return alarm_changed
+
+    def _var_alarm_detail(self, var, value):
+        unit = var.get("unit", "")
+        min_v = var.get("alarm_min")
+        max_v = var.get("alarm_max")
+        if value is None:
+            return "Sin valor"
+        if min_v is not None and value < min_v:
+            return f"{value:.2f}{unit} < {min_v:.2f}{unit}"
+        if max_v is not None and value > max_v:
+            return f"{value:.2f}{unit} > {max_v:.2f}{unit}"
+        return f"{value:.2f}{unit}"
+
+    def _zone_alarm_detail(self, zone, stats):
+        avg = stats.get("avg")
+        unit = stats.get("unit", "")
+        min_v = zone.get("alarm_min")
+        max_v = zone.get("alarm_max")
+        if avg is None:
+            return "Sin datos"
+        if min_v is not None and avg < min_v:
+            return f"{avg:.2f}{unit} < {min_v:.2f}{unit}"
+        if max_v is not None and avg > max_v:
+            return f"{avg:.2f}{unit} > {max_v:.2f}{unit}"
+        return f"Prom {avg:.2f}{unit}"
 
     def _update_alarm_list(self):
         alarms = []
         for vid, var in self.var_map.items():
             if not self.alarm_state.get(vid):
                 continue
-            value = self.last_values.get(vid)
-            unit = var.get("unit", "")
-            min_v = var.get("alarm_min")
-            max_v = var.get("alarm_max")
-            detail = ""
-            if value is None:
-                detail = "Sin valor"
-            elif min_v is not None and value < min_v:
-                detail = f"{value:.2f}{unit} < {min_v:.2f}{unit}"
-            elif max_v is not None and value > max_v:
-                detail = f"{value:.2f}{unit} > {max_v:.2f}{unit}"
-            else:
-                detail = f"{value:.2f}{unit}"
+            detail = self._var_alarm_detail(var, self.last_values.get(vid))
             alarms.append((vid, var.get("name", "Variable"), detail, vid in self.alarm_ack))
         for zone in self.cfg.get("zones", []):
             zid = zone.get("id")
             if not self.zone_alarm_state.get(zid):
                 continue
-            stats = self.zone_stats.get(zid, {})
-            avg = stats.get("avg")
-            unit = stats.get("unit", "")
-            min_v = zone.get("alarm_min")
-            max_v = zone.get("alarm_max")
-            detail = "Sin datos"
-            if avg is not None:
-                detail = f"Prom {avg:.2f}{unit}"
-                if min_v is not None and avg < min_v:
-                    detail = f"{avg:.2f}{unit} < {min_v:.2f}{unit}"
-                elif max_v is not None and avg > max_v:
-                    detail = f"{avg:.2f}{unit} > {max_v:.2f}{unit}"
+            detail = self._zone_alarm_detail(zone, self.zone_stats.get(zid, {}))
             alarms.append((f"zone:{zid}", f"Zona: {zone.get('name','Zona')}", detail, zid in self.zone_alarm_ack))
-        self.alarms_list.clear()
-        for alarm_id, title, detail, acked in alarms:
-            item = QListWidgetItem()
+        self._alarm_details = {alarm[0]: alarm[2] for alarm in alarms}
+        self.alarm_model.sync(alarms)
+        title = f"Alarmas ({len(alarms)})"
+        if self.alarms_title.text() != title:
+            self.alarms_title.setText(title)
+
+    def _on_alarm_rows_inserted(self, parent, first, last):
+        for i in range(first, last + 1):
+            index = self.alarm_model.index(i)
+            alarm_id, title, detail, acked = index.data(Qt.UserRole)
             row = AlarmRow(alarm_id, title, detail, acked=acked)
             row.ack_clicked.connect(self.on_alarm_ack)
-            item.setSizeHint(row.sizeHint())
-            self.alarms_list.addItem(item)
-            self.alarms_list.setItemWidget(item, row)
-        self.alarms_title.setText(f"Alarmas ({len(alarms)})")
+            self.alarms_list.setIndexWidget(index, row)
+
+    def _on_alarm_rows_changed(self, top_left, bottom_right, roles=None):
+        for i in range(top_left.row(), bottom_right.row() + 1):
+            index = self.alarm_model.index(i)
+            row = self.alarms_list.indexWidget(index)
+            if row is None:
+                continue
+            _, title, detail, acked = index.data(Qt.UserRole)
+            row.set_text(title, detail)
+            row.set_acked(acked)
 
     def _cleanup_state(self):
         valid_ids = {v.get("id") for v in self.cfg.get("variables", [])}
@@ -2152,6 +4980,74 @@ class MainWindow(QMainWindow):
         self._update_alarm_list()
         self.refresh_status()
 
+    def _apply_render_rate(self):
+        fps = max(1, min(60, int(self.cfg.get("ui", {}).get("render_fps", 10))))
+        self.render_timer.start(int(1000 / fps))
+
+    def _watch_stale(self, vid, ts):
+        if vid in self._stale_due:
+            return
+        var = self.var_map.get(vid)
+        if var:
+            due = ts + self._stale_threshold(var)
+            self._stale_due[vid] = due
+            heapq.heappush(self._stale_heap, (due, vid))
+
+    def _collect_stale(self, now_ts):
+        while self._stale_heap and self._stale_heap[0][0] <= now_ts:
+            _, vid = heapq.heappop(self._stale_heap)
+            self._stale_due.pop(vid, None)
+            var = self.var_map.get(vid)
+            last = self.last_update.get(vid)
+            if not var or not last:
+                continue
+            due = last.timestamp() + self._stale_threshold(var)
+            if due > now_ts:
+                self._stale_due[vid] = due
+                heapq.heappush(self._stale_heap, (due, vid))
+            else:
+                self._dirty_vars.add(vid)
+
+    def _render_frame(self):
+        now = datetime.now()
+        now_ts = now.timestamp()
+        self._collect_stale(now_ts)
+        if now_ts - self._last_age_pass >= 1.0:
+            self._last_age_pass = now_ts
+            for vid, card in self.cards.items():
+                if not card.visibleRegion().isEmpty():
+                    card.set_last_update(self._format_last_update(self.last_update.get(vid), now))
+            self.tile_model.refresh()
+            self._update_last_read(now)
+        if not self._dirty_vars and not self._dirty_zones and not self._alarms_dirty:
+            return
+        dirty, self._dirty_vars = self._dirty_vars, set()
+        zones, self._dirty_zones = self._dirty_zones, set()
+        for vid in dirty:
+            var = self.var_map.get(vid)
+            if not var:
+                continue
+            zones.add(var.get("zone_id"))
+            card = self.cards.get(vid)
+            if card:
+                if vid in self.last_values:
+                    card.set_value(self.last_values.get(vid), self.last_raw.get(vid))
+                card.set_state(stale=self._is_stale(var, now), in_alarm=self.alarm_state.get(vid, False), acked=vid in self.alarm_ack)
+                card.set_last_update(self._format_last_update(self.last_update.get(vid), now))
+        self.tile_model.refresh(dirty)
+        if self._update_zone_summaries(now, zones):
+            self._alarms_dirty = True
+        if self._alarms_dirty:
+            self._alarms_dirty = False
+            self._update_alarm_list()
+
+    def _update_last_read(self, now):
+        if self.global_last_update:
+            delta = int((now - self.global_last_update).total_seconds())
+            self.last_read_label.setText(f"Última lectura: hace {delta}s")
+        else:
+            self.last_read_label.setText("Última lectura: --")
+
     def refresh_status(self):
         now = datetime.now()
         for vid, card in self.cards.items():
@@ -2163,13 +5059,10 @@ class MainWindow(QMainWindow):
             acked = vid in self.alarm_ack
             card.set_state(stale=stale, in_alarm=in_alarm, acked=acked)
             card.set_last_update(self._format_last_update(self.last_update.get(vid), now))
+        self.tile_model.refresh()
         self._update_zone_summaries(now)
         self._update_alarm_list()
-        if self.global_last_update:
-            delta = int((now - self.global_last_update).total_seconds())
-            self.last_read_label.setText(f"Última lectura: hace {delta}s")
-        else:
-            self.last_read_label.setText("Última lectura: --")
+        self._update_last_read(now)
 
     def _update_connection_indicator(self, state, message=None):
         if state == "connecting":
@@ -2185,19 +5078,23 @@ class MainWindow(QMainWindow):
             self.conn_dot.setStyleSheet("background:#94a3b8;border-radius:5px;")
             self.conn_label.setText("Desconectado")
         ser = self.cfg.get("serial", {})
-        port = ser.get("port", "")
+        port = bus_label(ser)
         baud = ser.get("baudrate", "")
-        self.conn_meta.setText(f"{port} @ {baud}" if port else "")
+        extra = len(self.cfg.get("buses", []) or [])
+        if ser.get("transport", "serial") != "serial":
+            meta = port
+        else:
+            meta = f"{port} @ {baud}" if port else ""
+        if meta and extra:
+            meta += f" (+{extra} buses)"
+        self.conn_meta.setText(meta)
         if message:
             self.status_label.setText(message)
 
     def _rebuild_cards(self):
-        for i in reversed(range(self.cards_layout.count())):
-            w = self.cards_layout.itemAt(i).widget()
-            if w:
-                w.setParent(None)
-        self.cards.clear()
-        self.zone_sections.clear()
+        previous = self.cards
+        self.cards = {}
+        self.zone_sections = {}
         self.zone_vars_map.clear()
         dirty = ensure_zones(self.cfg)
         vars_list = self.cfg.get("variables", [])
@@ -2243,9 +5140,19 @@ class MainWindow(QMainWindow):
                 dirty = True
             vars_by_zone.setdefault(zone_id, []).append(var)
         self.zone_vars_map = {zid: [v.get("id") for v in vlist] for zid, vlist in vars_by_zone.items()}
+        for vid in [v for v in self._card_pool if v not in self.var_map]:
+            card = self._card_pool.pop(vid)
+            self._card_meta.pop(vid, None)
+            card.setParent(None)
+            card.deleteLater()
+        for zid in [z for z in self._section_pool if z not in vars_by_zone]:
+            section = self._section_pool.pop(zid)
+            section.setParent(None)
+            section.deleteLater()
         zone_filter_id = self.zone_filter.currentData() if hasattr(self, "zone_filter") else None
         filters_active = self._filters_active()
         cols = 2 if self.monitor_mode else 3
+        shown = []
         for zone in zones:
             zone_id = zone.get("id")
             if self.monitor_mode and monitor_zones and not zone.get("monitor"):
@@ -2256,27 +5163,77 @@ class MainWindow(QMainWindow):
             zone_vars = [v for v in zone_vars_all if self._matches_filters(v)]
             if not zone_vars and (filters_active or self.monitor_mode or zone_filter_id):
                 continue
-            zone_title = zone.get("name", "Zona")
-            section = CollapsibleSection(zone_id, zone_title, collapsed=bool(zone.get("collapsed", False)))
-            section.toggled.connect(self.on_zone_toggled)
+            shown.append((zone, zone_vars))
+        tiles = self.view_mode == "tiles"
+        self.scroll.setVisible(not tiles)
+        self.tile_view.setVisible(tiles)
+        if tiles:
+            for vid in list(self._card_pool):
+                self._card_pool.pop(vid).deleteLater()
+            for zid in list(self._section_pool):
+                self._section_pool.pop(zid).deleteLater()
+            self._card_meta.clear()
+            if self.tile_delegate.set_mode(self.density_mode, self.monitor_mode):
+                self.tile_view.doItemsLayout()
+            rows = []
+            for zone, zone_vars in shown:
+                rows.append(f"zone:{zone.get('id')}")
+                rows.extend(v.get("id") for v in zone_vars)
+            self.tile_model.set_rows(rows)
+            shown = []
+        else:
+            self.tile_model.set_rows([])
+        order = []
+        for zone, zone_vars in shown:
+            zone_id = zone.get("id")
+            section = self._section_pool.get(zone_id)
+            if section is None:
+                section = CollapsibleSection(zone_id, zone.get("name", "Zona"), collapsed=bool(zone.get("collapsed", False)))
+                section.toggled.connect(self.on_zone_toggled)
+                self._section_pool[zone_id] = section
+            else:
+                section.set_title(zone.get("name", "Zona"))
+                section.set_collapsed(bool(zone.get("collapsed", False)))
             self.zone_sections[zone_id] = section
-            if not zone_vars:
-                empty = QLabel("Sin variables")
-                empty.setStyleSheet("color:#94a3b8;padding:4px 8px;")
-                section.content_layout.addWidget(empty, 0, 0)
+            order.append(section)
+            section.set_empty(not zone_vars)
             for idx, var in enumerate(zone_vars):
                 vid = var.get("id")
-                card = VariableCard(var)
+                card = self._card_pool.get(vid)
+                if card is None:
+                    card = VariableCard(var)
+                    card.config_btn.clicked.connect(lambda _, vid=vid: self.on_open_settings(vid))
+                    self._card_pool[vid] = card
+                    self._card_meta[vid] = dict(var)
+                elif self._card_meta.get(vid) != var:
+                    card.update_meta(var)
+                    self._card_meta[vid] = dict(var)
+                else:
+                    card.var = var
                 card.set_density(self.density_mode, monitor=self.monitor_mode)
                 card.config_btn.setVisible(not self.monitor_mode)
-                if vid in self.last_values:
-                    card.set_value(self.last_values.get(vid), self.last_raw.get(vid))
-                r = idx // cols
-                c = idx % cols
-                section.content_layout.addWidget(card, r, c)
+                if vid not in previous:
+                    if vid in self.last_values:
+                        card.set_value(self.last_values.get(vid), self.last_raw.get(vid))
+                    card.set_link_state(self.slave_states.get(self._slave_key(var), "closed"))
+                section.place(card, idx // cols, idx % cols)
+                card.setVisible(True)
                 self.cards[vid] = card
-                card.config_btn.clicked.connect(lambda _, vid=vid: self.on_open_settings(vid))
-            self.cards_layout.addWidget(section)
+        for vid, card in self._card_pool.items():
+            if vid not in self.cards:
+                card.setVisible(False)
+                parent = card.parentWidget()
+                layout = parent.layout() if parent is not None else None
+                if layout is not None and layout.indexOf(card) >= 0:
+                    layout.removeWidget(card)
+        for idx, section in enumerate(order):
+            if self.cards_layout.indexOf(section) != idx:
+                self.cards_layout.removeWidget(section)
+                self.cards_layout.insertWidget(idx, section)
+            section.setVisible(True)
+        for section in self._section_pool.values():
+            if section not in order:
+                section.setVisible(False)
         if dirty:
             save_config(self.cfg)
         self.refresh_status()
@@ -2285,15 +5242,13 @@ class MainWindow(QMainWindow):
         save_config(self.cfg)
         if self.worker and self.worker.isRunning():
             return
-        self.worker = PollingWorker(
-            self.cfg.get("serial", {}),
-            self.cfg.get("variables", []),
-            self.cfg.get("logging", {})
-        )
+        self.worker = make_poller(self.cfg)
         self.worker.connected.connect(self.on_worker_connected)
-        self.worker.value_updated.connect(self.on_value_update)
+        self.worker.values_ready.connect(self.on_values_ready)
         self.worker.error.connect(self.on_var_error)
         self.worker.status.connect(self.on_status)
+        self.worker.slave_state.connect(self.on_slave_state)
+        self.slave_states = {}
         self.global_last_update = None
         self.worker.start()
         self.status_label.setText("Conectando...")
@@ -2308,6 +5263,7 @@ class MainWindow(QMainWindow):
             try:
                 self.worker.stop()
                 self.worker.wait(2000)
+                self.worker.logger.close()
             except Exception:
                 pass
             self.worker = None
@@ -2331,6 +5287,7 @@ class MainWindow(QMainWindow):
                 if self.worker:
                     self.worker.stop()
                     self.worker.wait(2000)
+                    self.worker.logger.close()
             except Exception:
                 pass
             self.worker = None
@@ -2387,7 +5344,7 @@ class MainWindow(QMainWindow):
         dlg = SettingsDialog(self, self.cfg, selected_id)
         if dlg.exec_() == QDialog.Accepted:
             new_cfg = dlg.result_config()
-            serial_changed = json.dumps(self.cfg.get("serial", {}), sort_keys=True) != json.dumps(new_cfg.get("serial", {}), sort_keys=True)
+            serial_changed = bus_configs(self.cfg) != bus_configs(new_cfg) or self.cfg.get("engine") != new_cfg.get("engine")
             logging_changed = json.dumps(self.cfg.get("logging", {}), sort_keys=True) != json.dumps(new_cfg.get("logging", {}), sort_keys=True)
             was_running = self.worker.isRunning() if self.worker else False
             self.cfg = new_cfg
@@ -2397,6 +5354,10 @@ class MainWindow(QMainWindow):
             self.density_mode = self.cfg.get("ui", {}).get("density", self.density_mode)
             if hasattr(self, "density_combo"):
                 self.density_combo.setCurrentText("Compacto" if self.density_mode == "compact" else "Normal")
+            self.view_mode = self.cfg.get("ui", {}).get("view", self.view_mode)
+            if hasattr(self, "view_combo"):
+                self.view_combo.setCurrentText("Mosaico" if self.view_mode == "tiles" else "Tarjetas")
+            self._apply_render_rate()
             save_config(self.cfg)
             self._rebuild_cards()
             if self.worker:
@@ -2413,6 +5374,8 @@ class MainWindow(QMainWindow):
 
     def on_open_graphs(self):
         try:
+            if self.worker:
+                self.worker.logger.flush()
             dlg = GraphsDialog(self, self.cfg)
             dlg.exec_()
         except Exception as e:
@@ -2442,6 +5405,10 @@ class MainWindow(QMainWindow):
             self.density_mode = self.cfg.get("ui", {}).get("density", self.density_mode)
             if hasattr(self, "density_combo"):
                 self.density_combo.setCurrentText("Compacto" if self.density_mode == "compact" else "Normal")
+            self.view_mode = self.cfg.get("ui", {}).get("view", self.view_mode)
+            if hasattr(self, "view_combo"):
+                self.view_combo.setCurrentText("Mosaico" if self.view_mode == "tiles" else "Tarjetas")
+            self._apply_render_rate()
             save_config(self.cfg)
             self._rebuild_cards()
             if self.worker:
@@ -2452,36 +5419,64 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
 
-    def on_value_update(self, vid, value, raw):
+    def on_values_ready(self, batch):
         now = datetime.now()
-        self.last_values[vid] = float(value)
-        self.last_raw[vid] = raw
-        self.last_update[vid] = now
-        self.global_last_update = now
-        var = self.var_map.get(vid)
-        if var:
-            in_alarm = self._evaluate_var_alarm(var, float(value))
-            self.alarm_state[vid] = in_alarm
-            if not in_alarm:
-                self.alarm_ack.discard(vid)
-        card = self.cards.get(vid)
-        if card:
-            card.set_value(value, raw)
+        latest = {}
+        for vid, value, raw, ts in batch:
+            latest[vid] = (value, raw, ts)
+        for vid, (value, raw, ts) in latest.items():
+            updated = datetime.fromtimestamp(ts)
+            self.last_values[vid] = float(value)
+            self.last_raw[vid] = raw
+            self.last_update[vid] = updated
+            var = self.var_map.get(vid)
             if var:
-                stale = self._is_stale(var, now)
-                card.set_state(stale=stale, in_alarm=self.alarm_state.get(vid, False), acked=vid in self.alarm_ack)
-                card.set_last_update(self._format_last_update(self.last_update.get(vid), now))
+                in_alarm = self._evaluate_var_alarm(var, float(value))
+                if bool(in_alarm) != bool(self.alarm_state.get(vid)):
+                    self._alarms_dirty = True
+                elif in_alarm and self._alarm_details.get(vid) != self._var_alarm_detail(var, float(value)):
+                    self._alarms_dirty = True
+                self.alarm_state[vid] = in_alarm
+                if not in_alarm:
+                    self.alarm_ack.discard(vid)
+                self._watch_stale(vid, ts)
+        if latest:
+            self.global_last_update = now
+            self._dirty_vars.update(latest)
 
     def on_var_error(self, vid, message):
         card = self.cards.get(vid)
         if card:
             card.set_error()
         self.last_update.pop(vid, None)
+        var = self.var_map.get(vid)
+        if var:
+            self._dirty_zones.add(var.get("zone_id"))
+        self.tile_model.refresh([vid])
         self.status_label.setText(message)
 
     def on_status(self, message):
         self.status_label.setText(message)
 
+    def _slave_key(self, var):
+        bid = var.get("bus_id")
+        if bid not in bus_configs(self.cfg):
+            bid = None
+        return bid, int(var.get("slave", 1))
+
+    def on_slave_state(self, bus_id, slave, state):
+        key = (bus_id or None, int(slave))
+        self.slave_states[key] = state
+        for vid, card in self.cards.items():
+            var = self.var_map.get(vid)
+            if var and self._slave_key(var) == key:
+                card.set_link_state(state)
+        self.tile_model.refresh()
+        if state == "open":
+            self.status_label.setText(f"Esclavo {slave} sin respuesta, reintentando en segundo plano")
+        elif state == "closed":
+            self.status_label.setText(f"Esclavo {slave} recuperado")
+
     def closeEvent(self, e):
         try:
             save_config(self.cfg)
@@ -2491,6 +5486,7 @@ class MainWindow(QMainWindow):
             if self.worker:
                 self.worker.stop()
                 self.worker.wait(2000)
+                self.worker.logger.close()
         except Exception:
             pass
         super().closeEvent(e)
@@ -2514,11 +5510,7 @@ def main():
         pal.setColor(QPalette.Highlight, QColor(64, 158, 255))
         pal.setColor(QPalette.HighlightedText, Qt.white)
         app.setPalette(pal)
-        app.setStyleSheet("""
-            QToolBar { spacing: 6px; }
-            QPushButton { border-radius: 6px; }
-            QGroupBox { font-weight: 600; }
-        """)
+        app.setStyleSheet(APP_STYLESHEET)
     except Exception:
         pass
     w = MainWindow()